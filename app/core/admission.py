@@ -0,0 +1,286 @@
+import asyncio
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple
+
+import numpy as np
+from fastapi import HTTPException, Request
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.models.algebra import NonlinearSolverRequest, PolynomialOperation, PolynomialRequest, PolynomialSolverRequest
+from app.models.calculus import CalculusOperation, CalculusRequest, MultivariableCalculusRequest, MultivariableOperation, PlotRequest
+from app.models.differential_equations import ODEMethod, ODERequest
+from app.models.matrices import MatrixOperation, MatrixRequest
+from app.models.number_systems import BatchConversionRequest
+from app.models.pipelines import PipelineRequest, PipelineStepKind
+from app.models.statistics import StatisticsRequest
+
+# Relative cost of symbolic work per character of input expression, so that symbolic
+# requests can be compared with numeric ones on the same scale (roughly flops).
+_SYMBOLIC_COST_PER_CHAR = 1e4
+_SYMBOLIC_OPERATION_WEIGHTS = {
+    CalculusOperation.differentiate: 1,
+    CalculusOperation.integrate: 20,
+}
+
+
+def _shape(matrix: Any) -> Tuple[int, int]:
+    """Rows and columns of a matrix given as nested lists or an array, (0, 0) if unknown."""
+    if isinstance(matrix, np.ndarray):
+        return (matrix.shape + (1, 1))[:2] if matrix.ndim else (1, 1)
+    if isinstance(matrix, list) and matrix:
+        first = matrix[0]
+        return len(matrix), len(first) if isinstance(first, list) else 1
+    return 0, 0
+
+
+def _matrix_cost(operation: MatrixOperation, matrix1: Any, matrix2: Any = None) -> float:
+    rows, cols = _shape(matrix1)
+    if operation == MatrixOperation.multiply:
+        return float(rows) * cols * max(_shape(matrix2)[1], 1)
+    # Determinants and inverses are LU factorisations: O(n^3)
+    return float(rows) ** 3
+
+
+def _calculus_cost(expression: Any, operation: CalculusOperation, order: Optional[int] = None) -> float:
+    size = len(expression) if isinstance(expression, str) else settings.max_expression_length
+    weight = _SYMBOLIC_OPERATION_WEIGHTS.get(operation, max(order or 1, 1) * 5)
+    return size * weight * _SYMBOLIC_COST_PER_CHAR
+
+
+def _multivariable_cost(request: MultivariableCalculusRequest) -> float:
+    n = len(request.variables)
+    components = len(request.expressions) * n if request.operation == MultivariableOperation.jacobian else n * n
+    size = sum(len(e) for e in request.expressions)
+    points = len(request.evaluate_at or [])
+    return size * components * _SYMBOLIC_COST_PER_CHAR + points * components
+
+
+def _plot_cost(request: PlotRequest) -> float:
+    """The derivative, if any, then up to `max_points` evaluations of the expression."""
+    derivative = _calculus_cost(request.expression, CalculusOperation.nth_derivative, request.derivative_order) if request.derivative_order else 0.0
+    return derivative + request.max_points * len(request.expression)
+
+
+def _polynomial_cost(request: PolynomialRequest) -> float:
+    n = len(request.coefficients)
+    m = len(request.coefficients2 or [])
+    if request.operation == PolynomialOperation.multiply:
+        # FFT multiplication, or a direct convolution when that is cheaper
+        return min(float(n) * m, (n + m) * math.log2(n + m) * 10)
+    if request.operation == PolynomialOperation.divide:
+        return float(n) * m
+    if request.operation == PolynomialOperation.compose:
+        # One FFT multiplication per level of the split, on up to n*m coefficients
+        size = float(n) * m
+        return size * math.log2(size + 1) * math.log2(n + 1) * 10
+    if request.operation == PolynomialOperation.evaluate:
+        return float(n) * len(request.points)
+    if request.operation in (PolynomialOperation.derivative, PolynomialOperation.integral):
+        # Charged as one pass per order, an upper bound on the single falling-factorial pass
+        order = request.order or 1
+        return float(n + order) * order
+    return float(n + m)
+
+
+def _solver_cost(request: NonlinearSolverRequest) -> float:
+    """Symbolic Jacobian once, then per start and iteration a batched n x n solve and a few evaluations."""
+    n = len(request.variables)
+    size = sum(len(e) for e in request.equations)
+    starts = len(request.starts) if request.starts is not None else request.num_starts
+    return size * n * _SYMBOLIC_COST_PER_CHAR + starts * request.max_iterations * (n ** 3 + size * n)
+
+
+def _ode_cost(request: ODERequest) -> float:
+    """
+    Symbolic Jacobian once, then right-hand side evaluations, whose count is unknown up
+    front, and a dense-output interpolation per requested output time.
+    """
+    n = len(request.variables)
+    size = sum(len(e) for e in request.equations)
+    # Implicit methods also factorise an n x n matrix per step
+    per_step = size * n + (n ** 3 if request.method in (ODEMethod.Radau, ODEMethod.BDF, ODEMethod.LSODA) else 0)
+    outputs = request.num_points or len(request.t_eval or [])
+    return size * n * _SYMBOLIC_COST_PER_CHAR + min(request.max_steps, 10000) * per_step + outputs * n * 10
+
+
+def _pipeline_cost(request: PipelineRequest) -> float:
+    """Sums step estimates from their literal parameters; inputs from other steps are unknown up front."""
+    total = 0.0
+    for step in request.steps:
+        params = step.params
+        try:
+            if step.kind == PipelineStepKind.matrices:
+                total += _matrix_cost(MatrixOperation(params.get("operation")), params.get("matrix1"), params.get("matrix2"))
+            elif step.kind == PipelineStepKind.calculus:
+                total += _calculus_cost(params.get("expression"), CalculusOperation(params.get("operation")), params.get("order"))
+            elif step.kind == PipelineStepKind.evaluate:
+                total += len(params.get("points") or []) + int(params.get("num") or 0)
+            elif step.kind == PipelineStepKind.statistics:
+                total += len(params.get("data") or []) * (int(params.get("degree") or 0) + 1) ** 2
+            else:
+                total += len(str(params.get("expression", ""))) * _SYMBOLIC_COST_PER_CHAR
+        except (ValueError, TypeError):
+            # Malformed steps fail cheaply during execution
+            continue
+    return total
+
+
+_COST_ESTIMATORS: Dict[type, Callable[[Any], float]] = {
+    MatrixRequest: lambda r: _matrix_cost(r.operation, r.matrix1, r.matrix2),
+    # np.roots finds the eigenvalues of the companion matrix: O(degree^3)
+    PolynomialSolverRequest: lambda r: float(len(r.coefficients) - 1) ** 3,
+    PolynomialRequest: _polynomial_cost,
+    NonlinearSolverRequest: _solver_cost,
+    # Polynomial fits accumulate a (degree+1)^2 Gram matrix per point
+    StatisticsRequest: lambda r: float(len(r.data)) * ((r.degree or 0) + 1) ** 2,
+    CalculusRequest: lambda r: _calculus_cost(r.expression, r.operation, r.order),
+    MultivariableCalculusRequest: _multivariable_cost,
+    PlotRequest: _plot_cost,
+    ODERequest: _ode_cost,
+    # One pass per output digit: at most 64 for binary
+    BatchConversionRequest: lambda r: float(len(r.values)) * 64,
+    PipelineRequest: _pipeline_cost,
+}
+
+
+def estimate_cost(request: BaseModel) -> float:
+    """
+    Estimates the compute cost of a validated request in abstract work units
+    (roughly floating-point operations). Requests without an estimator cost 1.
+    """
+    estimator = _COST_ESTIMATORS.get(type(request))
+    return estimator(request) if estimator else 1.0
+
+
+def client_id(http_request: Request) -> str:
+    """
+    Identifies the client, preferring the proxy-provided address when configured.
+
+    Only the rightmost X-Forwarded-For entry is used: it is the one appended by the
+    proxy in front of this server. Entries to its left come from the client and can
+    be forged to get a fresh token bucket per request.
+    """
+    if settings.admission_trust_forwarded_for:
+        forwarded = http_request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[-1].strip()
+    return http_request.client.host if http_request.client else "unknown"
+
+
+class AdmissionController:
+    """
+    Admits, defers or sheds requests by their estimated cost before any work starts.
+
+    - Requests cheaper than `admission_cheap_cost` bypass admission entirely, so cheap
+      traffic keeps its latency under overload.
+    - Requests above `admission_max_request_cost` are rejected outright.
+    - Each client has a token bucket refilled at `admission_client_rate` units per second
+      up to `admission_client_burst`; a client without enough tokens gets a 429.
+    - The total cost of admitted, still running requests is capped at
+      `admission_global_budget`. Requests that do not fit wait up to
+      `admission_max_wait` seconds for capacity, then get a 503.
+    """
+
+    def __init__(self):
+        self._in_flight_cost = 0.0
+        self._condition = asyncio.Condition()
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._counters = {"admitted": 0, "deferred": 0, "shed_client": 0, "shed_global": 0, "rejected_oversized": 0}
+
+    def _refill(self, client: str, now: float) -> float:
+        tokens, updated_at = self._buckets.get(client, (settings.admission_client_burst, now))
+        return min(settings.admission_client_burst, tokens + (now - updated_at) * settings.admission_client_rate)
+
+    def _take_tokens(self, client: str, cost: float) -> Optional[float]:
+        """Deducts the cost from the client's bucket, or returns seconds until it could."""
+        now = time.monotonic()
+        tokens = self._refill(client, now)
+        if tokens < cost:
+            self._buckets[client] = (tokens, now)
+            return (cost - tokens) / settings.admission_client_rate
+        self._buckets[client] = (tokens - cost, now)
+        if len(self._buckets) > settings.admission_max_tracked_clients:
+            # Forget clients whose buckets have refilled completely
+            self._buckets = {
+                c: state for c, state in self._buckets.items()
+                if self._refill(c, now) < settings.admission_client_burst
+            }
+        return None
+
+    def _refund_tokens(self, client: str, cost: float) -> None:
+        tokens, updated_at = self._buckets.get(client, (0.0, time.monotonic()))
+        self._buckets[client] = (min(settings.admission_client_burst, tokens + cost), updated_at)
+
+    @asynccontextmanager
+    async def admit(self, request: BaseModel, http_request: Request) -> AsyncIterator[float]:
+        """
+        Holds an admission slot for the duration of the block.
+
+        Raises:
+            HTTPException: 429 when the client is over its budget, 503 when the request
+                           is too expensive or the server has no capacity in time. Both
+                           carry a `Retry-After` header when retrying can succeed.
+        """
+        cost = estimate_cost(request)
+        if not settings.admission_enabled or cost < settings.admission_cheap_cost:
+            yield cost
+            return
+
+        if cost > settings.admission_max_request_cost:
+            self._counters["rejected_oversized"] += 1
+            raise HTTPException(
+                status_code=503,
+                detail=f"The request's estimated cost ({cost:.3g}) exceeds the per-request limit "
+                       f"({settings.admission_max_request_cost:.3g}). Reduce the input size."
+            )
+
+        client = client_id(http_request)
+        retry_after = self._take_tokens(client, cost)
+        if retry_after is not None:
+            self._counters["shed_client"] += 1
+            raise HTTPException(
+                status_code=429,
+                detail="Compute budget exceeded for this client. Retry later.",
+                headers={"Retry-After": str(math.ceil(retry_after))}
+            )
+
+        deadline = time.monotonic() + settings.admission_max_wait
+        async with self._condition:
+            deferred = False
+            # An idle server always admits, so any request under the per-request limit can run
+            while self._in_flight_cost > 0 and self._in_flight_cost + cost > settings.admission_global_budget:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._refund_tokens(client, cost)
+                    self._counters["shed_global"] += 1
+                    raise HTTPException(
+                        status_code=503,
+                        detail="The server is at capacity. Retry later.",
+                        headers={"Retry-After": str(max(1, math.ceil(settings.admission_max_wait)))}
+                    )
+                if not deferred:
+                    deferred = True
+                    self._counters["deferred"] += 1
+                try:
+                    await asyncio.wait_for(self._condition.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+            self._in_flight_cost += cost
+            self._counters["admitted"] += 1
+
+        try:
+            yield cost
+        finally:
+            async with self._condition:
+                self._in_flight_cost -= cost
+                self._condition.notify_all()
+
+    def stats(self) -> Dict[str, float]:
+        """Returns admission counters and the cost currently in flight."""
+        return {**self._counters, "in_flight_cost": self._in_flight_cost}
+
+
+admission_controller = AdmissionController()
@@ -0,0 +1,76 @@
+import asyncio
+import hashlib
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from pydantic import BaseModel
+
+
+class SingleFlight:
+    """
+    Coalesces identical in-flight computations.
+
+    The first caller for a key starts the computation in a worker thread; callers that
+    arrive with the same key while it is running wait on that same computation and all
+    receive its result, or its exception. The computation is shielded, so a caller that
+    disconnects does not cancel it for the others.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Tuple[str, Hashable], asyncio.Future] = {}
+        self._executions: Dict[str, int] = {}
+        self._coalesced: Dict[str, int] = {}
+
+    async def run(self, namespace: str, key: Hashable, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Runs `func(*args, **kwargs)` unless an identical computation is already running.
+
+        Args:
+            namespace: Groups keys and statistics, usually by endpoint.
+            key: The canonical key of the computation within the namespace.
+            func: A blocking function, run in a worker thread.
+        """
+        flight_key = (namespace, key)
+        task = self._in_flight.get(flight_key)
+        if task is None:
+            self._executions[namespace] = self._executions.get(namespace, 0) + 1
+            task = asyncio.ensure_future(asyncio.to_thread(func, *args, **kwargs))
+            self._in_flight[flight_key] = task
+            task.add_done_callback(lambda t: self._finish(flight_key, t))
+        else:
+            self._coalesced[namespace] = self._coalesced.get(namespace, 0) + 1
+        return await asyncio.shield(task)
+
+    def _finish(self, flight_key: Tuple[str, Hashable], task: asyncio.Future) -> None:
+        if self._in_flight.get(flight_key) is task:
+            del self._in_flight[flight_key]
+        if not task.cancelled():
+            # Mark the exception as retrieved in case every waiter has gone away
+            task.exception()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Returns per-namespace counts of executed, coalesced and in-flight computations."""
+        in_flight: Dict[str, int] = {}
+        for namespace, _ in self._in_flight:
+            in_flight[namespace] = in_flight.get(namespace, 0) + 1
+        return {
+            namespace: {
+                "executions": executions,
+                "coalesced": self._coalesced.get(namespace, 0),
+                "in_flight": in_flight.get(namespace, 0),
+            }
+            for namespace, executions in self._executions.items()
+        }
+
+
+single_flight = SingleFlight()
+
+
+async def coalesce(namespace: str, request: BaseModel, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Runs a service function through the shared single-flight layer, keyed by the
+    validated request. Validation normalises the body (field order, numeric types,
+    defaults), so semantically identical requests share a key. The key is a digest of
+    the serialised request, so large bodies are not held for the whole flight.
+    """
+    key = hashlib.blake2b(request.model_dump_json().encode(), digest_size=32).digest()
+    return await single_flight.run(namespace, key, func, *args, **kwargs)
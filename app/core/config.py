@@ -1 +1,78 @@
-# Configuration settings will be placed here.
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    """
+    Application settings, overridable through `CALC_`-prefixed environment variables
+    (e.g. `CALC_EXPRESSION_CACHE_SIZE=8192`).
+    """
+    model_config = SettingsConfigDict(env_prefix="CALC_")
+
+    # Expression parsing (app/core/expressions.py)
+    expression_cache_size: int = 4096
+    max_expression_length: int = 2000
+    max_expression_nodes: int = 1000
+
+    # Calculus (app/services/calculus.py)
+    derivative_cache_size: int = 256
+    max_derivative_components: int = 2500
+    max_evaluation_points: int = 100000
+    derivative_chain_cache_size: int = 256
+    max_derivative_order: int = 50
+    max_plot_points: int = 100000
+
+    # Polynomials (app/services/algebra.py)
+    max_polynomial_degree: int = 1_000_000
+    max_formatted_polynomial_degree: int = 100
+
+    # Statistics (app/services/statistics.py)
+    statistics_chunk_size: int = 65536
+    max_histogram_bins: int = 10000
+
+    # Number systems (app/services/number_systems.py)
+    max_conversion_batch: int = 100000
+
+    # Streamed numeric bodies (app/core/streaming.py)
+    stream_max_values: int = 50_000_000
+
+    # WebSocket sessions (app/routers/sessions.py, app/services/sessions.py)
+    session_max_in_flight: int = 32
+    session_max_variables: int = 256
+    session_expression_cache_size: int = 256
+
+    # Pipelines (app/services/pipelines.py)
+    max_pipeline_steps: int = 32
+    # Threads running independent branches of one pipeline
+    max_pipeline_workers: int = 4
+
+    # Admission control (app/core/admission.py), in estimated work units (~flops)
+    admission_enabled: bool = True
+    admission_cheap_cost: float = 1e5
+    admission_max_request_cost: float = 2e10
+    admission_global_budget: float = 4e10
+    admission_client_rate: float = 2e9
+    admission_client_burst: float = 2e10
+    admission_max_wait: float = 2.0
+    admission_max_tracked_clients: int = 10000
+    # Only enable behind a reverse proxy that appends the peer address to X-Forwarded-For
+    admission_trust_forwarded_for: bool = False
+
+    # Background jobs (app/services/jobs.py)
+    job_store_path: str = "jobs.sqlite3"
+    job_workers: int = 2
+    job_result_ttl: float = 3600.0
+    job_max_queued: int = 1000
+    job_poll_interval: float = 1.0
+
+    # Production server (app/server.py)
+    server_workers: int = 0
+    server_max_auto_workers: int = 4
+    # Peers whose X-Forwarded-* headers uvicorn trusts (comma-separated, or "*")
+    server_forwarded_allow_ips: str = "127.0.0.1"
+    server_max_requests: int = 10000
+    server_max_requests_jitter: int = 1000
+    server_warm_caches: bool = True
+    server_log_level: str = "info"
+
+
+settings = Settings()
@@ -0,0 +1,19 @@
+from typing import Any, Sequence, Tuple
+
+import numpy as np
+
+
+def real_entries(entries: Sequence[Any], shape: Tuple[int, ...]) -> np.ndarray:
+    """
+    Stacks the entries returned by a lambdified function into one float64 array of
+    shape (len(entries), *shape). Constant entries come back as scalars and are
+    broadcast to the full shape. Values that are not real become NaN; an imaginary
+    part within np.isclose of zero is treated as rounding noise and dropped.
+    """
+    values = np.empty((len(entries),) + tuple(shape), dtype=np.float64)
+    for i, entry in enumerate(entries):
+        entry = np.broadcast_to(entry, shape)
+        if np.iscomplexobj(entry):
+            entry = np.where(np.isclose(entry.imag, 0), entry.real, np.nan)
+        values[i] = entry
+    return values
@@ -0,0 +1,222 @@
+import ast
+import io
+import math
+import tokenize
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, Optional
+
+import sympy
+from sympy import Basic, Symbol
+
+from app.core.config import settings
+
+# Functions callable from user expressions. Anything not listed here is rejected,
+# which is what makes the parser safe: no attribute access, no arbitrary names.
+_FUNCTIONS = {
+    "sin": sympy.sin, "cos": sympy.cos, "tan": sympy.tan,
+    "cot": sympy.cot, "sec": sympy.sec, "csc": sympy.csc,
+    "asin": sympy.asin, "acos": sympy.acos, "atan": sympy.atan, "atan2": sympy.atan2,
+    "sinh": sympy.sinh, "cosh": sympy.cosh, "tanh": sympy.tanh,
+    "asinh": sympy.asinh, "acosh": sympy.acosh, "atanh": sympy.atanh,
+    "exp": sympy.exp, "log": sympy.log, "ln": sympy.log, "sqrt": sympy.sqrt,
+    "Abs": sympy.Abs, "abs": sympy.Abs, "sign": sympy.sign,
+    "floor": sympy.floor, "ceiling": sympy.ceiling,
+    "factorial": sympy.factorial, "gamma": sympy.gamma,
+    "Min": sympy.Min, "Max": sympy.Max,
+}
+
+_CONSTANTS = {"pi": sympy.pi, "E": sympy.E, "I": sympy.I, "oo": sympy.oo}
+
+_BINARY_OPERATORS = {
+    ast.Add: lambda a, b: a + b,
+    ast.Sub: lambda a, b: a - b,
+    ast.Mult: lambda a, b: a * b,
+    ast.Div: lambda a, b: a / b,
+    ast.Pow: lambda a, b: a ** b,
+    # Like sympify, treat `^` as exponentiation rather than bitwise xor.
+    ast.BitXor: lambda a, b: a ** b,
+    ast.Mod: lambda a, b: sympy.Mod(a, b),
+    ast.FloorDiv: lambda a, b: sympy.floor(a / b),
+}
+
+# Largest exact power SymPy may build from rational operands, in bits, to stop inputs
+# such as `9**9**9` or `(10**9999)**9999` from exhausting memory and time; 10**10000
+# needs about 33,000. Other numeric bases are limited by the exponent alone.
+_MAX_NUMERIC_POWER_BITS = 100000
+_MAX_NUMERIC_EXPONENT = 10000
+
+# SymPy also evaluates these eagerly on integers and half-integers, so their exact
+# results are held to the same size; the limit is reached at about 8600!.
+_FACTORIAL_FUNCTIONS = {"factorial", "gamma"}
+
+_ALLOWED_TOKENS = {tokenize.NAME, tokenize.NUMBER, tokenize.OP}
+_IGNORED_TOKENS = {tokenize.NEWLINE, tokenize.NL, tokenize.ENDMARKER}
+
+
+@lru_cache(maxsize=settings.expression_cache_size)
+def _canonicalise(source: str) -> str:
+    """
+    Tokenises an expression and joins the tokens with single spaces, so that inputs
+    differing only in whitespace (e.g. "x**2+1" and "x ** 2 + 1") share a cache entry.
+    """
+    if len(source) > settings.max_expression_length:
+        raise ValueError(f"Expression exceeds the maximum length of {settings.max_expression_length} characters.")
+
+    tokens = []
+    try:
+        for token in tokenize.generate_tokens(io.StringIO(source.strip()).readline):
+            if token.type in _IGNORED_TOKENS:
+                continue
+            if token.type not in _ALLOWED_TOKENS:
+                raise ValueError(f"Unexpected token '{token.string}'.")
+            tokens.append("**" if token.string == "^" else token.string)
+    except (tokenize.TokenError, IndentationError, SyntaxError) as e:
+        raise ValueError(f"Could not tokenise expression: {e}")
+
+    if not tokens:
+        raise ValueError("Expression is empty.")
+    return " ".join(tokens)
+
+
+class _ExpressionBuilder:
+    """Converts a whitelisted Python AST into a SymPy expression tree."""
+
+    def __init__(self, symbols: Optional[FrozenSet[str]]):
+        self.symbols = symbols
+        self.nodes = 0
+
+    def build(self, node: ast.AST) -> Basic:
+        self.nodes += 1
+        if self.nodes > settings.max_expression_nodes:
+            raise ValueError(f"Expression exceeds the maximum of {settings.max_expression_nodes} nodes.")
+
+        if isinstance(node, ast.Expression):
+            return self.build(node.body)
+
+        if isinstance(node, ast.Constant):
+            value = node.value
+            if isinstance(value, bool) or not isinstance(value, (int, float, complex)):
+                raise ValueError(f"Unsupported literal: {value!r}")
+            if isinstance(value, int):
+                return sympy.Integer(value)
+            if isinstance(value, float):
+                return sympy.Float(repr(value))
+            return sympy.Float(repr(value.imag)) * sympy.I
+
+        if isinstance(node, ast.Name):
+            if node.id in _CONSTANTS:
+                return _CONSTANTS[node.id]
+            if node.id in _FUNCTIONS:
+                raise ValueError(f"Function '{node.id}' must be called with arguments.")
+            if self.symbols is not None and node.id not in self.symbols:
+                raise ValueError(f"Unknown identifier '{node.id}'.")
+            return Symbol(node.id)
+
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPERATORS:
+            left = self.build(node.left)
+            right = self.build(node.right)
+            if isinstance(node.op, (ast.Pow, ast.BitXor)) and left.is_Number and right.is_Number:
+                _check_numeric_power(left, right)
+            try:
+                return _BINARY_OPERATORS[type(node.op)](left, right)
+            except ZeroDivisionError:
+                # SymPy returns zoo for x/0 but raises for Mod(x, 0)
+                raise ValueError("Division by zero.")
+
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+            operand = self.build(node.operand)
+            return -operand if isinstance(node.op, ast.USub) else operand
+
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in _FUNCTIONS:
+                name = node.func.id if isinstance(node.func, ast.Name) else ast.unparse(node.func)
+                raise ValueError(f"Unknown function '{name}'.")
+            if node.keywords:
+                raise ValueError(f"Keyword arguments are not supported in '{node.func.id}'.")
+            args = [self.build(arg) for arg in node.args]
+            if node.func.id in _FACTORIAL_FUNCTIONS and len(args) == 1 and args[0].is_Rational:
+                _check_numeric_factorial(node.func.id, args[0])
+            try:
+                return _FUNCTIONS[node.func.id](*args)
+            except TypeError as e:
+                raise ValueError(f"Invalid arguments for '{node.func.id}': {e}")
+
+        raise ValueError(f"Unsupported syntax: {type(node).__name__}")
+
+
+def _check_numeric_power(base: Basic, exponent: Basic) -> None:
+    """Rejects powers of numbers whose exact result would be too large to build."""
+    if abs(base) in (0, 1):
+        return
+    if base.is_Rational and exponent.is_Rational:
+        # The result has about |exponent| * log2|base| bits in its numerator or denominator
+        bits = int(abs(exponent.p) * math.log2(max(abs(base.p), base.q)))
+        if bits > _MAX_NUMERIC_POWER_BITS:
+            raise ValueError(f"The exact result of this power would have about {bits} bits; the limit is {_MAX_NUMERIC_POWER_BITS}.")
+    elif abs(exponent) > _MAX_NUMERIC_EXPONENT:
+        raise ValueError(f"Exponent {exponent} is too large.")
+
+
+def _check_numeric_factorial(name: str, argument: Basic) -> None:
+    """Rejects factorials and gamma values of rationals whose exact result would be too large to build."""
+    magnitude = abs(argument)
+    # n! has about log2(n!) bits, which exceeds n from n = 8 on, so huge arguments fail early
+    if magnitude > _MAX_NUMERIC_POWER_BITS or math.lgamma(float(magnitude) + 1) / math.log(2) > _MAX_NUMERIC_POWER_BITS:
+        raise ValueError(f"The exact result of this '{name}' call would have more than {_MAX_NUMERIC_POWER_BITS} bits.")
+
+
+@lru_cache(maxsize=settings.expression_cache_size)
+def _parse_canonical(canonical: str, symbols: Optional[FrozenSet[str]]) -> Basic:
+    try:
+        tree = ast.parse(canonical, mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid syntax: {e.msg}")
+    return _ExpressionBuilder(symbols).build(tree)
+
+
+def parse_expression(source: str, symbols: Optional[Iterable[str]] = None) -> Basic:
+    """
+    Parses an expression string into an interned SymPy expression.
+
+    Expressions are tokenised, normalised and converted from a whitelisted Python AST,
+    so only numbers, arithmetic operators, known constants and known functions are
+    accepted. Parsed trees are cached in a bounded LRU keyed by the normalised source,
+    and since SymPy expressions are immutable the cached objects are shared by callers.
+
+    Args:
+        source: The expression string (e.g. "sin(x)**2 + 1").
+        symbols: Names allowed as free symbols. `None` accepts any identifier as a
+                 symbol; an empty collection allows only constant expressions.
+
+    Returns:
+        The parsed SymPy expression.
+
+    Raises:
+        ValueError: If the expression is malformed, too large, or uses anything
+                    outside the whitelist.
+    """
+    allowed = None if symbols is None else frozenset(symbols)
+    return _parse_canonical(_canonicalise(source), allowed)
+
+
+def expression_cache_info() -> Dict[str, int]:
+    """Returns hit/miss counters of the parsed-expression cache."""
+    info = _parse_canonical.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "max_size": info.maxsize}
+
+
+def validate_symbol_names(names: Iterable[str]) -> None:
+    """
+    Checks that user-declared variable names are plain identifiers that do not shadow
+    a known function or constant, and that none is declared twice.
+
+    Raises:
+        ValueError: If any name is invalid or duplicated.
+    """
+    seen = set()
+    for name in names:
+        if not name.isidentifier() or name in _FUNCTIONS or name in _CONSTANTS:
+            raise ValueError(f"'{name}' is not a valid variable name.")
+        if name in seen:
+            raise ValueError(f"Variable '{name}' is declared more than once.")
+        seen.add(name)
@@ -0,0 +1,43 @@
+from typing import Any
+
+import numpy as np
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def _default(obj: Any) -> Any:
+    """
+    Fallback for values orjson cannot serialise natively, such as
+    non-contiguous NumPy arrays or NumPy dtypes it has no fast path for.
+    """
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dump_json(content: Any) -> bytes:
+    """
+    Serialises content to JSON, encoding NumPy arrays and scalars natively.
+
+    JSON has no NaN or infinity, so orjson writes every non-finite float as null.
+    Response fields that can carry such values are declared Optional[float] and
+    document null as "not finite".
+    """
+    return orjson.dumps(content, default=_default, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+class NumpyJSONResponse(JSONResponse):
+    """
+    JSON response that serialises NumPy arrays and scalars directly with orjson.
+
+    Routers return this from their endpoints with an already trusted payload built
+    from service output. FastAPI skips `response_model` validation for returned
+    `Response` objects, so each result is serialised exactly once while the
+    declared `response_model` still documents the schema in OpenAPI.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dump_json(content)
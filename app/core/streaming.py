@@ -0,0 +1,384 @@
+"""
+Incremental ingestion of large numeric request bodies.
+
+The regular endpoints let FastAPI buffer the whole body, parse it into Python objects
+and validate them into lists of floats, which the services then copy into NumPy. For
+bodies of tens of megabytes that peaks at several times the payload size. The parser
+here consumes the body chunk by chunk as it arrives and writes the numbers of the
+declared array fields straight into growable float64 buffers, checking their shape as
+it goes, so peak memory stays close to the size of the final arrays.
+"""
+from typing import Annotated, Any, Dict, NoReturn, Optional, Tuple, Type
+
+import numpy as np
+import orjson
+from fastapi import Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from app.core.config import settings
+
+_WHITESPACE = b" \t\r\n"
+# Bytes that may appear between the brackets of a numeric row
+_ROW_BYTES = b"0123456789.eE+-, \t\r\n"
+# A row without a comma or closing bracket this long is not a list of numbers
+_MAX_PENDING_NUMBER = 4096
+# Bodies delivered in larger chunks are parsed in slices of this size
+_FEED_SIZE = 1 << 16
+# Returned by _read_token when the token may continue in the next chunk
+_PENDING = object()
+
+
+class JSONStreamError(ValueError):
+    """The body is not well-formed JSON, or not shaped like the expected request."""
+
+
+class Float64Buffer:
+    """
+    A float64 array that grows as values are appended.
+
+    Capacity grows by half with `ndarray.resize`, which extends the allocation in place
+    where the allocator can, so large buffers are rarely copied and never held twice.
+    """
+
+    def __init__(self, capacity: int = 4096):
+        self._array = np.empty(capacity, dtype=np.float64)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def extend(self, values: np.ndarray) -> None:
+        needed = self._size + len(values)
+        if needed > len(self._array):
+            # No views of the array are handed out before finish(), so resizing is safe
+            self._array.resize(max(needed, len(self._array) * 3 // 2), refcheck=False)
+        self._array[self._size:needed] = values
+        self._size = needed
+
+    def finish(self) -> np.ndarray:
+        """Releases the spare capacity and returns the values. The buffer is unusable afterwards."""
+        self._array.resize(self._size, refcheck=False)
+        return self._array
+
+
+class _ArrayState:
+    """The buffer and shape bookkeeping of one array field while it is parsed."""
+
+    def __init__(self, ndim: int):
+        self.ndim = ndim
+        self.buffer = Float64Buffer()
+        self.rows = 0
+        self.columns: Optional[int] = None
+        self.row_start = 0
+
+    def to_array(self) -> np.ndarray:
+        values = self.buffer.finish()
+        if self.ndim == 1:
+            return values
+        return values.reshape(self.rows, self.columns or 0)
+
+
+class NumericJSONStreamParser:
+    """
+    Incremental parser for a flat JSON object whose large fields are numeric arrays.
+
+    `arrays` maps the names of the array fields to their dimensions: 1 for a list of
+    numbers, 2 for a list of equally long rows. Every other field must hold a scalar
+    (string, number, boolean or null). Feed the body with `feed()` and call `finish()`
+    at the end.
+
+    Numbers inside arrays are converted in bulk by NumPy, which also accepts a few
+    spellings JSON does not, such as `+1` or `.5`.
+
+    Raises:
+        JSONStreamError: For malformed JSON or a value of the wrong kind.
+        ValueError: For arrays of the wrong shape or too many values in total.
+    """
+
+    def __init__(self, arrays: Dict[str, int]):
+        self._array_fields = arrays
+        self._data = b""
+        self._pos = 0
+        self._offset = 0
+        self._state = "start"
+        self._key: Optional[str] = None
+        self._array: Optional[_ArrayState] = None
+        self._row_open = False
+        self._row_empty = True
+        self._total_values = 0
+        self.scalars: Dict[str, Any] = {}
+        self.arrays: Dict[str, np.ndarray] = {}
+
+    @property
+    def current_key(self) -> Optional[str]:
+        """The field being parsed, for error locations."""
+        return self._key
+
+    def feed(self, chunk: bytes) -> None:
+        for start in range(0, len(chunk), _FEED_SIZE):
+            self._data = self._data[self._pos:] + chunk[start:start + _FEED_SIZE]
+            self._offset += self._pos
+            self._pos = 0
+            self._advance(final=False)
+
+    def finish(self) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+        """Parses the rest of the body and returns its scalar and array fields."""
+        self._advance(final=True)
+        if self._state != "done":
+            self._fail("Unexpected end of the request body")
+        return self.scalars, self.arrays
+
+    def _fail(self, message: str) -> NoReturn:
+        raise JSONStreamError(f"{message} at byte {self._offset + self._pos}.")
+
+    def _skip_whitespace(self) -> None:
+        data, pos = self._data, self._pos
+        while pos < len(data) and data[pos] in _WHITESPACE:
+            pos += 1
+        self._pos = pos
+
+    def _advance(self, final: bool) -> None:
+        while True:
+            if self._array is not None and self._row_open:
+                if not self._parse_row(final):
+                    return
+                continue
+            self._skip_whitespace()
+            if self._pos >= len(self._data):
+                return
+            char = self._data[self._pos:self._pos + 1]
+            state = self._state
+
+            if state == "start":
+                if char != b"{":
+                    self._fail("The request body must be a JSON object")
+                self._pos += 1
+                self._state = "first_key"
+            elif state in ("first_key", "key"):
+                if char == b"}" and state == "first_key":
+                    self._pos += 1
+                    self._state = "done"
+                    continue
+                if char != b'"':
+                    self._fail("Expected a field name")
+                key = self._read_token(final)
+                if key is _PENDING:
+                    return
+                self._key = key
+                self._state = "colon"
+            elif state == "colon":
+                if char != b":":
+                    self._fail("Expected ':'")
+                self._pos += 1
+                self._state = "value"
+            elif state == "value":
+                if char == b"[" and self._key in self._array_fields:
+                    self._pos += 1
+                    self._array = _ArrayState(self._array_fields[self._key])
+                    self._state = "array_first"
+                    self._open_row_if_flat()
+                    continue
+                if char in (b"[", b"{"):
+                    self._fail(f"Unexpected nested value for `{self._key}`")
+                value = self._read_token(final)
+                if value is _PENDING:
+                    return
+                if self._key in self._array_fields and value is not None:
+                    self._fail(f"`{self._key}` must be an array")
+                self.scalars[self._key] = value
+                self._state = "after_value"
+            elif state in ("array_first", "array_next"):
+                # Only reached for 2-D arrays, between rows
+                if char == b"]" and state == "array_first":
+                    self._pos += 1
+                    self._close_array()
+                elif char == b"[":
+                    self._pos += 1
+                    self._row_open = True
+                    self._row_empty = True
+                    self._array.row_start = len(self._array.buffer)
+                else:
+                    self._fail(f"Expected a row of numbers in `{self._key}`")
+            elif state == "array_after_row":
+                if char == b",":
+                    self._pos += 1
+                    self._state = "array_next"
+                elif char == b"]":
+                    self._pos += 1
+                    self._close_array()
+                else:
+                    self._fail(f"Expected ',' or ']' in `{self._key}`")
+            elif state == "after_value":
+                if char == b",":
+                    self._pos += 1
+                    self._state = "key"
+                elif char == b"}":
+                    self._pos += 1
+                    self._state = "done"
+                else:
+                    self._fail("Expected ',' or '}'")
+            else:
+                self._fail("Unexpected data after the JSON object")
+
+    def _open_row_if_flat(self) -> None:
+        if self._array.ndim == 1:
+            self._row_open = True
+            self._row_empty = True
+
+    def _read_token(self, final: bool) -> Any:
+        """Reads a complete string, number or literal, or returns _PENDING to wait for more data."""
+        data, start = self._data, self._pos
+        if data[start:start + 1] == b'"':
+            end = start + 1
+            while True:
+                end = data.find(b'"', end)
+                if end == -1:
+                    if final:
+                        self._fail("Unterminated string")
+                    return _PENDING
+                # A quote preceded by an odd number of backslashes is escaped
+                backslashes = len(data[start + 1:end]) - len(data[start + 1:end].rstrip(b"\\"))
+                if backslashes % 2 == 0:
+                    break
+                end += 1
+            end += 1
+        else:
+            end = start
+            while end < len(data) and data[end] not in b",}] \t\r\n":
+                end += 1
+            if end == len(data) and not final:
+                return _PENDING
+        token = data[start:end]
+        try:
+            value = orjson.loads(token)
+        except orjson.JSONDecodeError:
+            self._fail("Invalid JSON value")
+        if isinstance(value, (list, dict)):
+            self._fail("Invalid JSON value")
+        self._pos = end
+        return value
+
+    def _parse_row(self, final: bool) -> bool:
+        """Consumes numbers of the open row; returns False to wait for more data."""
+        data, pos = self._data, self._pos
+        close = data.find(b"]", pos)
+        if close == -1:
+            if final:
+                self._fail(f"Unterminated array in `{self._key}`")
+            # Numbers before the last comma are complete; the one after it may continue
+            cut = data.rfind(b",", pos)
+            if cut == -1:
+                if len(data) - pos > _MAX_PENDING_NUMBER:
+                    self._fail(f"Expected numbers in `{self._key}`")
+                return False
+            segment, next_pos, closes = data[pos:cut], cut + 1, False
+        else:
+            segment, next_pos, closes = data[pos:close], close + 1, True
+
+        if segment.translate(None, _ROW_BYTES):
+            self._fail(f"Expected numbers in `{self._key}`")
+        if closes and not segment.strip(_WHITESPACE) and self._row_empty:
+            pass
+        else:
+            try:
+                values = np.array(segment.split(b","), dtype=np.float64)
+            except ValueError:
+                self._fail(f"Invalid number in `{self._key}`")
+            self._total_values += len(values)
+            if self._total_values > settings.stream_max_values:
+                raise ValueError(f"The request contains more than {settings.stream_max_values} numbers.")
+            self._array.buffer.extend(values)
+            self._row_empty = False
+
+        self._pos = next_pos
+        if closes:
+            self._row_open = False
+            self._close_row()
+        return True
+
+    def _close_row(self) -> None:
+        array = self._array
+        if array.ndim == 1:
+            self._close_array()
+            return
+        length = len(array.buffer) - array.row_start
+        if array.columns is None:
+            array.columns = length
+        elif length != array.columns:
+            # Rejected as soon as the row ends, before the rest of the body is read
+            raise ValueError(f"All rows in `{self._key}` must have the same length.")
+        array.rows += 1
+        self._state = "array_after_row"
+
+    def _close_array(self) -> None:
+        self.arrays[self._key] = self._array.to_array()
+        self._array = None
+        self._state = "after_value"
+
+
+def build_request(model: Type[BaseModel], scalars: Dict[str, Any], arrays: Dict[str, np.ndarray]) -> BaseModel:
+    """
+    Assembles a request model from streamed fields without copying the arrays.
+
+    Scalar fields are validated against their field definitions; array fields are only
+    validated when empty, against their length constraints. The model's cross-field
+    rules in `validate_request` then run on the assembled instance.
+
+    Raises:
+        RequestValidationError: In the same format FastAPI uses for regular bodies.
+    """
+    values: Dict[str, Any] = {}
+    errors = []
+    for name, field in model.model_fields.items():
+        if name in arrays and len(arrays[name]) > 0:
+            values[name] = arrays[name]
+            continue
+        if name in arrays:
+            supplied = []
+        elif name in scalars:
+            supplied = scalars[name]
+        elif field.is_required():
+            errors.append({"type": "missing", "loc": ("body", name), "msg": "Field required", "input": None})
+            continue
+        else:
+            values[name] = field.get_default(call_default_factory=True)
+            continue
+        try:
+            values[name] = TypeAdapter(Annotated[field.annotation, field]).validate_python(supplied)
+        except ValidationError as e:
+            errors.extend({**error, "loc": ("body", name, *error["loc"])} for error in e.errors(include_url=False))
+    if errors:
+        raise RequestValidationError(errors)
+
+    request = model.model_construct(**values)
+    try:
+        request.validate_request()
+    except ValueError as e:
+        raise RequestValidationError([
+            {"type": "value_error", "loc": ("body",), "msg": f"Value error, {e}", "input": None}
+        ])
+    return request
+
+
+async def read_numeric_request(http_request: Request, model: Type[BaseModel], arrays: Dict[str, int]) -> BaseModel:
+    """
+    Parses a streamed JSON body into `model`, with the fields named in `arrays`
+    held as float64 NumPy arrays of the given dimensions.
+
+    Raises:
+        RequestValidationError: For malformed or invalid bodies.
+    """
+    parser = NumericJSONStreamParser(arrays)
+    try:
+        async for chunk in http_request.stream():
+            parser.feed(chunk)
+        scalars, parsed = parser.finish()
+    except JSONStreamError as e:
+        raise RequestValidationError([
+            {"type": "json_invalid", "loc": ("body",), "msg": "JSON decode error", "input": {}, "ctx": {"error": str(e)}}
+        ])
+    except ValueError as e:
+        loc = ("body", parser.current_key) if parser.current_key else ("body",)
+        raise RequestValidationError([{"type": "value_error", "loc": loc, "msg": f"Value error, {e}", "input": None}])
+    return build_request(model, scalars, parsed)
@@ -1,12 +1,25 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.routers import arithmetic, trigonometry, logarithms, algebra, complex_numbers, calculus, matrices, statistics, number_systems
+from app.core.admission import admission_controller
+from app.core.coalescing import single_flight
+from app.core.expressions import expression_cache_info
+from app.routers import arithmetic, trigonometry, logarithms, algebra, complex_numbers, calculus, differential_equations, matrices, statistics, number_systems, pipelines, jobs, sessions
+from app.services.jobs import job_manager
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Background job workers are started per process, after any prefork
+    job_manager.start()
+    yield
+    job_manager.stop()
 
 app = FastAPI(
     title="Scientific Calculator API",
     description="A modern, fast, and feature-rich scientific calculator API.",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS (Cross-Origin Resource Sharing)
@@ -28,9 +41,13 @@ app.include_router(logarithms.router)
 app.include_router(algebra.router)
 app.include_router(complex_numbers.router)
 app.include_router(calculus.router)
+app.include_router(differential_equations.router)
 app.include_router(matrices.router)
 app.include_router(statistics.router)
 app.include_router(number_systems.router)
+app.include_router(pipelines.router)
+app.include_router(jobs.router)
+app.include_router(sessions.router)
 
 @app.get("/health", tags=["Health"])
 async def health_check():
@@ -38,3 +55,14 @@ async def health_check():
     Health check endpoint.
     """
     return {"status": "ok"}
+
+@app.get("/metrics", tags=["Health"])
+async def metrics():
+    """
+    Runtime counters for admission control, request coalescing and the calculation caches.
+    """
+    return {
+        "admission": admission_controller.stats(),
+        "coalescing": single_flight.stats(),
+        "expression_cache": expression_cache_info(),
+    }
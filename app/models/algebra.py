@@ -1,5 +1,7 @@
-from pydantic import BaseModel, Field, conlist
-from typing import List, Union
+from pydantic import BaseModel, Field, conlist, model_validator
+from enum import Enum
+from typing import List, Optional, Tuple, Union
+from app.core.expressions import validate_symbol_names
 
 class PolynomialSolverRequest(BaseModel):
     # Use conlist to ensure there's at least one coefficient
@@ -20,3 +22,99 @@ class PolynomialSolverResponse(BaseModel):
         description="A string representation of the polynomial.",
         json_schema_extra={'example': "1.0*x**2 - 4.0"}
     )
+
+class PolynomialOperation(str, Enum):
+    add = "add"
+    subtract = "subtract"
+    multiply = "multiply"
+    divide = "divide"
+    compose = "compose"
+    derivative = "derivative"
+    integral = "integral"
+    evaluate = "evaluate"
+
+# Operations on two polynomials, which take `coefficients2`
+BINARY_POLYNOMIAL_OPERATIONS = [
+    PolynomialOperation.add,
+    PolynomialOperation.subtract,
+    PolynomialOperation.multiply,
+    PolynomialOperation.divide,
+    PolynomialOperation.compose,
+]
+
+class PolynomialRequest(PolynomialSolverRequest):
+    operation: PolynomialOperation
+    coefficients2: Optional[conlist(float, min_length=1)] = Field(None, description="[For add, subtract, multiply, divide and compose Only] The second polynomial, in the same order. `divide` divides by it; `compose` substitutes it for x in the first.", json_schema_extra={'example': [1, -2]})
+    order: Optional[int] = Field(None, ge=1, le=1000, description="[For derivative and integral Only] How many times to differentiate or integrate. Defaults to 1.")
+    points: Optional[conlist(float, min_length=1)] = Field(None, description="[For evaluate Only] The x values to evaluate the polynomial at.", json_schema_extra={'example': [0, 1, 2.5]})
+
+    @model_validator(mode='after')
+    def validate_request(self):
+        if self.operation in BINARY_POLYNOMIAL_OPERATIONS:
+            if self.coefficients2 is None:
+                raise ValueError(f"`coefficients2` is required for {self.operation.value}.")
+        elif self.coefficients2 is not None:
+            raise ValueError(f"`coefficients2` should not be provided for {self.operation.value}.")
+        if self.order is not None and self.operation not in [PolynomialOperation.derivative, PolynomialOperation.integral]:
+            raise ValueError(f"`order` should not be provided for {self.operation.value}.")
+        if self.operation == PolynomialOperation.evaluate:
+            if self.points is None:
+                raise ValueError("`points` is required for evaluate.")
+        elif self.points is not None:
+            raise ValueError(f"`points` should not be provided for {self.operation.value}.")
+        return self
+
+class PolynomialResponse(BaseModel):
+    operation: str
+    result: Optional[List[Optional[float]]] = Field(None, description="The resulting polynomial's coefficients in descending order of power; the quotient for divide. Omitted for evaluate.")
+    remainder: Optional[List[Optional[float]]] = Field(None, description="[For divide Only] The remainder's coefficients, of lower degree than the divisor.")
+    values: Optional[List[Optional[float]]] = Field(None, description="[For evaluate Only] The polynomial at each of `points`.")
+    degree: int = Field(..., description="The degree of the resulting polynomial (of the input for evaluate).")
+    polynomial: Optional[str] = Field(None, description="A string representation of the resulting polynomial, omitted for very high degrees.", json_schema_extra={'example': "x**2 - 4"})
+
+class SolverMethod(str, Enum):
+    newton = "newton"
+    bracket = "bracket"
+
+class NonlinearSolverRequest(BaseModel):
+    equations: conlist(str, min_length=1, max_length=20) = Field(..., description="The equations to solve, either as `lhs = rhs` or as an expression equal to zero.", json_schema_extra={'example': ["x*exp(x) = 3"]})
+    variables: conlist(str, min_length=1, max_length=20) = Field(['x'], description="The unknowns, one per equation, in the order of each root's coordinates.", json_schema_extra={'example': ["x"]})
+    method: SolverMethod = Field(SolverMethod.newton, description="`newton` (damped Newton iterations on any square system) or `bracket` (bisection of sign changes; one equation in one variable).")
+    starts: Optional[conlist(List[float], min_length=1, max_length=10000)] = Field(None, description="[For newton Only] Starting points, one value per variable. By default `num_starts` points are spread over `search_bounds`.", json_schema_extra={'example': [[0.5], [2]]})
+    search_bounds: Optional[List[Tuple[float, float]]] = Field(None, description="A (low, high) range per variable for the generated starting points or brackets. Defaults to (-10, 10).", json_schema_extra={'example': [(-5, 5)]})
+    num_starts: int = Field(64, ge=1, le=10000, description="Number of generated starting points (newton) or grid intervals searched for sign changes (bracket).")
+    tolerance: float = Field(1e-10, gt=0, lt=1, description="Convergence tolerance on the residual and the step size.")
+    max_iterations: int = Field(100, ge=1, le=1000, description="Iteration limit for every starting point.")
+    time_limit: float = Field(5.0, gt=0, le=30, description="Wall-clock limit in seconds; iterations stop when it is reached.")
+
+    @model_validator(mode='after')
+    def validate_request(self):
+        validate_symbol_names(self.variables)
+        if len(self.equations) != len(self.variables):
+            raise ValueError("Provide exactly one equation per variable.")
+        if self.method == SolverMethod.bracket:
+            if len(self.variables) != 1:
+                raise ValueError("The bracket method solves a single equation in one variable.")
+            if self.starts is not None:
+                raise ValueError("`starts` should not be provided for the bracket method.")
+        if self.starts is not None and not all(len(point) == len(self.variables) for point in self.starts):
+            raise ValueError("Each starting point must provide one value per variable.")
+        if self.search_bounds is not None:
+            if len(self.search_bounds) != len(self.variables):
+                raise ValueError("Provide one (low, high) range in `search_bounds` per variable.")
+            if not all(low < high for low, high in self.search_bounds):
+                raise ValueError("Each range in `search_bounds` must have low < high.")
+        return self
+
+class RootReport(BaseModel):
+    point: List[float] = Field(..., description="The root, one coordinate per variable.")
+    residual: Optional[float] = Field(..., description="The largest absolute equation residual at the root; null if it is not finite.")
+    iterations: int = Field(..., description="Iterations taken by the fastest start that reached this root.")
+    starts: int = Field(..., description="Number of starting points or brackets that converged to this root.")
+
+class NonlinearSolverResponse(BaseModel):
+    roots: List[RootReport] = Field(..., description="The distinct roots found, ordered by their coordinates.")
+    unconverged: int = Field(..., description="Starting points or brackets that diverged, stalled, hit a pole or ran out of iterations.")
+    timed_out: bool = Field(..., description="Whether the time limit stopped the iterations early.")
+    equations: List[str] = Field(..., description="The equations as solved, in the form `expression = 0`.")
+    method: str
@@ -1,8 +1,9 @@
 from pydantic import BaseModel, Field
+from typing import Optional
 
 class ArithmeticRequest(BaseModel):
     expression: str = Field(..., json_schema_extra={'example': "2 * (3 + 4)"})
 
 class ArithmeticResponse(BaseModel):
-    result: float
+    result: Optional[float] = Field(..., description="The value of the expression; null if it is not finite (for example, it overflows).")
     expression: str
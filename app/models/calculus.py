@@ -1,21 +1,34 @@
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, Field, conlist, model_validator
 from enum import Enum
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple, Union
+from app.core.expressions import validate_symbol_names
 
 class CalculusOperation(str, Enum):
     differentiate = "differentiate"
     integrate = "integrate"
+    nth_derivative = "nth_derivative"
+    series = "series"
 
 class CalculusRequest(BaseModel):
     expression: str = Field(..., description="The mathematical expression to operate on, using 'x' as the variable.", json_schema_extra={'example': "x**2"})
     operation: CalculusOperation
     # For definite integrals: a tuple of (lower_bound, upper_bound)
     integration_bounds: Optional[Tuple[float, float]] = Field(None, description="[For Definite Integrals Only] A tuple for the lower and upper bounds.", json_schema_extra={'example': (0, 1)})
+    # For higher-order derivatives and Taylor series
+    order: Optional[int] = Field(None, ge=0, description="[For nth_derivative and series Only] The derivative order, or the highest power kept in the series.", json_schema_extra={'example': 3})
+    expansion_point: Optional[float] = Field(None, description="[For series Only] The point to expand around. Defaults to 0.", json_schema_extra={'example': 0})
 
     @model_validator(mode='after')
     def validate_request(self):
-        if self.operation == CalculusOperation.differentiate and self.integration_bounds is not None:
-            raise ValueError("`integration_bounds` must not be provided for differentiation.")
+        if self.operation != CalculusOperation.integrate and self.integration_bounds is not None:
+            raise ValueError(f"`integration_bounds` must not be provided for {self.operation.value}.")
+        if self.operation in [CalculusOperation.nth_derivative, CalculusOperation.series]:
+            if self.order is None:
+                raise ValueError(f"`order` is required for {self.operation.value}.")
+        elif self.order is not None:
+            raise ValueError(f"`order` must not be provided for {self.operation.value}.")
+        if self.operation != CalculusOperation.series and self.expansion_point is not None:
+            raise ValueError(f"`expansion_point` must not be provided for {self.operation.value}.")
         return self
 
 class CalculusResponse(BaseModel):
@@ -23,3 +36,61 @@ class CalculusResponse(BaseModel):
     input_expression: str
     operation: str
     is_definite_integral: bool = False
+
+class MultivariableOperation(str, Enum):
+    gradient = "gradient"
+    jacobian = "jacobian"
+    hessian = "hessian"
+
+class MultivariableCalculusRequest(BaseModel):
+    expressions: conlist(str, min_length=1) = Field(..., description="The expressions to operate on. `gradient` and `hessian` take a single scalar expression; `jacobian` takes one expression per output component.", json_schema_extra={'example': ["x**2*y", "sin(x*y)"]})
+    variables: conlist(str, min_length=1) = Field(..., description="The variables to differentiate with respect to, in output order.", json_schema_extra={'example': ["x", "y"]})
+    operation: MultivariableOperation
+    eliminate_common_subexpressions: bool = Field(True, description="Also return the result rewritten in terms of subexpressions shared across all components.")
+    evaluate_at: Optional[List[List[float]]] = Field(None, description="Points at which to evaluate the result with a compiled, vectorised evaluator. Each point lists one value per variable.", json_schema_extra={'example': [[1, 2], [0.5, 0.5]]})
+    include_evaluator_source: bool = Field(False, description="Return the NumPy source code of the compiled evaluator.")
+
+    @model_validator(mode='after')
+    def validate_request(self):
+        validate_symbol_names(self.variables)
+        if self.operation != MultivariableOperation.jacobian and len(self.expressions) != 1:
+            raise ValueError(f"`{self.operation.value}` takes exactly one expression.")
+        if self.evaluate_at is not None:
+            if not all(len(point) == len(self.variables) for point in self.evaluate_at):
+                raise ValueError("Each point in `evaluate_at` must provide one value per variable.")
+        return self
+
+class MultivariableCalculusResponse(BaseModel):
+    # Gradients are vectors; Jacobians and Hessians are matrices
+    result: Union[List[str], List[List[str]]] = Field(..., description="The derivatives, one component per variable (gradient) or as a matrix (jacobian, hessian).")
+    operation: str
+    variables: List[str]
+    subexpressions: Optional[List[Tuple[str, str]]] = Field(None, description="Common subexpressions as (symbol, expression) pairs, shared by all components of `reduced_result`.")
+    reduced_result: Optional[Union[List[str], List[List[str]]]] = Field(None, description="The result written in terms of `subexpressions`.")
+    values: Optional[Union[List[List[Optional[float]]], List[List[List[Optional[float]]]]]] = Field(None, description="The result evaluated at each point of `evaluate_at`.")
+    evaluator_source: Optional[str] = None
+
+class PlotRequest(BaseModel):
+    expression: str = Field(..., description="The function to plot, using 'x' as the variable.", json_schema_extra={'example': "tan(x)"})
+    x_range: Tuple[float, float] = Field(..., description="The interval of x to plot.", json_schema_extra={'example': (-5, 5)})
+    derivative_order: int = Field(0, ge=0, description="Plot this derivative of the expression instead (0 plots the expression itself).")
+    initial_points: int = Field(65, ge=3, le=10000, description="Size of the uniform grid sampled before refinement. Features narrower than its spacing may be missed.")
+    max_points: int = Field(2000, ge=3, description="The budget of function evaluations spent on refinement.")
+    tolerance: float = Field(1e-3, gt=0, le=0.1, description="The largest allowed deviation from the true curve, as a fraction of the plot's height and width (1e-3 is about a pixel on a 1000 pixel plot).")
+
+    @model_validator(mode='after')
+    def validate_request(self):
+        lower, upper = self.x_range
+        if not lower < upper:
+            raise ValueError("`x_range` must be an increasing interval.")
+        if self.initial_points > self.max_points:
+            raise ValueError("`initial_points` must not exceed `max_points`.")
+        return self
+
+class PlotResponse(BaseModel):
+    x: List[float] = Field(..., description="The sampled x values, in increasing order.")
+    y: List[Optional[float]] = Field(..., description="The function at each x; null where it is undefined. Clients should break the curve at nulls.")
+    asymptotes: List[float] = Field(..., description="x positions of detected vertical asymptotes. Each one also appears in `x` with a null `y`.")
+    discontinuities: List[float] = Field(..., description="x positions of detected finite jumps, where both sides of the jump are included in the points.")
+    plotted_expression: str = Field(..., description="The expression that was plotted (the requested derivative, if any).")
+    evaluations: int = Field(..., description="The number of function evaluations spent.")
@@ -0,0 +1,58 @@
+from pydantic import BaseModel, Field, conlist, model_validator
+from enum import Enum
+from typing import List, Optional, Tuple
+from app.core.expressions import validate_symbol_names
+
+class ODEMethod(str, Enum):
+    RK45 = "RK45"
+    RK23 = "RK23"
+    DOP853 = "DOP853"
+    Radau = "Radau"
+    BDF = "BDF"
+    LSODA = "LSODA"
+
+class ODERequest(BaseModel):
+    equations: conlist(str, min_length=1, max_length=50) = Field(..., description="The right-hand sides of the system, one per state variable: d(variables[i])/dt = equations[i]. They may use the state variables and the time variable.", json_schema_extra={'example': ["v", "-x - 0.1*v"]})
+    variables: conlist(str, min_length=1, max_length=50) = Field(..., description="The state variables, in the order of `initial_values` and of every output state.", json_schema_extra={'example': ["x", "v"]})
+    time_variable: str = Field('t', description="The name of the independent variable.")
+    initial_values: conlist(float, min_length=1, max_length=50) = Field(..., description="The state at the start of `t_span`, one value per variable.", json_schema_extra={'example': [1, 0]})
+    t_span: Tuple[float, float] = Field(..., description="The (start, end) of the integration. The end may be before the start to integrate backwards.", json_schema_extra={'example': (0, 10)})
+    method: ODEMethod = Field(ODEMethod.RK45, description="The adaptive step method. Use `Radau`, `BDF` or `LSODA` for stiff systems; they use the symbolic Jacobian.")
+    t_eval: Optional[conlist(float, min_length=1)] = Field(None, description="Times at which to report the state, interpolated from the dense output of each step. By default every accepted step is reported.", json_schema_extra={'example': [0, 2.5, 5, 7.5, 10]})
+    num_points: Optional[int] = Field(None, ge=2, le=1000000, description="Report the state at this many evenly spaced times over `t_span`, interpolated from the dense output of each step.")
+    rtol: float = Field(1e-6, gt=0, lt=1, description="Relative tolerance of the local error.")
+    atol: float = Field(1e-9, gt=0, description="Absolute tolerance of the local error.")
+    max_step: Optional[float] = Field(None, gt=0, description="The largest step the solver may take.")
+    max_steps: int = Field(100000, ge=1, le=10000000, description="The integration stops after this many steps.")
+    time_limit: float = Field(10.0, gt=0, le=300, description="Wall-clock limit in seconds; the integration stops when it is reached.")
+
+    @model_validator(mode='after')
+    def validate_request(self):
+        validate_symbol_names([*self.variables, self.time_variable])
+        if len(self.equations) != len(self.variables):
+            raise ValueError("Provide exactly one equation per variable.")
+        if len(self.initial_values) != len(self.variables):
+            raise ValueError("Provide exactly one initial value per variable.")
+        start, end = self.t_span
+        if start == end:
+            raise ValueError("`t_span` must have a different start and end.")
+        if self.t_eval is not None and self.num_points is not None:
+            raise ValueError("Provide either `t_eval` or `num_points`, not both.")
+        if self.t_eval is not None:
+            direction = 1 if end > start else -1
+            if not all(min(start, end) <= t <= max(start, end) for t in self.t_eval):
+                raise ValueError("All times in `t_eval` must lie within `t_span`.")
+            if not all(direction * (b - a) > 0 for a, b in zip(self.t_eval, self.t_eval[1:])):
+                raise ValueError("`t_eval` must be strictly ordered in the direction of integration.")
+        return self
+
+class ODEResponse(BaseModel):
+    t: List[float] = Field(..., description="The reported times.")
+    y: List[List[Optional[float]]] = Field(..., description="The state at each reported time, one value per variable.")
+    variables: List[str]
+    method: str
+    success: bool = Field(..., description="Whether the integration reached the end of `t_span`.")
+    message: str
+    steps: int = Field(..., description="Accepted steps taken.")
+    nfev: int = Field(..., description="Evaluations of the right-hand side.")
+    njev: int = Field(..., description="Evaluations of the Jacobian.")
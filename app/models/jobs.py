@@ -0,0 +1,29 @@
+from pydantic import BaseModel, Field
+from enum import Enum
+from typing import Any, Dict, Optional
+from app.models.operations import Operation
+
+class JobStatus(str, Enum):
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+    cancelled = "cancelled"
+
+class JobSubmitRequest(BaseModel):
+    operation: Operation = Field(..., json_schema_extra={'example': "calculus"})
+    payload: Dict[str, Any] = Field(..., description="The request body, exactly as it would be sent to the operation's endpoint.", json_schema_extra={'example': {"expression": "x**5*exp(x)*sin(x)", "operation": "integrate"}})
+    priority: int = Field(0, ge=-10, le=10, description="Higher priorities run first; jobs of equal priority run in submission order.")
+    idempotency_key: Optional[str] = Field(None, min_length=1, max_length=200, description="Resubmitting with the same key returns the existing job instead of queueing a duplicate.", json_schema_extra={'example': "integral-42"})
+
+class JobResponse(BaseModel):
+    id: str
+    operation: str
+    status: JobStatus
+    priority: int
+    created_at: float = Field(..., description="Unix timestamps, in seconds.")
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    expires_at: Optional[float] = Field(None, description="When a finished job and its result are deleted.")
+    result: Optional[Any] = Field(None, description="The operation's response body, once the job has succeeded.")
+    error: Optional[str] = None
@@ -24,13 +24,13 @@ class MatrixRequest(BaseModel):
         if op in [MatrixOperation.determinant, MatrixOperation.inverse] and m2 is not None:
             raise ValueError(f"`matrix2` should not be provided for {op.value}.")
             
-        # Basic validation for matrix shape
-        if m1:
+        # Basic validation for matrix shape; len() also works for streamed NumPy arrays
+        if len(m1):
             first_row_len = len(m1[0])
             if not all(len(row) == first_row_len for row in m1):
                 raise ValueError("All rows in `matrix1` must have the same length.")
 
-        if m2:
+        if m2 is not None and len(m2):
             first_row_len = len(m2[0])
             if not all(len(row) == first_row_len for row in m2):
                 raise ValueError("All rows in `matrix2` must have the same length.")
@@ -38,8 +38,9 @@ class MatrixRequest(BaseModel):
         return self
 
 class MatrixResponse(BaseModel):
-    # The result can be a matrix (list of lists) or a single number (determinant)
-    result: Union[List[List[float]], float]
+    # The result can be a matrix (list of lists) or a single number (determinant).
+    # Values that are not finite, such as an overflowing determinant, are null.
+    result: Union[List[List[Optional[float]]], Optional[float]]
     operation: str
     input_shape1: str
     input_shape2: Optional[str] = None
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, conlist, field_validator
 from enum import IntEnum
+from typing import List, Optional
 
 class NumberSystem(IntEnum):
     BINARY = 2
@@ -28,3 +29,16 @@ class ConversionResponse(BaseModel):
     from_base: int
     to_base: int
     original_value: str
+
+class BatchConversionRequest(BaseModel):
+    # Values are parsed once, in the service; a failing value is reported by its index
+    values: conlist(str, min_length=1) = Field(..., description="The numbers to convert, represented as strings.", json_schema_extra={'example': ["FF", "1A", "0"]})
+    from_base: NumberSystem = Field(..., description="The base of the input numbers.")
+    to_base: NumberSystem = Field(..., description="The target base to convert to.")
+    width: Optional[int] = Field(None, ge=1, le=512, description="Zero-pad every result to this many digits (the sign of a negative value is not counted). Values with more digits are rejected.", json_schema_extra={'example': 8})
+
+class BatchConversionResponse(BaseModel):
+    results: List[str]
+    from_base: int
+    to_base: int
+    count: int
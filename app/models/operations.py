@@ -0,0 +1,20 @@
+from enum import Enum
+
+class Operation(str, Enum):
+    """The calculator services that can be run outside their HTTP endpoints (e.g. as jobs)."""
+    arithmetic = "arithmetic"
+    trigonometry = "trigonometry"
+    logarithms = "logarithms"
+    algebra = "algebra"
+    algebra_solve = "algebra_solve"
+    algebra_polynomial = "algebra_polynomial"
+    complex = "complex"
+    calculus = "calculus"
+    calculus_multivariable = "calculus_multivariable"
+    calculus_plot = "calculus_plot"
+    differential_equations = "differential_equations"
+    matrices = "matrices"
+    statistics = "statistics"
+    number_systems = "number_systems"
+    number_systems_batch = "number_systems_batch"
+    pipeline = "pipeline"
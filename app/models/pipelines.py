@@ -0,0 +1,51 @@
+from pydantic import BaseModel, Field, conlist, model_validator
+from enum import Enum
+from typing import Any, Dict
+
+class PipelineStepKind(str, Enum):
+    arithmetic = "arithmetic"
+    calculus = "calculus"
+    evaluate = "evaluate"
+    statistics = "statistics"
+    matrices = "matrices"
+
+class PipelineStep(BaseModel):
+    id: str = Field(..., pattern=r"^[A-Za-z_][A-Za-z0-9_-]*$", description="A unique name for the step, used to reference its output.", json_schema_extra={'example': "derivative"})
+    kind: PipelineStepKind = Field(..., description="The service the step runs.")
+    params: Dict[str, Any] = Field(default_factory=dict, description="Literal parameters, named as in the corresponding endpoint's request body.", json_schema_extra={'example': {"expression": "x**3", "operation": "differentiate"}})
+    inputs: Dict[str, str] = Field(default_factory=dict, description="Parameters taken from earlier steps, mapping each parameter name to the id of the step whose output it receives.", json_schema_extra={'example': {}})
+
+    @model_validator(mode='after')
+    def validate_step(self):
+        overlap = set(self.params) & set(self.inputs)
+        if overlap:
+            raise ValueError(f"Step '{self.id}' sets {sorted(overlap)} both as a literal parameter and as an input.")
+        return self
+
+class PipelineRequest(BaseModel):
+    steps: conlist(PipelineStep, min_length=1) = Field(..., json_schema_extra={'example': [
+        {"id": "derivative", "kind": "calculus", "params": {"expression": "x**3", "operation": "differentiate"}},
+        {"id": "grid", "kind": "evaluate", "params": {"start": 0, "stop": 1, "num": 11}, "inputs": {"expression": "derivative"}},
+        {"id": "average", "kind": "statistics", "params": {"operation": "mean"}, "inputs": {"data": "grid"}},
+    ]})
+    outputs: conlist(str, min_length=1) = Field(..., description="The ids of the steps whose results are returned.", json_schema_extra={'example': ["derivative", "average"]})
+
+    @model_validator(mode='after')
+    def validate_request(self):
+        ids = [step.id for step in self.steps]
+        if len(ids) != len(set(ids)):
+            raise ValueError("Step ids must be unique.")
+
+        known = set(ids)
+        for step in self.steps:
+            for name, source in step.inputs.items():
+                if source not in known:
+                    raise ValueError(f"Input `{name}` of step '{step.id}' references unknown step '{source}'.")
+        for output in self.outputs:
+            if output not in known:
+                raise ValueError(f"Output '{output}' does not match any step.")
+        return self
+
+class PipelineResponse(BaseModel):
+    outputs: Dict[str, Any] = Field(..., description="The result of each requested step. Expressions are returned as strings, arrays as (nested) lists of numbers.")
+    steps_executed: int
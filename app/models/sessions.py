@@ -0,0 +1,37 @@
+from pydantic import BaseModel, Field, model_validator
+from enum import Enum
+from typing import Any, Dict, Optional, Union
+from app.models.operations import Operation
+
+class SessionAction(str, Enum):
+    run = "run"
+    define = "define"
+    evaluate = "evaluate"
+    variables = "variables"
+    clear = "clear"
+    cancel = "cancel"
+
+class SessionMessage(BaseModel):
+    """A message sent by the client over a `/ws` session."""
+    id: Union[str, int] = Field(..., description="Chosen by the client and echoed in the reply, which may arrive out of order.")
+    action: SessionAction = Field(SessionAction.run, description="`run` an operation, `define` or `evaluate` with session variables, list the `variables`, `clear` them, or `cancel` a pending request.")
+    operation: Optional[Operation] = Field(None, description="[For run Only] The service to run.", json_schema_extra={'example': "trigonometry"})
+    payload: Optional[Dict[str, Any]] = Field(None, description="[For run Only] The request body, exactly as it would be sent to the operation's endpoint.")
+    name: Optional[str] = Field(None, description="[For define Only] The variable to define.", json_schema_extra={'example': "a"})
+    expression: Optional[str] = Field(None, description="[For define and evaluate Only] An expression that may use the session's variables.", json_schema_extra={'example': "2*pi*a"})
+    target: Optional[Union[str, int]] = Field(None, description="[For cancel Only] The id of the request to cancel.")
+
+    @model_validator(mode='after')
+    def validate_request(self):
+        required = {
+            SessionAction.run: ("operation", "payload"),
+            SessionAction.define: ("name", "expression"),
+            SessionAction.evaluate: ("expression",),
+            SessionAction.cancel: ("target",),
+        }.get(self.action, ())
+        for field in ("operation", "payload", "name", "expression", "target"):
+            if field in required and getattr(self, field) is None:
+                raise ValueError(f"`{field}` is required for {self.action.value}.")
+            if field not in required and getattr(self, field) is not None:
+                raise ValueError(f"`{field}` should not be provided for {self.action.value}.")
+        return self
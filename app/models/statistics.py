@@ -1,19 +1,64 @@
-from pydantic import BaseModel, Field, conlist
+from pydantic import BaseModel, Field, conlist, model_validator
 from enum import Enum
-from typing import List
+from typing import List, Literal, Optional, Union
 
 class StatisticsOperation(str, Enum):
     mean = "mean"
     median = "median"
     std_dev = "std_dev"
     variance = "variance"
+    correlation = "correlation"
+    covariance = "covariance"
+    linear_regression = "linear_regression"
+    polynomial_regression = "polynomial_regression"
+    histogram = "histogram"
+
+# Operations on two paired series: `data` (x) and `data2` (y)
+PAIRED_OPERATIONS = [
+    StatisticsOperation.correlation,
+    StatisticsOperation.covariance,
+    StatisticsOperation.linear_regression,
+    StatisticsOperation.polynomial_regression,
+]
 
 class StatisticsRequest(BaseModel):
     operation: StatisticsOperation
     # Use conlist to enforce at least one number in the dataset
     data: conlist(float, min_length=1) = Field(..., json_schema_extra={'example': [1, 2, 3, 4, 5]})
+    data2: Optional[List[float]] = Field(None, description="[For correlation, covariance and regressions Only] The second series, paired with `data`. For regressions, `data` holds x and `data2` holds y.", json_schema_extra={'example': [2.1, 3.9, 6.2, 7.8, 10.1]})
+    degree: Optional[int] = Field(None, ge=1, le=20, description="[For polynomial_regression Only] The degree of the fitted polynomial.", json_schema_extra={'example': 2})
+    bins: Optional[Union[int, Literal["auto"]]] = Field(None, description="[For histogram Only] The number of equal-width bins, or 'auto' to choose it from the data. Defaults to 'auto'.", json_schema_extra={'example': 10})
+
+    @model_validator(mode='after')
+    def validate_request(self):
+        op = self.operation
+
+        if op in PAIRED_OPERATIONS:
+            if self.data2 is None:
+                raise ValueError(f"`data2` is required for {op.value}.")
+            if len(self.data2) != len(self.data):
+                raise ValueError("`data` and `data2` must have the same length.")
+        elif self.data2 is not None:
+            raise ValueError(f"`data2` should not be provided for {op.value}.")
+
+        if op == StatisticsOperation.polynomial_regression:
+            if self.degree is None:
+                raise ValueError("`degree` is required for polynomial_regression.")
+        elif self.degree is not None:
+            raise ValueError(f"`degree` should not be provided for {op.value}.")
+
+        if op != StatisticsOperation.histogram and self.bins is not None:
+            raise ValueError(f"`bins` should not be provided for {op.value}.")
+        if isinstance(self.bins, int) and self.bins < 1:
+            raise ValueError("`bins` must be at least 1.")
+
+        return self
 
 class StatisticsResponse(BaseModel):
-    result: float
+    # A single value, regression coefficients (highest power first) or histogram counts.
+    # Values that are not finite, such as an overflowing mean, are null.
+    result: Union[Optional[float], List[Optional[float]]]
     operation: str
     dataset_size: int
+    r_squared: Optional[float] = Field(None, description="[Regressions Only] The coefficient of determination of the fit.")
+    bin_edges: Optional[List[float]] = Field(None, description="[Histogram Only] The bin edges; bin i covers [bin_edges[i], bin_edges[i+1]).")
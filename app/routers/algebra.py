@@ -1,11 +1,17 @@
-from fastapi import APIRouter, HTTPException
-from app.models.algebra import PolynomialSolverRequest, PolynomialSolverResponse
-from app.services.algebra import solve_polynomial_roots
+import asyncio
+from fastapi import APIRouter, HTTPException, Request
+from app.core.admission import admission_controller
+from app.core.coalescing import coalesce
+from app.core.responses import NumpyJSONResponse
+from app.models.algebra import NonlinearSolverRequest, NonlinearSolverResponse, PolynomialRequest, PolynomialResponse, PolynomialSolverRequest, PolynomialSolverResponse
+from app.models.operations import Operation
+from app.services.operations import run_operation
 
 router = APIRouter()
 
 @router.post("/algebra/poly-solve",
              response_model=PolynomialSolverResponse,
+             response_class=NumpyJSONResponse,
              tags=["Algebra"],
              summary="Solve a polynomial equation by finding its roots",
              description="""
@@ -15,22 +21,89 @@ The coefficients should be provided in a list in descending order of power.
 **Example:** For the equation `x^2 - 4 = 0`, the coefficients are `[1, 0, -4]`.
 The endpoint will return the roots `["2.0", "-2.0"]`.
 """)
-async def solve_polynomial_endpoint(request: PolynomialSolverRequest):
+async def solve_polynomial_endpoint(request: PolynomialSolverRequest, http_request: Request):
     """
     Endpoint to solve a polynomial by finding its roots.
 
     - **request**: A `PolynomialSolverRequest` model containing:
         - `coefficients`: A list of floats representing the polynomial.
     """
-    try:
-        roots, polynomial_str = solve_polynomial_roots(request.coefficients)
-        return PolynomialSolverResponse(
-            roots=roots,
-            polynomial=polynomial_str
-        )
-    except ValueError as e:
-        # Catches errors from the service layer, like not enough coefficients
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        # Catch-all for any other unexpected errors
-        raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {str(e)}")
+    # Shed or defer the request by its estimated cost before any work starts
+    async with admission_controller.admit(request, http_request):
+        try:
+            # Identical concurrent requests share a single computation
+            body = await coalesce("algebra", request, run_operation, Operation.algebra, request)
+            return NumpyJSONResponse(body)
+        except ValueError as e:
+            # Catches errors from the service layer, like not enough coefficients
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            # Catch-all for any other unexpected errors
+            raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {str(e)}")
+
+@router.post("/algebra/polynomial",
+             response_model=PolynomialResponse,
+             response_class=NumpyJSONResponse,
+             tags=["Algebra"],
+             summary="Add, multiply, divide, compose, differentiate, integrate or evaluate polynomials",
+             description="""
+Performs arithmetic on polynomials given, as for `/algebra/poly-solve`, by their coefficients in descending order of power.
+
+- **Operations**: `add`, `subtract`, `multiply`, `divide` (quotient in `result`, plus `remainder`) and `compose`
+  (`coefficients` evaluated at `coefficients2`) take a second polynomial in `coefficients2`; `derivative` and
+  `integral` take an optional `order`; `evaluate` takes `points`.
+- High-degree products, including those inside `compose`, are computed with FFTs in O(n log n). Integer products are
+  exact as long as their coefficients stay below 2^40.
+- `evaluate` runs Horner's scheme over all points at once.
+- Integrals use zero integration constants.
+
+**Example:** `multiply` with `[1, -1]` and `[1, 1]` returns `[1, 0, -1]` (x**2 - 1).
+""")
+async def polynomial_endpoint(request: PolynomialRequest, http_request: Request):
+    """
+    Endpoint to perform a polynomial operation.
+
+    - **request**: A `PolynomialRequest` model.
+    """
+    # Shed or defer the request by its estimated cost before any work starts
+    async with admission_controller.admit(request, http_request):
+        try:
+            # Run off the event loop so admitted requests can overlap with cheap traffic. Bodies
+            # of up to millions of coefficients are not worth a coalescing key.
+            body = await asyncio.to_thread(run_operation, Operation.algebra_polynomial, request)
+            return NumpyJSONResponse(body)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {str(e)}")
+
+@router.post("/algebra/solve",
+             response_model=NonlinearSolverResponse,
+             response_class=NumpyJSONResponse,
+             tags=["Algebra"],
+             summary="Find the real roots of nonlinear equations or systems",
+             description="""
+Solves transcendental equations such as `x*exp(x) = 3` and small square systems of nonlinear equations.
+
+- **Methods**: `newton` runs damped Newton iterations from many starting points at once, using the
+  symbolic Jacobian; `bracket` bisects every sign change of a single equation found on a grid.
+- The equations and their Jacobian are compiled once into vectorised NumPy functions.
+- Every distinct root is reported with its residual, the iterations taken and how many starts reached it.
+- Iterations stop at `max_iterations` per start or when `time_limit` seconds have passed.
+""")
+async def solve_nonlinear_endpoint(request: NonlinearSolverRequest, http_request: Request):
+    """
+    Endpoint to solve nonlinear equations numerically.
+
+    - **request**: A `NonlinearSolverRequest` model.
+    """
+    # Shed or defer the request by its estimated cost before any work starts
+    async with admission_controller.admit(request, http_request):
+        try:
+            # Starting points are deterministic, so identical concurrent requests can share a computation
+            body = await coalesce("algebra_solve", request, run_operation, Operation.algebra_solve, request)
+            return NumpyJSONResponse(body)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {str(e)}")
@@ -1,11 +1,14 @@
 from fastapi import APIRouter, HTTPException
+from app.core.responses import NumpyJSONResponse
 from app.models.arithmetic import ArithmeticRequest, ArithmeticResponse
-from app.services.arithmetic import evaluate_arithmetic_expression
+from app.models.operations import Operation
+from app.services.operations import run_operation
 
 router = APIRouter()
 
 @router.post("/arithmetic/evaluate",
              response_model=ArithmeticResponse,
+             response_class=NumpyJSONResponse,
              tags=["Arithmetic"],
              summary="Evaluate a basic arithmetic expression",
              description="""
@@ -18,8 +21,7 @@ async def evaluate_expression(request: ArithmeticRequest):
     Endpoint to evaluate a simple arithmetic expression.
     """
     try:
-        result = evaluate_arithmetic_expression(request.expression)
-        return ArithmeticResponse(result=result, expression=request.expression)
+        return NumpyJSONResponse(run_operation(Operation.arithmetic, request))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
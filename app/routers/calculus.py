@@ -1,41 +1,103 @@
-from fastapi import APIRouter, HTTPException
-from app.models.calculus import CalculusRequest, CalculusResponse
-from app.services.calculus import perform_calculus_operation
+from fastapi import APIRouter, HTTPException, Request
+from app.core.admission import admission_controller
+from app.core.coalescing import coalesce
+from app.core.responses import NumpyJSONResponse
+from app.models.calculus import CalculusRequest, CalculusResponse, MultivariableCalculusRequest, MultivariableCalculusResponse, PlotRequest, PlotResponse
+from app.models.operations import Operation
+from app.services.operations import run_operation
 
 router = APIRouter()
 
 @router.post("/calculus/evaluate",
              response_model=CalculusResponse,
+             response_class=NumpyJSONResponse,
              tags=["Calculus"],
-             summary="Perform differentiation or integration on an expression",
+             summary="Perform differentiation, integration or series expansion on an expression",
              description="""
 Performs a symbolic calculus operation on a given expression with respect to the variable 'x'.
 
-- **Operations**: `differentiate`, `integrate`
+- **Operations**: `differentiate`, `integrate`, `nth_derivative`, `series`
 - For **definite integration**, provide the lower and upper bounds in the `integration_bounds` field (e.g., `[0, 1]`).
 - For **indefinite integration** or **differentiation**, omit the `integration_bounds` field.
+- For `nth_derivative` and `series`, provide the derivative or series `order`. For `series`, optionally provide the `expansion_point` (defaults to 0).
+- Successive derivatives are cached per expression, so asking for a higher order later continues from the orders already computed.
 """)
-async def evaluate_calculus_endpoint(request: CalculusRequest):
+async def evaluate_calculus_endpoint(request: CalculusRequest, http_request: Request):
     """
     Endpoint to perform a calculus operation.
 
     - **request**: A `CalculusRequest` model.
     """
-    try:
-        result_str, is_definite = perform_calculus_operation(
-            expression_str=request.expression,
-            operation=request.operation,
-            bounds=request.integration_bounds
-        )
-        return CalculusResponse(
-            result=result_str,
-            input_expression=request.expression,
-            operation=request.operation.value,
-            is_definite_integral=is_definite
-        )
-    except ValueError as e:
-        # Catches errors from the service layer or Pydantic model validation
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        # A catch-all for other unexpected server errors
-        raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {str(e)}")
+    # Shed or defer the request by its estimated cost before any work starts
+    async with admission_controller.admit(request, http_request):
+        try:
+            # Identical concurrent requests share a single computation
+            body = await coalesce("calculus", request, run_operation, Operation.calculus, request)
+            return NumpyJSONResponse(body)
+        except ValueError as e:
+            # Catches errors from the service layer or Pydantic model validation
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            # A catch-all for other unexpected server errors
+            raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {str(e)}")
+
+@router.post("/calculus/multivariable",
+             response_model=MultivariableCalculusResponse,
+             response_class=NumpyJSONResponse,
+             tags=["Calculus"],
+             summary="Compute gradients, Jacobians and Hessians of multivariable expressions",
+             description="""
+Differentiates expressions with respect to several declared variables in a single request.
+
+- **Operations**: `gradient` and `hessian` (one scalar expression), `jacobian` (one expression per output component)
+- Common subexpressions are eliminated across all components of the result and returned in `subexpressions` and `reduced_result`.
+- Provide `evaluate_at` to evaluate the whole result at many points with one compiled, vectorised evaluator.
+""")
+async def evaluate_multivariable_endpoint(request: MultivariableCalculusRequest, http_request: Request):
+    """
+    Endpoint to perform a multivariable calculus operation.
+
+    - **request**: A `MultivariableCalculusRequest` model.
+    """
+    # Shed or defer the request by its estimated cost before any work starts
+    async with admission_controller.admit(request, http_request):
+        try:
+            # Identical concurrent requests share a single computation
+            body = await coalesce("calculus_multivariable", request, run_operation, Operation.calculus_multivariable, request)
+            return NumpyJSONResponse(body)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {str(e)}")
+
+@router.post("/calculus/plot",
+             response_model=PlotResponse,
+             response_class=NumpyJSONResponse,
+             tags=["Calculus"],
+             summary="Sample a function or one of its derivatives for plotting",
+             description="""
+Returns the points needed to draw `expression` (or its `derivative_order`-th derivative) over `x_range` to within
+`tolerance` of the true curve, instead of a dense uniform grid.
+
+- The compiled expression is evaluated on a coarse grid of `initial_points`, then refined only where the curve bends
+  or reaches the edge of its domain, within a budget of `max_points` evaluations.
+- Points the polyline does not need are dropped, so straight stretches cost two points.
+- Vertical `asymptotes` and finite `discontinuities` are located by bisection. Asymptotes appear in the points with a
+  null `y`, so the curve is not drawn across them; so do the parts of the range where the function is undefined.
+""")
+async def plot_endpoint(request: PlotRequest, http_request: Request):
+    """
+    Endpoint to sample a function for plotting.
+
+    - **request**: A `PlotRequest` model.
+    """
+    # Shed or defer the request by its estimated cost before any work starts
+    async with admission_controller.admit(request, http_request):
+        try:
+            # Identical concurrent requests share a single computation
+            body = await coalesce("calculus_plot", request, run_operation, Operation.calculus_plot, request)
+            return NumpyJSONResponse(body)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {str(e)}")
@@ -1,11 +1,14 @@
 from fastapi import APIRouter, HTTPException
+from app.core.responses import NumpyJSONResponse
 from app.models.complex_numbers import ComplexArithmeticRequest, ComplexArithmeticResponse
-from app.services.complex_numbers import evaluate_complex_arithmetic
+from app.models.operations import Operation
+from app.services.operations import run_operation
 
 router = APIRouter()
 
 @router.post("/complex/evaluate",
              response_model=ComplexArithmeticResponse,
+             response_class=NumpyJSONResponse,
              tags=["Complex Numbers"],
              summary="Perform arithmetic on two complex numbers",
              description="""
@@ -24,12 +27,7 @@ async def evaluate_complex_endpoint(request: ComplexArithmeticRequest):
         - `operation`: The operation to perform.
     """
     try:
-        result, calc_str = evaluate_complex_arithmetic(
-            num1_str=request.num1,
-            num2_str=request.num2,
-            operation=request.operation
-        )
-        return ComplexArithmeticResponse(result=result, calculation=calc_str)
+        return NumpyJSONResponse(run_operation(Operation.complex, request))
     except ValueError as e:
         # Catches validation, division by zero, etc.
         raise HTTPException(status_code=400, detail=str(e))
@@ -0,0 +1,102 @@
+import asyncio
+import itertools
+from contextlib import AsyncExitStack
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import iterate_in_threadpool
+from app.core.admission import admission_controller
+from app.core.responses import NumpyJSONResponse
+from app.models.differential_equations import ODERequest, ODEResponse
+from app.models.operations import Operation
+from app.services.differential_equations import integrate_ode, trajectory_to_ndjson
+from app.services.operations import run_operation
+
+router = APIRouter()
+
+def _arguments(request: ODERequest) -> dict:
+    return {
+        "equations": request.equations,
+        "variables": request.variables,
+        "initial_values": request.initial_values,
+        "t_span": request.t_span,
+        "method": request.method,
+        "time_variable": request.time_variable,
+        "t_eval": request.t_eval,
+        "num_points": request.num_points,
+        "rtol": request.rtol,
+        "atol": request.atol,
+        "max_step": request.max_step,
+        "max_steps": request.max_steps,
+        "time_limit": request.time_limit,
+    }
+
+@router.post("/ode/solve",
+             response_model=ODEResponse,
+             response_class=NumpyJSONResponse,
+             tags=["Differential Equations"],
+             summary="Solve an initial-value problem for a system of ordinary differential equations",
+             description="""
+Integrates `d(variables[i])/dt = equations[i]` from `initial_values` over `t_span`.
+
+- The right-hand sides are symbolic expressions in the state variables and the time variable. They are compiled once,
+  together with their Jacobian, into vectorised NumPy functions.
+- **Methods**: `RK45`, `RK23`, `DOP853` (explicit, adaptive step) and `Radau`, `BDF`, `LSODA` (for stiff systems).
+- By default every accepted step is reported. Provide `t_eval` or `num_points` to report the state at chosen times,
+  interpolated from the dense output of each step, without forcing smaller steps.
+- For long integrations, use `/ode/solve-stream`.
+""")
+async def solve_ode_endpoint(request: ODERequest, http_request: Request):
+    """
+    Endpoint to solve an initial-value problem.
+
+    - **request**: An `ODERequest` model.
+    """
+    # Shed or defer the request by its estimated cost before any work starts
+    async with admission_controller.admit(request, http_request):
+        try:
+            # Run off the event loop so admitted requests can overlap with cheap traffic
+            body = await asyncio.to_thread(run_operation, Operation.differential_equations, request)
+            return NumpyJSONResponse(body)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {str(e)}")
+
+@router.post("/ode/solve-stream",
+             tags=["Differential Equations"],
+             summary="Solve an initial-value problem, streaming the trajectory as NDJSON",
+             description="""
+Accepts the same body as `/ode/solve` and streams the trajectory while it is integrated, one JSON object per line:
+
+- `{"t": 0.5, "y": [0.88, -0.47]}` for every reported time, in order.
+- A final `{"done": true, "success": ..., "message": ..., "steps": ..., "nfev": ..., "njev": ...}` line.
+
+Invalid equations are rejected with a 400 before the stream starts. Trajectories are not limited in length.
+""",
+             responses={200: {"content": {"application/x-ndjson": {}}, "description": "The trajectory, one JSON object per line."}})
+async def solve_ode_stream_endpoint(request: ODERequest, http_request: Request):
+    """
+    Endpoint to solve an initial-value problem with a streamed trajectory.
+
+    - **request**: An `ODERequest` model.
+    """
+    # Hold the admission slot until the stream ends, not just until the response starts
+    stack = AsyncExitStack()
+    await stack.enter_async_context(admission_controller.admit(request, http_request))
+    try:
+        trajectory = integrate_ode(**_arguments(request))
+        # Compiles the system and reports the initial state, so invalid input fails before streaming
+        first = await asyncio.to_thread(next, trajectory)
+    except ValueError as e:
+        await stack.aclose()
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        await stack.aclose()
+        raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {str(e)}")
+
+    async def body():
+        async with stack:
+            async for chunk in iterate_in_threadpool(trajectory_to_ndjson(itertools.chain([first], trajectory))):
+                yield chunk
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
@@ -0,0 +1,84 @@
+import asyncio
+from fastapi import APIRouter, HTTPException
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
+from app.core.responses import NumpyJSONResponse
+from app.models.jobs import JobResponse, JobSubmitRequest
+from app.services.jobs import JobConflictError, JobQueueFullError, job_manager
+from app.services.operations import validate_operation
+
+router = APIRouter()
+
+@router.post("/jobs",
+             response_model=JobResponse,
+             response_class=NumpyJSONResponse,
+             status_code=202,
+             tags=["Jobs"],
+             summary="Submit a long-running calculation as a background job",
+             description="""
+Queues any calculation to run in the background, for requests that may take longer than a client can hold a connection open.
+
+- **operation**: The service to run, e.g. `calculus`, `matrices` or `pipeline`.
+- **payload**: The request body exactly as it would be sent to that service's endpoint. It is validated on submission.
+- **priority**: Higher priorities run first.
+- **idempotency_key**: Retrying with the same key returns the original job instead of queueing the work again.
+
+Poll `GET /jobs/{job_id}` for the result. Finished jobs are kept for a limited time.
+""")
+async def submit_job_endpoint(request: JobSubmitRequest):
+    """
+    Endpoint to submit a background job.
+
+    - **request**: A `JobSubmitRequest` model.
+    """
+    try:
+        payload = validate_operation(request.operation, request.payload)
+    except ValidationError as e:
+        # Report errors at their location within the submitted body
+        raise RequestValidationError([
+            {**error, "loc": ("body", "payload", *error["loc"])} for error in e.errors(include_url=False)
+        ])
+
+    try:
+        job, created = await asyncio.to_thread(
+            job_manager.submit, request.operation, payload, request.priority, request.idempotency_key
+        )
+        return NumpyJSONResponse(job, status_code=202 if created else 200)
+    except JobConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {str(e)}")
+
+@router.get("/jobs/{job_id}",
+            response_model=JobResponse,
+            response_class=NumpyJSONResponse,
+            tags=["Jobs"],
+            summary="Get the status and result of a background job")
+async def get_job_endpoint(job_id: str):
+    """
+    Endpoint to poll a background job.
+    """
+    job = await asyncio.to_thread(job_manager.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' was not found or has expired.")
+    return NumpyJSONResponse(job)
+
+@router.delete("/jobs/{job_id}",
+               response_model=JobResponse,
+               response_class=NumpyJSONResponse,
+               tags=["Jobs"],
+               summary="Cancel a background job",
+               description="""
+Cancels a queued or running job. A running computation is not interrupted, but its result is discarded.
+Cancelling a finished job has no effect.
+""")
+async def cancel_job_endpoint(job_id: str):
+    """
+    Endpoint to cancel a background job.
+    """
+    job = await asyncio.to_thread(job_manager.cancel, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' was not found or has expired.")
+    return NumpyJSONResponse(job)
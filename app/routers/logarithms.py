@@ -1,11 +1,14 @@
 from fastapi import APIRouter, HTTPException
+from app.core.responses import NumpyJSONResponse
 from app.models.logarithms import LogarithmRequest, LogarithmResponse
-from app.services.logarithms import evaluate_logarithmic_function
+from app.models.operations import Operation
+from app.services.operations import run_operation
 
 router = APIRouter()
 
 @router.post("/logarithms/evaluate",
              response_model=LogarithmResponse,
+             response_class=NumpyJSONResponse,
              tags=["Logarithms"],
              summary="Evaluate a logarithmic function",
              description="""
@@ -25,17 +28,7 @@ async def evaluate_log_expression(request: LogarithmRequest):
         - `base`: An optional float value for the base (required for 'log').
     """
     try:
-        result = evaluate_logarithmic_function(
-            function=request.function,
-            value=request.value,
-            base=request.base
-        )
-        return LogarithmResponse(
-            result=result,
-            function=request.function.value,
-            input_value=request.value,
-            base=request.base
-        )
+        return NumpyJSONResponse(run_operation(Operation.logarithms, request))
     except ValueError as e:
         # Catches domain errors, invalid base, or missing base from the service/Pydantic model
         raise HTTPException(status_code=400, detail=str(e))
@@ -1,11 +1,34 @@
-from fastapi import APIRouter, HTTPException
+import asyncio
+from fastapi import APIRouter, HTTPException, Request
+from app.core.admission import admission_controller
+from app.core.responses import NumpyJSONResponse
+from app.core.streaming import read_numeric_request
 from app.models.matrices import MatrixRequest, MatrixResponse
-from app.services.matrices import perform_matrix_operation
+from app.models.operations import Operation
+from app.services.operations import run_operation
 
 router = APIRouter()
 
+# Array fields of a streamed matrix body and their dimensions
+_STREAMED_ARRAYS = {"matrix1": 2, "matrix2": 2}
+
+async def _evaluate(request: MatrixRequest, http_request: Request) -> NumpyJSONResponse:
+    # Shed or defer the request by its estimated cost before any work starts
+    async with admission_controller.admit(request, http_request):
+        try:
+            # Run off the event loop so admitted requests can overlap with cheap traffic
+            body = await asyncio.to_thread(run_operation, Operation.matrices, request)
+            return NumpyJSONResponse(body)
+        except ValueError as e:
+            # Catches errors from the service layer or Pydantic model validation
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            # A catch-all for other unexpected server errors
+            raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {str(e)}")
+
 @router.post("/matrices/evaluate",
              response_model=MatrixResponse,
+             response_class=NumpyJSONResponse,
              tags=["Matrices"],
              summary="Perform a matrix operation (multiply, determinant, inverse)",
              description="""
@@ -15,27 +38,33 @@ Performs a specified operation on one or two matrices.
 - For `multiply`, both `matrix1` and `matrix2` are required.
 - For `determinant` and `inverse`, only `matrix1` is required.
 """)
-async def evaluate_matrix_endpoint(request: MatrixRequest):
+async def evaluate_matrix_endpoint(request: MatrixRequest, http_request: Request):
     """
     Endpoint to perform a matrix operation.
 
     - **request**: A `MatrixRequest` model.
     """
-    try:
-        result, shape1, shape2 = perform_matrix_operation(
-            operation=request.operation,
-            matrix1=request.matrix1,
-            matrix2=request.matrix2
-        )
-        return MatrixResponse(
-            result=result,
-            operation=request.operation.value,
-            input_shape1=shape1,
-            input_shape2=shape2
-        )
-    except ValueError as e:
-        # Catches errors from the service layer or Pydantic model validation
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        # A catch-all for other unexpected server errors
-        raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {str(e)}")
+    return await _evaluate(request, http_request)
+
+@router.post("/matrices/evaluate-stream",
+             response_model=MatrixResponse,
+             response_class=NumpyJSONResponse,
+             tags=["Matrices"],
+             summary="Perform a matrix operation on large, streamed matrices",
+             description="""
+Accepts the same body as `/matrices/evaluate`, for matrices too large to buffer comfortably.
+
+The body is parsed as it arrives and the numbers of `matrix1` and `matrix2` are written straight
+into float64 arrays, so memory use stays close to the size of the matrices themselves. Rows of
+unequal length are rejected as soon as the offending row is read.
+""",
+             openapi_extra={"requestBody": {
+                 "required": True,
+                 "content": {"application/json": {"schema": {"$ref": "#/components/schemas/MatrixRequest"}}},
+             }})
+async def evaluate_matrix_stream_endpoint(http_request: Request):
+    """
+    Endpoint to perform a matrix operation on a streamed body.
+    """
+    request = await read_numeric_request(http_request, MatrixRequest, _STREAMED_ARRAYS)
+    return await _evaluate(request, http_request)
@@ -1,11 +1,16 @@
-from fastapi import APIRouter, HTTPException
-from app.models.number_systems import ConversionRequest, ConversionResponse
-from app.services.number_systems import convert_number_system
+import asyncio
+from fastapi import APIRouter, HTTPException, Request
+from app.core.admission import admission_controller
+from app.core.responses import NumpyJSONResponse
+from app.models.number_systems import BatchConversionRequest, BatchConversionResponse, ConversionRequest, ConversionResponse
+from app.models.operations import Operation
+from app.services.operations import run_operation
 
 router = APIRouter()
 
 @router.post("/numbers/convert",
              response_model=ConversionResponse,
+             response_class=NumpyJSONResponse,
              tags=["Number Systems"],
              summary="Convert a number between different bases",
              description="""
@@ -21,19 +26,38 @@ async def convert_number_endpoint(request: ConversionRequest):
     - **request**: A `ConversionRequest` model.
     """
     try:
-        result = convert_number_system(
-            value=request.value,
-            from_base=request.from_base,
-            to_base=request.to_base
-        )
-        return ConversionResponse(
-            result=result,
-            from_base=request.from_base,
-            to_base=request.to_base,
-            original_value=request.value
-        )
+        return NumpyJSONResponse(run_operation(Operation.number_systems, request))
     except ValueError as e:
         # Catches errors from the service layer or Pydantic model validation.
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {str(e)}")
+
+@router.post("/numbers/convert-batch",
+             response_model=BatchConversionResponse,
+             response_class=NumpyJSONResponse,
+             tags=["Number Systems"],
+             summary="Convert many numbers between two bases",
+             description="""
+Converts a list of numbers from a source base to a target base in one request.
+
+- **Bases**: `2` (Binary), `8` (Octal), `10` (Decimal), `16` (Hexadecimal).
+- **values**: Number strings, each valid in the `from_base`. Results are returned in the same order.
+- **width**: Optional. Zero-pads every result to this many digits, e.g. `8` for byte-wide binary dumps. A value with more digits is rejected.
+""")
+async def convert_number_batch_endpoint(request: BatchConversionRequest, http_request: Request):
+    """
+    Endpoint to convert a batch of numbers between two bases.
+
+    - **request**: A `BatchConversionRequest` model.
+    """
+    # Shed or defer the request by its estimated cost before any work starts
+    async with admission_controller.admit(request, http_request):
+        try:
+            # Run off the event loop so admitted requests can overlap with cheap traffic
+            body = await asyncio.to_thread(run_operation, Operation.number_systems_batch, request)
+            return NumpyJSONResponse(body)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {str(e)}")
@@ -0,0 +1,39 @@
+import asyncio
+from fastapi import APIRouter, HTTPException, Request
+from app.core.admission import admission_controller
+from app.core.responses import NumpyJSONResponse
+from app.models.pipelines import PipelineRequest, PipelineResponse
+from app.models.operations import Operation
+from app.services.operations import run_operation
+
+router = APIRouter()
+
+@router.post("/pipelines/run",
+             response_model=PipelineResponse,
+             response_class=NumpyJSONResponse,
+             tags=["Pipelines"],
+             summary="Run a chain of calculations in a single request",
+             description="""
+Runs a small DAG of calculation steps server-side, passing intermediate results between steps in memory.
+
+- **Step kinds**: `arithmetic`, `calculus`, `evaluate` (evaluate an expression over `points` or a `start`/`stop`/`num` grid), `statistics`, `matrices`
+- `params` holds literal parameters, named as in the matching endpoint's request body.
+- `inputs` maps a parameter name to the id of an earlier step whose result it receives.
+- Independent steps run concurrently, steps that feed no output are skipped, and only the steps listed in `outputs` are returned.
+""")
+async def run_pipeline_endpoint(request: PipelineRequest, http_request: Request):
+    """
+    Endpoint to run a computation pipeline.
+
+    - **request**: A `PipelineRequest` model.
+    """
+    # Shed or defer the request by its estimated cost before any work starts
+    async with admission_controller.admit(request, http_request):
+        try:
+            # Run off the event loop so admitted requests can overlap with cheap traffic
+            body = await asyncio.to_thread(run_operation, Operation.pipeline, request)
+            return NumpyJSONResponse(body)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {str(e)}")
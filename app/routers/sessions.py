@@ -0,0 +1,148 @@
+import asyncio
+import functools
+from typing import Any, Dict, Union
+import orjson
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from pydantic import ValidationError
+from app.core.admission import admission_controller
+from app.core.coalescing import coalesce
+from app.core.config import settings
+from app.core.responses import dump_json
+from app.models.sessions import SessionAction, SessionMessage
+from app.services.operations import run_operation, validate_operation
+from app.services.sessions import INLINE_OPERATIONS, CalculatorSession
+
+router = APIRouter()
+
+def _error(message_id: Any, status: int, error: Any, retry_after: Any = None) -> Dict[str, Any]:
+    reply = {"id": message_id, "ok": False, "status": status, "error": error}
+    if retry_after is not None:
+        reply["retry_after"] = int(retry_after)
+    return reply
+
+def _errors(e: ValidationError) -> list:
+    # Inputs and contexts may hold objects that are not JSON serialisable
+    return e.errors(include_url=False, include_context=False, include_input=False)
+
+def _message_id(raw: Union[str, bytes]) -> Any:
+    """Best-effort id of a message that failed validation, so the client can match the error."""
+    try:
+        message = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return None
+    return message.get("id") if isinstance(message, dict) else None
+
+@router.websocket("/ws")
+async def session_endpoint(websocket: WebSocket):
+    """
+    Interactive calculator session over a single WebSocket connection.
+
+    Every message is a JSON object with a client-chosen `id`, answered by exactly one
+    reply carrying the same `id`: `{"id", "ok": true, "result"}` or
+    `{"id", "ok": false, "status", "error"}`, with HTTP status codes.
+
+    - `run` requests (`operation` and `payload`, as for `/jobs`) are pipelined: they run
+      concurrently and are answered as each completes, possibly out of order. At most
+      `session_max_in_flight` run at once; further messages are read when one finishes.
+    - `define`, `evaluate`, `variables` and `clear` act on the session's variables and
+      are applied in the order received. Expressions evaluated in the session are
+      compiled once and reused as variable values change.
+    - `cancel` drops a pending run (`target`), which is answered with status 499.
+    """
+    await websocket.accept()
+    session = CalculatorSession()
+    pending: Dict[Any, asyncio.Task] = {}
+    slots = asyncio.Semaphore(settings.session_max_in_flight)
+    send_lock = asyncio.Lock()
+
+    async def send(reply: Dict[str, Any]) -> None:
+        async with send_lock:
+            await websocket.send_text(dump_json(reply).decode())
+
+    async def run(message: SessionMessage) -> None:
+        try:
+            try:
+                request = validate_operation(message.operation, message.payload)
+            except ValidationError as e:
+                errors = [{**error, "loc": ("payload", *error["loc"])} for error in _errors(e)]
+                await send(_error(message.id, 422, errors))
+                return
+            if message.operation in INLINE_OPERATIONS:
+                result = run_operation(message.operation, request)
+            else:
+                # Shed or defer the request by its estimated cost before any work starts
+                async with admission_controller.admit(request, websocket):
+                    result = await coalesce(f"session:{message.operation.value}", request, run_operation, message.operation, request)
+            await send({"id": message.id, "ok": True, "result": result})
+        except asyncio.CancelledError:
+            raise
+        except HTTPException as e:
+            await send(_error(message.id, e.status_code, e.detail, (e.headers or {}).get("Retry-After")))
+        except ValueError as e:
+            await send(_error(message.id, 400, str(e)))
+        except Exception as e:
+            await send(_error(message.id, 500, f"An unexpected error occurred: {str(e)}"))
+
+    def finished(message_id: Any, task: asyncio.Task) -> None:
+        # A done callback also runs for tasks cancelled before they started
+        if pending.get(message_id) is task:
+            del pending[message_id]
+        slots.release()
+
+    async def handle(message: SessionMessage) -> None:
+        if message.action == SessionAction.run:
+            if message.id in pending:
+                await send(_error(message.id, 409, f"Request '{message.id}' is still pending."))
+                return
+            await slots.acquire()
+            task = asyncio.create_task(run(message))
+            pending[message.id] = task
+            task.add_done_callback(lambda t, message_id=message.id: finished(message_id, t))
+        elif message.action == SessionAction.cancel:
+            task = pending.pop(message.target, None)
+            if task is not None:
+                task.cancel()
+                await send(_error(message.target, 499, "Cancelled by the client."))
+            await send({"id": message.id, "ok": True, "result": {"cancelled": task is not None}})
+        else:
+            try:
+                if message.action in (SessionAction.define, SessionAction.evaluate):
+                    if message.action == SessionAction.define:
+                        call = functools.partial(session.define, message.name, message.expression)
+                    else:
+                        call = functools.partial(session.evaluate, message.expression)
+                    # Parsing can be slow, so it runs off the event loop; compiled expressions are
+                    # evaluated in place. Session actions are awaited one at a time, in order.
+                    value = call() if session.is_compiled(message.expression) else await asyncio.to_thread(call)
+                    result = {"name": message.name, "value": value} if message.action == SessionAction.define else {"value": value}
+                elif message.action == SessionAction.variables:
+                    result = {"variables": session.variables}
+                else:
+                    session.clear()
+                    result = {"variables": session.variables}
+            except ValueError as e:
+                await send(_error(message.id, 400, str(e)))
+                return
+            except Exception as e:
+                # A failing message is answered like any other; it must not end the session
+                await send(_error(message.id, 500, f"An unexpected error occurred: {str(e)}"))
+                return
+            await send({"id": message.id, "ok": True, "result": result})
+
+    try:
+        while True:
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                break
+            raw = frame.get("text") if frame.get("text") is not None else frame.get("bytes")
+            try:
+                message = SessionMessage.model_validate_json(raw)
+            except ValidationError as e:
+                await send(_error(_message_id(raw), 422, _errors(e)))
+                continue
+            await handle(message)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        for task in pending.values():
+            task.cancel()
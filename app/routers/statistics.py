@@ -1,37 +1,73 @@
-from fastapi import APIRouter, HTTPException
+import asyncio
+from fastapi import APIRouter, HTTPException, Request
+from app.core.admission import admission_controller
+from app.core.responses import NumpyJSONResponse
+from app.core.streaming import read_numeric_request
 from app.models.statistics import StatisticsRequest, StatisticsResponse
-from app.services.statistics import perform_statistics_operation
+from app.models.operations import Operation
+from app.services.operations import run_operation
 
 router = APIRouter()
 
+# Array fields of a streamed statistics body and their dimensions
+_STREAMED_ARRAYS = {"data": 1, "data2": 1}
+
+async def _evaluate(request: StatisticsRequest, http_request: Request) -> NumpyJSONResponse:
+    # Shed or defer the request by its estimated cost before any work starts
+    async with admission_controller.admit(request, http_request):
+        try:
+            # Run off the event loop so admitted requests can overlap with cheap traffic
+            body = await asyncio.to_thread(run_operation, Operation.statistics, request)
+            return NumpyJSONResponse(body)
+        except ValueError as e:
+            # Catches errors from the service layer, e.g., empty dataset
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {str(e)}")
+
 @router.post("/statistics/evaluate",
              response_model=StatisticsResponse,
+             response_class=NumpyJSONResponse,
              tags=["Statistics"],
              summary="Perform a statistical calculation on a dataset",
              description="""
-Calculates the mean, median, standard deviation, or variance for a given list of numbers.
+Calculates summary statistics, relationships between two series, least-squares fits and histograms.
+
+- **Operations**: `mean`, `median`, `std_dev`, `variance`, `correlation`, `covariance`, `linear_regression`, `polynomial_regression`, `histogram`
+- **data**: A list containing at least one number. For two-series operations these are the x values.
+- **data2**: The paired y values, required for `correlation`, `covariance` and the regressions.
+- **degree**: The polynomial degree, required for `polynomial_regression`.
+- **bins**: A bin count or `auto` for `histogram`.
 
-- **Operations**: `mean`, `median`, `std_dev`, `variance`
-- **data**: A list containing at least one number.
+Regressions return their coefficients highest power first along with `r_squared`; histograms return the counts per bin along with `bin_edges`.
 """)
-async def evaluate_statistics_endpoint(request: StatisticsRequest):
+async def evaluate_statistics_endpoint(request: StatisticsRequest, http_request: Request):
     """
     Endpoint to perform a statistical calculation.
 
     - **request**: A `StatisticsRequest` model.
     """
-    try:
-        result = perform_statistics_operation(
-            operation=request.operation,
-            data=request.data
-        )
-        return StatisticsResponse(
-            result=result,
-            operation=request.operation.value,
-            dataset_size=len(request.data)
-        )
-    except ValueError as e:
-        # Catches errors from the service layer, e.g., empty dataset
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {str(e)}")
+    return await _evaluate(request, http_request)
+
+@router.post("/statistics/evaluate-stream",
+             response_model=StatisticsResponse,
+             response_class=NumpyJSONResponse,
+             tags=["Statistics"],
+             summary="Perform a statistical calculation on a large, streamed dataset",
+             description="""
+Accepts the same body as `/statistics/evaluate`, for datasets too large to buffer comfortably.
+
+The body is parsed as it arrives and the numbers of `data` and `data2` are written straight into
+float64 arrays, so memory use stays close to the size of the dataset itself. Malformed bodies are
+rejected as soon as the problem is read.
+""",
+             openapi_extra={"requestBody": {
+                 "required": True,
+                 "content": {"application/json": {"schema": {"$ref": "#/components/schemas/StatisticsRequest"}}},
+             }})
+async def evaluate_statistics_stream_endpoint(http_request: Request):
+    """
+    Endpoint to perform a statistical calculation on a streamed body.
+    """
+    request = await read_numeric_request(http_request, StatisticsRequest, _STREAMED_ARRAYS)
+    return await _evaluate(request, http_request)
@@ -1,11 +1,14 @@
 from fastapi import APIRouter, HTTPException
+from app.core.responses import NumpyJSONResponse
 from app.models.trigonometry import TrigonometryRequest, TrigonometryResponse, TrigonometricFunction, AngleUnit
-from app.services.trigonometry import evaluate_trigonometric_function
+from app.models.operations import Operation
+from app.services.operations import run_operation
 
 router = APIRouter()
 
 @router.post("/trigonometry/evaluate",
              response_model=TrigonometryResponse,
+             response_class=NumpyJSONResponse,
              tags=["Trigonometry"],
              summary="Evaluate a single trigonometric function",
              description="""
@@ -24,17 +27,7 @@ async def evaluate_trig_expression(request: TrigonometryRequest):
         - `unit`: The `AngleUnit` enum ("radians" or "degrees").
     """
     try:
-        result = evaluate_trigonometric_function(
-            function=request.function,
-            value=request.value,
-            unit=request.unit
-        )
-        return TrigonometryResponse(
-            result=result,
-            function=request.function.value,
-            input_value=request.value,
-            unit=request.unit.value
-        )
+        return NumpyJSONResponse(run_operation(Operation.trigonometry, request))
     except ValueError as e:
         # This catches domain errors or invalid function names from the service
         raise HTTPException(status_code=400, detail=str(e))
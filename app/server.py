@@ -0,0 +1,174 @@
+"""
+Production entrypoint: `python -m app.server --host 0.0.0.0 --port $PORT`.
+
+The master process imports the application and its heavy dependencies (SymPy, NumPy,
+SciPy), optionally warms the calculation caches, and then forks the workers. Workers
+share those pages with the master copy-on-write instead of importing everything again.
+Each worker serves a bounded number of requests before exiting gracefully and being
+replaced, which caps memory growth from SymPy's internal caches.
+"""
+import argparse
+import gc
+import os
+import random
+import signal
+import socket
+import sys
+import time
+from typing import Dict
+
+from app.core.config import settings
+
+
+def warm_caches() -> None:
+    """
+    Runs a few representative calculations so lazily initialised state (SymPy's
+    function registry and caches, the expression parser, NumPy's linear algebra)
+    is built once in the master and inherited by every worker.
+    """
+    import numpy as np
+    from sympy import Symbol
+    from app.core.expressions import parse_expression
+    from app.models.calculus import CalculusOperation
+    from app.services.calculus import apply_calculus_operation, evaluate_expression
+
+    x = Symbol('x')
+    for source in ("x**2 + 3*x + 1", "sin(x)*cos(x)", "exp(-x**2)", "log(x)/x", "sqrt(1 + x**2)"):
+        expr = parse_expression(source)
+        apply_calculus_operation(expr, CalculusOperation.differentiate)
+        apply_calculus_operation(expr, CalculusOperation.integrate)
+        evaluate_expression(expr, np.linspace(1, 2, 8), x)
+    np.linalg.inv(np.eye(4) * 2)
+    np.linalg.det(np.eye(4))
+    np.roots([1.0, 0.0, -4.0])
+
+
+def _bind(host: str, port: int) -> socket.socket:
+    """Creates the listening socket shared by all workers."""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(sock: socket.socket, max_requests: int, max_requests_jitter: int) -> None:
+    """Serves the preloaded app on the shared socket; runs in a forked child."""
+    import uvicorn
+    from app.main import app
+
+    # Start from default handlers; uvicorn installs its own for a graceful shutdown
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+    limit = max_requests + random.randint(0, max_requests_jitter) if max_requests > 0 else None
+    config = uvicorn.Config(
+        app,
+        limit_max_requests=limit,
+        proxy_headers=True,
+        forwarded_allow_ips=settings.server_forwarded_allow_ips,
+        log_level=settings.server_log_level,
+    )
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def _default_workers() -> int:
+    """
+    One worker per CPU this process may run on, capped by `server_max_auto_workers`:
+    every worker holds its own SymPy state, and hosts often have more cores than the
+    container has memory for.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        # Not available on macOS
+        cpus = os.cpu_count() or 1
+    return max(1, min(cpus, settings.server_max_auto_workers))
+
+
+def _spawn(sock: socket.socket, max_requests: int, max_requests_jitter: int) -> int:
+    pid = os.fork()
+    if pid == 0:
+        exit_code = 0
+        try:
+            _run_worker(sock, max_requests, max_requests_jitter)
+        except BaseException:
+            exit_code = 1
+            raise
+        finally:
+            # Never return into the master's code path
+            os._exit(exit_code)
+    return pid
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the calculator API with preforked workers.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=settings.server_workers,
+                        help="Number of worker processes; 0 uses one per available CPU, up to server_max_auto_workers.")
+    parser.add_argument("--max-requests", type=int, default=settings.server_max_requests,
+                        help="Requests a worker serves before it is replaced; 0 disables recycling.")
+    parser.add_argument("--max-requests-jitter", type=int, default=settings.server_max_requests_jitter,
+                        help="Random extra requests per worker, so workers are not all replaced at once.")
+    parser.add_argument("--warm", action=argparse.BooleanOptionalAction, default=settings.server_warm_caches,
+                        help="Warm the calculation caches in the master before forking.")
+    args = parser.parse_args()
+
+    workers = args.workers or _default_workers()
+    if workers > 1:
+        # One BLAS thread per worker avoids oversubscribing cores; must be set before NumPy loads
+        for var in ("OPENBLAS_NUM_THREADS", "OMP_NUM_THREADS", "MKL_NUM_THREADS"):
+            os.environ.setdefault(var, "1")
+
+    # Preload the application and its heavy imports in the master
+    import app.main  # noqa: F401
+    if args.warm:
+        warm_caches()
+    # Move everything loaded so far out of the collector's generations, so collections in
+    # the workers do not touch (and thereby copy) the shared pages
+    gc.collect()
+    gc.freeze()
+
+    sock = _bind(args.host, args.port)
+    children: Dict[int, float] = {}
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for _ in range(workers):
+        children[_spawn(sock, args.max_requests, args.max_requests_jitter)] = time.monotonic()
+    print(f"Serving on {args.host}:{args.port} with {workers} workers (master pid {os.getpid()})", file=sys.stderr)
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        started_at = children.pop(pid, None)
+        if stopping or started_at is None:
+            continue
+        if os.waitstatus_to_exitcode(status) != 0 and time.monotonic() - started_at < 5:
+            # Back off if workers are crashing on startup
+            time.sleep(1)
+        children[_spawn(sock, args.max_requests, args.max_requests_jitter)] = time.monotonic()
+
+    sock.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,23 @@
+import time
 import numpy as np
-from typing import List, Tuple
+from functools import lru_cache
+from scipy import fft
+from scipy.signal import lfilter
+from scipy.special import poch
+from scipy.stats import qmc
+from sympy import Basic, Matrix, Symbol, lambdify
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.core.evaluation import real_entries
+from app.core.expressions import parse_expression
+from app.models.algebra import PolynomialOperation, SolverMethod
+
+# Products smaller than this (in coefficient pairs), or with a factor this short, are
+# faster as a direct convolution than through the FFT
+_FFT_MIN_PAIRS = 2 ** 18
+_FFT_MIN_LENGTH = 32
+# Integer products below this bound are exact after rounding the FFT result
+_EXACT_FFT_BOUND = 2.0 ** 40
 
 def _format_polynomial(coeffs: List[float]) -> str:
     """
@@ -59,3 +77,410 @@ def solve_polynomial_roots(coefficients: List[float]) -> Tuple[List[str], str]:
             formatted_roots.append(f"{real_part:.4f}{root.imag:+.4f}j")
             
     return formatted_roots, polynomial_str
+
+def _trim(coeffs: np.ndarray) -> np.ndarray:
+    """Drops leading zero coefficients, keeping at least the constant term."""
+    nonzero = np.flatnonzero(coeffs)
+    return coeffs[nonzero[0]:] if nonzero.size else coeffs[-1:]
+
+def _multiply(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Multiplies two coefficient arrays (in either order of power). Long products are
+    computed through real FFTs in O(n log n), with errors relative to the largest
+    coefficient; integer products are rounded back to exact integers when they are
+    small enough for the FFT to be exact.
+    """
+    if len(a) * len(b) < _FFT_MIN_PAIRS or min(len(a), len(b)) < _FFT_MIN_LENGTH:
+        return np.convolve(a, b)
+    n = len(a) + len(b) - 1
+    size = fft.next_fast_len(n, real=True)
+    with np.errstate(over='ignore', invalid='ignore'):
+        product = fft.irfft(fft.rfft(a, size) * fft.rfft(b, size), size)[:n]
+        integral = np.all(a == np.round(a)) and np.all(b == np.round(b))
+        if integral and np.abs(a).sum() * np.abs(b).max() < _EXACT_FFT_BOUND:
+            product = np.round(product)
+    return product
+
+def _add(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Adds two coefficient arrays in descending order of power."""
+    if len(a) < len(b):
+        a, b = b, a
+    total = a.copy()
+    total[len(a) - len(b):] += b
+    return total
+
+def _divide(dividend: np.ndarray, divisor: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Long division of coefficient arrays in descending order of power. The quotient's
+    recurrence runs as a linear filter, in compiled code rather than a Python loop
+    per quotient term.
+    """
+    divisor = _trim(divisor)
+    if divisor[0] == 0:
+        raise ValueError("Division by the zero polynomial.")
+    if len(dividend) < len(divisor):
+        return np.zeros(1), dividend
+    # q[k] = (u[k] - sum(v[j] * q[k - j] for j >= 1)) / v[0]: the dividend filtered by 1 / divisor
+    quotient = lfilter([1.0], divisor, dividend[:len(dividend) - len(divisor) + 1])
+    if len(divisor) == 1:
+        return quotient, np.zeros(1)
+    with np.errstate(over='ignore', invalid='ignore'):
+        remainder = (dividend - _multiply(quotient, divisor))[-(len(divisor) - 1):]
+    return quotient, remainder
+
+def _compose(outer: np.ndarray, inner: np.ndarray) -> np.ndarray:
+    """
+    Computes outer(inner(x)) for coefficient arrays in descending order of power.
+
+    Splits the outer polynomial as low(x) + x^k * high(x) with k a power of two and
+    recurses, so inner(x)^k comes from repeated squaring and every product is one
+    large FFT multiplication instead of deg(outer) Horner steps.
+    """
+    outer, inner = outer[::-1], inner[::-1]
+    powers = [inner]
+    while 2 ** len(powers) < len(outer):
+        powers.append(_trim(_multiply(powers[-1], powers[-1])[::-1])[::-1])
+
+    def compose(coeffs: np.ndarray) -> np.ndarray:
+        if len(coeffs) == 1:
+            return coeffs.copy()
+        level = (len(coeffs) - 1).bit_length() - 1
+        k = 2 ** level
+        low, high = compose(coeffs[:k]), _multiply(compose(coeffs[k:]), powers[level])
+        high[:len(low)] += low
+        return high
+
+    return compose(outer)[::-1]
+
+def _derivative(coeffs: np.ndarray, order: int) -> np.ndarray:
+    """
+    The order-th derivative in one pass: the coefficient of x^i is multiplied by the
+    falling factorial i * (i - 1) * ... * (i - order + 1), computed by `poch`.
+    """
+    if order >= len(coeffs):
+        return np.zeros(1)
+    kept = coeffs[:len(coeffs) - order]
+    powers = np.arange(len(coeffs) - 1, order - 1, -1, dtype=np.float64)
+    with np.errstate(over='ignore', invalid='ignore'):
+        # Zero coefficients stay zero where the factorial overflows
+        return np.where(kept == 0, 0.0, kept * poch(powers - order + 1, order))
+
+def _integral(coeffs: np.ndarray, order: int) -> np.ndarray:
+    """The order-th antiderivative in one pass, with every integration constant set to zero."""
+    powers = np.arange(len(coeffs) - 1, -1, -1, dtype=np.float64)
+    with np.errstate(over='ignore'):
+        return np.concatenate((coeffs / poch(powers + 1, order), np.zeros(order)))
+
+def _horner(coeffs: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """Evaluates a polynomial at all points at once: one in-place multiply-add per coefficient."""
+    values = np.full(points.shape, coeffs[0])
+    with np.errstate(all='ignore'):
+        for c in coeffs[1:]:
+            np.multiply(values, points, out=values)
+            values += c
+    return values
+
+def perform_polynomial_operation(
+    operation: PolynomialOperation,
+    coefficients: List[float],
+    coefficients2: Optional[List[float]] = None,
+    order: Optional[int] = None,
+    points: Optional[List[float]] = None
+) -> Tuple[Optional[np.ndarray], Optional[np.ndarray], Optional[np.ndarray], int, Optional[str]]:
+    """
+    Performs arithmetic on polynomials given as coefficients in descending order of power.
+
+    Args:
+        operation: The operation to perform.
+        coefficients: The (first) polynomial.
+        coefficients2: The second polynomial, for binary operations.
+        order: How many times to differentiate or integrate.
+        points: The x values to evaluate at.
+
+    Returns:
+        A tuple containing:
+        - The resulting coefficients (the quotient for divide), or None for evaluate.
+        - The remainder, for divide.
+        - The values at each point, for evaluate.
+        - The degree of the result (of the input for evaluate).
+        - The result formatted as a string, unless its degree exceeds
+          `max_formatted_polynomial_degree`.
+
+    Raises:
+        ValueError: For division by zero or results above `max_polynomial_degree`.
+    """
+    p = _trim(np.asarray(coefficients, dtype=np.float64))
+    q = _trim(np.asarray(coefficients2, dtype=np.float64)) if coefficients2 is not None else None
+
+    if operation == PolynomialOperation.multiply:
+        degree = len(p) + len(q) - 2
+    elif operation == PolynomialOperation.compose:
+        degree = (len(p) - 1) * (len(q) - 1)
+    elif operation == PolynomialOperation.integral:
+        degree = len(p) - 1 + (order or 1)
+    else:
+        degree = max(len(p), len(q) if q is not None else 0) - 1
+    if degree > settings.max_polynomial_degree:
+        raise ValueError(f"The result would have degree {degree}; the maximum is {settings.max_polynomial_degree}.")
+
+    remainder = None
+    values = None
+    if operation == PolynomialOperation.add:
+        result = _add(p, q)
+    elif operation == PolynomialOperation.subtract:
+        result = _add(p, -q)
+    elif operation == PolynomialOperation.multiply:
+        result = _multiply(p, q)
+    elif operation == PolynomialOperation.divide:
+        result, remainder = _divide(p, q)
+        remainder = _trim(remainder)
+    elif operation == PolynomialOperation.compose:
+        result = _compose(p, q)
+    elif operation == PolynomialOperation.derivative:
+        result = _derivative(p, order or 1)
+    elif operation == PolynomialOperation.integral:
+        result = _integral(p, order or 1)
+    elif operation == PolynomialOperation.evaluate:
+        if len(points) > settings.max_evaluation_points:
+            raise ValueError(f"At most {settings.max_evaluation_points} evaluation points are allowed.")
+        values = _horner(p, np.asarray(points, dtype=np.float64))
+        result = p
+    else:
+        # Should not be reachable with Enum validation
+        raise ValueError(f"Invalid polynomial operation: {operation}")
+
+    result = _trim(result)
+    polynomial_str = _format_polynomial(result.tolist()) if len(result) - 1 <= settings.max_formatted_polynomial_degree else None
+    if operation == PolynomialOperation.evaluate:
+        result = None
+    return result, remainder, values, len(p) - 1 if result is None else len(result) - 1, polynomial_str
+
+def _parse_equation(equation: str, variables: Tuple[str, ...]) -> Basic:
+    """Parses `lhs = rhs` (or a bare expression) into the expression lhs - rhs."""
+    if "==" in equation or equation.count("=") > 1:
+        raise ValueError(f"Equation '{equation}' must contain at most one '='.")
+    lhs, _, rhs = equation.partition("=")
+    try:
+        expr = parse_expression(lhs, symbols=variables)
+        if rhs:
+            expr = expr - parse_expression(rhs, symbols=variables)
+    except ValueError as e:
+        raise ValueError(f"Invalid equation '{equation}': {e}")
+    return expr
+
+@lru_cache(maxsize=settings.derivative_cache_size)
+def _compiled_system(equations: Tuple[str, ...], variables: Tuple[str, ...]) -> Tuple[Callable, Callable, List[str]]:
+    """
+    Compiles the residuals F and the symbolic Jacobian J of a system into vectorised
+    NumPy functions. Both take one array per variable and return a flat list of entries,
+    with common subexpressions computed once per call. Cached per system.
+    """
+    exprs = [_parse_equation(e, variables) for e in equations]
+    symbols = [Symbol(v) for v in variables]
+    jacobian = Matrix(exprs).jacobian(symbols)
+    residuals = lambdify(symbols, exprs, modules="numpy", cse=True)
+    derivatives = lambdify(symbols, list(jacobian), modules="numpy", cse=True)
+    return residuals, derivatives, [str(e) for e in exprs]
+
+def _evaluate_entries(func: Callable, points: np.ndarray) -> np.ndarray:
+    """
+    Evaluates a compiled function at points of shape (P, n). Returns (P, k) for k
+    entries; values that are complex or undefined become NaN.
+    """
+    with np.errstate(all='ignore'):
+        return real_entries(func(*points.T), (len(points),)).T
+
+def _newton(
+    residuals: Callable,
+    derivatives: Callable,
+    starts: np.ndarray,
+    tolerance: float,
+    max_iterations: int,
+    deadline: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, bool]:
+    """
+    Runs damped Newton iterations from all starting points at once.
+
+    Every iteration evaluates F and J for the still active points in one call each,
+    solves all the linear systems in one batched call, and halves the steps of points
+    whose residual would grow. Returns the final points, their residuals, iteration
+    counts, a convergence mask, and whether the deadline was reached.
+    """
+    points = starts.copy()
+    count, n = points.shape
+    residual = np.abs(_evaluate_entries(residuals, points)).max(axis=1)
+    iterations = np.zeros(count, dtype=np.int64)
+    converged = residual <= tolerance
+    active = ~converged & np.isfinite(residual)
+    timed_out = False
+
+    for _ in range(max_iterations):
+        if not active.any():
+            break
+        if time.monotonic() > deadline:
+            timed_out = True
+            break
+        index = np.flatnonzero(active)
+        x = points[index]
+        f = _evaluate_entries(residuals, x)
+        jac = _evaluate_entries(derivatives, x).reshape(len(index), n, n)
+        with np.errstate(all='ignore'):
+            try:
+                step = np.linalg.solve(jac, f[:, :, None])[:, :, 0]
+            except np.linalg.LinAlgError:
+                # Some Jacobians are singular; the pseudo-inverse still gives a usable step
+                step = (np.linalg.pinv(jac) @ f[:, :, None])[:, :, 0]
+
+        current = residual[index]
+        trial = x - step
+        trial_residual = np.abs(_evaluate_entries(residuals, trial)).max(axis=1)
+        # Backtrack: halve the steps that do not reduce the residual
+        for _ in range(8):
+            worse = ~(trial_residual < current)
+            if not worse.any():
+                break
+            step[worse] /= 2
+            trial[worse] = x[worse] - step[worse]
+            trial_residual[worse] = np.abs(_evaluate_entries(residuals, trial[worse])).max(axis=1)
+
+        points[index] = trial
+        residual[index] = trial_residual
+        iterations[index] += 1
+        step_size = np.abs(step).max(axis=1)
+        scale = 1 + np.abs(trial).max(axis=1)
+        done = (trial_residual <= tolerance) | ((step_size <= tolerance * scale) & (trial_residual <= np.sqrt(tolerance)))
+        failed = ~np.isfinite(trial_residual) | ~np.isfinite(step_size)
+        converged[index[done & ~failed]] = True
+        active[index[done | failed]] = False
+
+    return points, residual, iterations, converged, timed_out
+
+def _bracket(
+    residuals: Callable,
+    low: float,
+    high: float,
+    intervals: int,
+    tolerance: float,
+    max_iterations: int,
+    deadline: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, bool]:
+    """
+    Finds sign changes of a single equation on a grid and bisects all brackets at once.
+
+    A bracket that closes on a pole rather than a root is detected by its residual
+    growing beyond the residuals at the original bracket ends, and is not converged.
+    """
+    grid = np.linspace(low, high, intervals + 1)
+    values = _evaluate_entries(residuals, grid[:, None])[:, 0]
+    exact = values == 0
+    with np.errstate(invalid='ignore'):
+        changes = np.flatnonzero((values[:-1] * values[1:] < 0) & np.isfinite(values[:-1]) & np.isfinite(values[1:]))
+    a, b = grid[changes], grid[changes + 1]
+    fa = values[changes]
+    limit = np.maximum(np.abs(fa), np.abs(values[changes + 1]))
+    iterations = np.zeros(len(changes), dtype=np.int64)
+    timed_out = False
+
+    active = np.ones(len(changes), dtype=bool)
+    for _ in range(max_iterations):
+        active &= (b - a) > tolerance * (1 + np.maximum(np.abs(a), np.abs(b)))
+        if not active.any():
+            break
+        if time.monotonic() > deadline:
+            timed_out = True
+            break
+        index = np.flatnonzero(active)
+        mid = (a[index] + b[index]) / 2
+        fm = _evaluate_entries(residuals, mid[:, None])[:, 0]
+        left = np.sign(fm) == np.sign(fa[index])
+        a[index[left]], fa[index[left]] = mid[left], fm[left]
+        b[index[~left]] = mid[~left]
+        iterations[index] += 1
+
+    roots = np.concatenate([(a + b) / 2, grid[exact]])
+    residual = np.abs(_evaluate_entries(residuals, roots[:, None])[:, 0])
+    converged = np.concatenate([~active & (residual[:len(changes)] <= limit), np.ones(exact.sum(), dtype=bool)])
+    iterations = np.concatenate([iterations, np.zeros(exact.sum(), dtype=np.int64)])
+    return roots[:, None], residual, iterations, converged, timed_out
+
+def _distinct_roots(points: np.ndarray, residual: np.ndarray, iterations: np.ndarray, tolerance: float) -> List[Dict[str, Any]]:
+    """Merges converged points that are the same root, keeping the best representative of each."""
+    # Multiple roots are only located to about sqrt(tolerance), possibly from either side
+    radius = max(2 * np.sqrt(tolerance), 1e-8)
+    roots: List[Dict[str, Any]] = []
+    centres = np.empty((0, points.shape[1]))
+    for i in np.argsort(residual, kind="stable"):
+        if len(centres):
+            distance = np.abs(centres - points[i]).max(axis=1)
+            match = np.flatnonzero(distance <= radius * (1 + np.abs(points[i]).max()))
+            if len(match):
+                root = roots[match[0]]
+                root["starts"] += 1
+                root["iterations"] = min(root["iterations"], int(iterations[i]))
+                continue
+        centres = np.vstack([centres, points[i]])
+        roots.append({"point": points[i], "residual": float(residual[i]), "iterations": int(iterations[i]), "starts": 1})
+    roots.sort(key=lambda root: tuple(root["point"]))
+    return roots
+
+def solve_nonlinear_system(
+    equations: List[str],
+    variables: List[str],
+    method: SolverMethod = SolverMethod.newton,
+    starts: Optional[List[List[float]]] = None,
+    search_bounds: Optional[List[Tuple[float, float]]] = None,
+    num_starts: int = 64,
+    tolerance: float = 1e-10,
+    max_iterations: int = 100,
+    time_limit: float = 5.0
+) -> Tuple[List[Dict[str, Any]], int, bool, List[str]]:
+    """
+    Finds the real roots of a square system of nonlinear equations from many starts.
+
+    Args:
+        equations: The equations, as `lhs = rhs` or as expressions equal to zero.
+        variables: The unknowns, one per equation.
+        method: Vectorised damped Newton, or bisection of sign changes for one equation.
+        starts: Explicit Newton starting points; generated over `search_bounds` if omitted.
+        search_bounds: A (low, high) range per variable; defaults to (-10, 10).
+        num_starts: The number of generated starting points or grid intervals.
+        tolerance: The convergence tolerance on residuals and step sizes.
+        max_iterations: The iteration limit for every start.
+        time_limit: The wall-clock limit in seconds.
+
+    Returns:
+        A tuple containing:
+        - The distinct roots, each with its residual, iteration count and number of starts.
+        - The number of starts that did not converge.
+        - Whether the time limit stopped the iterations.
+        - The equations in the form solved (expression = 0).
+
+    Raises:
+        ValueError: For invalid equations.
+    """
+    deadline = time.monotonic() + time_limit
+    key_variables = tuple(variables)
+    residuals, derivatives, solved = _compiled_system(tuple(equations), key_variables)
+    bounds = np.asarray(search_bounds if search_bounds is not None else [(-10.0, 10.0)] * len(variables), dtype=np.float64)
+
+    if method == SolverMethod.bracket:
+        points, residual, iterations, converged, timed_out = _bracket(
+            residuals, bounds[0, 0], bounds[0, 1], num_starts, tolerance, max_iterations, deadline
+        )
+    elif method == SolverMethod.newton:
+        if starts is not None:
+            initial = np.asarray(starts, dtype=np.float64).reshape(len(starts), len(variables))
+        elif len(variables) == 1:
+            initial = np.linspace(bounds[0, 0], bounds[0, 1], num_starts)[:, None]
+        else:
+            # A fixed low-discrepancy sequence covers the box evenly and keeps results reproducible
+            initial = qmc.scale(qmc.Halton(d=len(variables), seed=0).random(num_starts), bounds[:, 0], bounds[:, 1])
+        points, residual, iterations, converged, timed_out = _newton(
+            residuals, derivatives, initial, tolerance, max_iterations, deadline
+        )
+    else:
+        # Should not be reachable with Enum validation
+        raise ValueError(f"Invalid or unsupported solver method: {method}")
+
+    roots = _distinct_roots(points[converged], residual[converged], iterations[converged], tolerance)
+    return roots, int((~converged).sum()), timed_out, [f"{e} = 0" for e in solved]
@@ -1,8 +1,8 @@
-from sympy import sympify, SympifyError
+from app.core.expressions import parse_expression
 
 def evaluate_arithmetic_expression(expression: str) -> float:
     """
-    Evaluates a simple arithmetic expression using SymPy's sympify.
+    Evaluates a simple arithmetic expression using the shared expression parser.
 
     Args:
         expression: The arithmetic expression string.
@@ -14,9 +14,9 @@ def evaluate_arithmetic_expression(expression: str) -> float:
         ValueError: If the expression is invalid or cannot be evaluated.
     """
     try:
-        # Sympify the expression and evaluate it
-        # We limit the locals/globals to prevent arbitrary code execution
-        result = float(sympify(expression, locals={}).evalf())
+        # The restricted parser only accepts numbers, operators and known functions,
+        # and no free symbols are allowed in a purely arithmetic expression.
+        result = float(parse_expression(expression, symbols=()).evalf())
         return result
-    except (SympifyError, TypeError, ValueError) as e:
+    except (TypeError, ValueError) as e:
         raise ValueError(f"Invalid or malformed expression: {expression}. Error: {e}")
@@ -1,39 +1,142 @@
-from sympy import sympify, diff, integrate, Symbol, SympifyError
+import inspect
+import threading
+import numpy as np
+from collections import OrderedDict
+from functools import lru_cache
+from sympy import Add, Basic, Mul, Order, Pow, Rational, diff, factorial, integrate, together, Symbol, Matrix, cse, lambdify, nan, oo, zoo
 from sympy.core.numbers import Number
-from typing import Optional, Tuple
-from app.models.calculus import CalculusOperation
+from typing import Callable, List, Optional, Tuple
+from app.core.config import settings
+from app.core.evaluation import real_entries
+from app.core.expressions import parse_expression
+from app.models.calculus import CalculusOperation, MultivariableOperation
 
-def perform_calculus_operation(
-    expression_str: str,
-    operation: CalculusOperation,
-    bounds: Optional[Tuple[float, float]] = None
-) -> Tuple[str, bool]:
+# Bisection steps spent locating each break in a plot: enough to shrink a refined
+# interval to the resolution of a double
+_BREAK_BISECTION_STEPS = 50
+# A one-sided limit is taken as infinite when |f| keeps growing by this factor
+# while its interval shrinks to nothing
+_ASYMPTOTE_GROWTH = 2.0
+
+class _DerivativeChain:
+    """Successive derivatives of one expression, as differentiated: [f, f', f'', ...]."""
+
+    def __init__(self, expr: Basic):
+        self.derivatives = [expr]
+        self.lock = threading.Lock()
+
+# Derivative chains keyed by the interned parsed expression, in LRU order
+_derivative_chains: "OrderedDict[Tuple[Basic, Symbol], _DerivativeChain]" = OrderedDict()
+_derivative_chains_lock = threading.Lock()
+
+def derivatives_up_to(expr: Basic, x: Symbol, order: int) -> List[Basic]:
     """
-    Performs a calculus operation (differentiation or integration) on an expression.
+    Returns [f, f', ..., f^(order)] for the expression.
+
+    Each order is derived from the previous one. The derivatives are kept as `diff`
+    returns them, since simplifying every order costs far more than differentiating;
+    callers tidy up only what they return. Chains are cached per expression, so a later
+    request for a higher order continues from the highest order computed so far instead
+    of starting over.
     """
-    try:
-        x = Symbol('x')
-        # Use a limited local namespace for safety
-        expr = sympify(expression_str, locals={'x': x})
-    except (SympifyError, TypeError) as e:
-        raise ValueError(f"Invalid expression: '{expression_str}'. Error: {e}")
+    if order > settings.max_derivative_order:
+        raise ValueError(f"The maximum supported derivative order is {settings.max_derivative_order}.")
+
+    key = (expr, x)
+    with _derivative_chains_lock:
+        chain = _derivative_chains.get(key)
+        if chain is None:
+            chain = _derivative_chains[key] = _DerivativeChain(expr)
+        _derivative_chains.move_to_end(key)
+        while len(_derivative_chains) > settings.derivative_chain_cache_size:
+            _derivative_chains.popitem(last=False)
 
-    is_definite = False
+    with chain.lock:
+        while len(chain.derivatives) <= order:
+            chain.derivatives.append(diff(chain.derivatives[-1], x))
+        return chain.derivatives[:order + 1]
+
+def _taylor_series(expr: Basic, x: Symbol, order: int, point: float) -> Basic:
+    """Builds the Taylor polynomial of the given order around `point`, plus its Order term."""
+    # Like sympy.series, expand around an exact rational point
+    a = Rational(repr(float(point)))
+    terms = []
+    for k, derivative in enumerate(derivatives_up_to(expr, x, order)):
+        coefficient = derivative.subs(x, a)
+        # is_finite is None when SymPy cannot tell, e.g. with other free symbols
+        if coefficient.is_finite is False or coefficient.has(zoo, oo, -oo, nan):
+            raise ValueError(f"The expression is not analytic at x = {point}, so it has no Taylor series there.")
+        coefficient = coefficient / factorial(k)
+        if coefficient == 0:
+            continue
+        if k == 0:
+            terms.append(coefficient)
+            continue
+        # Keep powers of (x - a) unexpanded so the result reads as a series around `a`.
+        # SymPy distributes plain numbers over sums, so only those need an unevaluated Mul.
+        power = (x - a) if k == 1 else Pow(x - a, k, evaluate=False)
+        if coefficient == 1:
+            terms.append(power)
+        elif coefficient.is_Number:
+            terms.append(Mul(coefficient, power, evaluate=False))
+        else:
+            terms.append(coefficient * power)
+    return Add(*terms, Order((x - a) ** (order + 1), (x, a)), evaluate=False)
+
+def apply_calculus_operation(
+    expr: Basic,
+    operation: CalculusOperation,
+    bounds: Optional[Tuple[float, float]] = None,
+    order: Optional[int] = None,
+    point: Optional[float] = None,
+    x: Symbol = Symbol('x')
+) -> Basic:
+    """
+    Applies a calculus operation to an already parsed expression and returns the
+    SymPy result, so callers chaining operations can keep it in memory.
+    """
     if operation == CalculusOperation.differentiate:
-        result = diff(expr, x)
+        return diff(expr, x)
     elif operation == CalculusOperation.integrate:
         if bounds:
             # Definite integral
-            is_definite = True
             lower_bound, upper_bound = bounds
-            result = integrate(expr, (x, lower_bound, upper_bound))
-        else:
-            # Indefinite integral
-            result = integrate(expr, x)
+            return integrate(expr, (x, lower_bound, upper_bound))
+        # Indefinite integral
+        return integrate(expr, x)
+    elif operation == CalculusOperation.nth_derivative:
+        if order is None:
+            raise ValueError("`order` is required for nth_derivative.")
+        # Combining into one fraction is cheap and undoes most of the growth from repeated diff
+        return together(derivatives_up_to(expr, x, order)[-1])
+    elif operation == CalculusOperation.series:
+        if order is None:
+            raise ValueError("`order` is required for series.")
+        return _taylor_series(expr, x, order, point or 0.0)
     else:
         # Should not be reachable with Enum validation
         raise ValueError(f"Invalid calculus operation: {operation}")
 
+def perform_calculus_operation(
+    expression_str: str,
+    operation: CalculusOperation,
+    bounds: Optional[Tuple[float, float]] = None,
+    order: Optional[int] = None,
+    point: Optional[float] = None
+) -> Tuple[str, bool]:
+    """
+    Performs a calculus operation (differentiation, integration, higher-order
+    differentiation or Taylor expansion) on an expression.
+    """
+    try:
+        # Parsed trees are shared through the expression cache
+        expr = parse_expression(expression_str)
+    except ValueError as e:
+        raise ValueError(f"Invalid expression: '{expression_str}'. Error: {e}")
+
+    is_definite = operation == CalculusOperation.integrate and bool(bounds)
+    result = apply_calculus_operation(expr, operation, bounds, order, point)
+
     # Format numeric results cleanly
     if isinstance(result, Number):
         # Format to a reasonable precision, then strip trailing zeros and decimal point if possible
@@ -41,3 +144,415 @@ def perform_calculus_operation(
         return result_str, is_definite
 
     return str(result), is_definite
+
+@lru_cache(maxsize=settings.derivative_cache_size)
+def compile_expression(expr: Basic, x: Symbol = Symbol('x')) -> Callable:
+    """
+    Compiles a single-variable expression into a vectorised NumPy function.
+    Compiled functions are cached per expression, which the parser interns.
+    """
+    extra_symbols = expr.free_symbols - {x}
+    if extra_symbols:
+        names = ", ".join(sorted(str(s) for s in extra_symbols))
+        raise ValueError(f"The expression has free symbols other than '{x}': {names}.")
+    return lambdify(x, expr, modules="numpy")
+
+def evaluate_expression(expr: Basic, values: np.ndarray, x: Symbol = Symbol('x')) -> np.ndarray:
+    """
+    Evaluates a single-variable expression at every value in one vectorised call.
+    Points outside the real domain of the expression evaluate to NaN.
+    """
+    if values.size > settings.max_evaluation_points:
+        raise ValueError(f"At most {settings.max_evaluation_points} evaluation points are allowed.")
+    func = compile_expression(expr, x)
+    with np.errstate(all='ignore'):
+        return real_entries([func(values)], values.shape)[0]
+
+@lru_cache(maxsize=settings.derivative_cache_size)
+def _derivative_matrix(
+    expressions: Tuple[str, ...],
+    variables: Tuple[str, ...],
+    operation: MultivariableOperation
+) -> Matrix:
+    """
+    Builds the gradient (1 x n), Jacobian (m x n) or Hessian (n x n) of the expressions.
+    Results are cached, so repeated requests and the compiled evaluator share one derivation.
+    """
+    try:
+        exprs = [parse_expression(e, symbols=variables) for e in expressions]
+    except ValueError as e:
+        raise ValueError(f"Invalid expression: {e}")
+    symbols = [Symbol(v) for v in variables]
+
+    n_components = len(exprs) * len(symbols) if operation == MultivariableOperation.jacobian else len(symbols) ** 2
+    if n_components > settings.max_derivative_components:
+        raise ValueError(f"The result would have {n_components} components; the maximum is {settings.max_derivative_components}.")
+
+    if operation == MultivariableOperation.gradient:
+        return Matrix([[diff(exprs[0], v) for v in symbols]])
+    elif operation == MultivariableOperation.jacobian:
+        return Matrix([[diff(e, v) for v in symbols] for e in exprs])
+    elif operation == MultivariableOperation.hessian:
+        # Differentiate the gradient, computing only the upper triangle and mirroring it
+        gradient = [diff(exprs[0], v) for v in symbols]
+        n = len(symbols)
+        hessian = Matrix.zeros(n, n)
+        for i in range(n):
+            for j in range(i, n):
+                hessian[i, j] = hessian[j, i] = diff(gradient[i], symbols[j])
+        return hessian
+    else:
+        # Should not be reachable with Enum validation
+        raise ValueError(f"Invalid multivariable operation: {operation}")
+
+@lru_cache(maxsize=settings.derivative_cache_size)
+def _compiled_evaluator(
+    expressions: Tuple[str, ...],
+    variables: Tuple[str, ...],
+    operation: MultivariableOperation
+) -> Tuple[Callable, str]:
+    """
+    Compiles the whole derivative matrix into one NumPy function, with common
+    subexpressions computed once per call and shared across all entries.
+    """
+    matrix = _derivative_matrix(expressions, variables, operation)
+    # lambdify only applies CSE to a flat sequence, so compile the entries in row-major order
+    func = lambdify([Symbol(v) for v in variables], list(matrix), modules="numpy", cse=True)
+    return func, inspect.getsource(func)
+
+def _evaluate_matrix(func: Callable, points: List[List[float]], shape: Tuple[int, int]) -> np.ndarray:
+    """
+    Evaluates a compiled matrix function at all points in one vectorised call.
+    Returns an array of shape (n_points, rows, cols); entries that are not real are NaN.
+    """
+    if len(points) > settings.max_evaluation_points:
+        raise ValueError(f"At most {settings.max_evaluation_points} evaluation points are allowed.")
+    columns = np.asarray(points, dtype=np.float64).reshape(len(points), -1).T
+    with np.errstate(all='ignore'):
+        values = real_entries(func(*columns), (len(points),))
+    return values.T.reshape((len(points),) + shape)
+
+def perform_multivariable_operation(
+    expressions: List[str],
+    variables: List[str],
+    operation: MultivariableOperation,
+    eliminate_common_subexpressions: bool = True,
+    points: Optional[List[List[float]]] = None,
+    include_source: bool = False
+) -> Tuple[list, Optional[Tuple[List[Tuple[str, str]], list]], Optional[np.ndarray], Optional[str]]:
+    """
+    Computes the gradient, Jacobian or Hessian of expressions in the declared variables.
+
+    Args:
+        expressions: The expressions (exactly one for gradient and hessian).
+        variables: The variables to differentiate with respect to.
+        operation: The multivariable operation to perform.
+        eliminate_common_subexpressions: Whether to also return the result rewritten
+                                         in terms of shared subexpressions.
+        points: Optional points at which to evaluate the result.
+        include_source: Whether to return the source of the compiled evaluator.
+
+    Returns:
+        A tuple containing:
+        - The result as strings (a vector for gradient, a matrix otherwise).
+        - The (subexpressions, reduced result) pair, if requested.
+        - The values at each point, if points were given.
+        - The compiled evaluator's source, if requested.
+
+    Raises:
+        ValueError: For invalid expressions or results that exceed the size limits.
+    """
+    key = (tuple(expressions), tuple(variables), operation)
+    matrix = _derivative_matrix(*key)
+    is_vector = operation == MultivariableOperation.gradient
+
+    def shape_result(entries: list) -> list:
+        rows = [entries[i * matrix.cols:(i + 1) * matrix.cols] for i in range(matrix.rows)]
+        return rows[0] if is_vector else rows
+
+    result = shape_result([str(entry) for entry in matrix])
+
+    reduced = None
+    if eliminate_common_subexpressions:
+        replacements, reduced_entries = cse(list(matrix))
+        reduced = (
+            [(str(symbol), str(sub)) for symbol, sub in replacements],
+            shape_result([str(entry) for entry in reduced_entries])
+        )
+
+    values = None
+    source = None
+    if points is not None or include_source:
+        func, func_source = _compiled_evaluator(*key)
+        if points is not None:
+            values = _evaluate_matrix(func, points, matrix.shape)
+            if is_vector:
+                values = values[:, 0, :]
+        if include_source:
+            source = func_source
+
+    return result, reduced, values, source
+
+def _plot_height(y: np.ndarray) -> float:
+    """The vertical extent of a plot: the spread of its finite values, ignoring the few closest to poles."""
+    finite = y[~np.isnan(y)]
+    if finite.size == 0:
+        return 1.0
+    low, high = np.percentile(finite, [2, 98])
+    return float(high - low) if high > low else max(abs(float(high)), 1.0)
+
+def _refinement_scores(x: np.ndarray, y: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Scores each interval of a normalised polyline by how badly it misses the curve:
+    the distance of interior points from the chord of their neighbours, or infinity
+    where the interval holds the edge of the domain. Zero means no refinement.
+    """
+    scores = np.zeros(len(x) - 1)
+    missing = np.isnan(y)
+    scores[missing[:-1] != missing[1:]] = np.inf
+    x0, x1, x2 = x[:-2], x[1:-1], x[2:]
+    y0, y1, y2 = y[:-2], y[1:-1], y[2:]
+    with np.errstate(all='ignore'):
+        distance = np.abs((x2 - x0) * (y1 - y0) - (y2 - y0) * (x1 - x0)) / np.hypot(x2 - x0, y2 - y0)
+    distance = np.where(distance > tolerance, distance, 0.0)
+    # A bent point refines the intervals on both of its sides
+    scores[:-1] = np.maximum(scores[:-1], distance)
+    scores[1:] = np.maximum(scores[1:], distance)
+    return scores
+
+def _break_scores(y0: np.ndarray, y1: np.ndarray) -> np.ndarray:
+    """How strongly an interval looks like it holds a break: its jump, or infinity at a domain edge."""
+    with np.errstate(invalid='ignore'):
+        jump = np.abs(y1 - y0)
+    return np.where(np.isnan(y0) != np.isnan(y1), np.inf, np.where(np.isnan(jump), -1.0, jump))
+
+def _locate_jumps(
+    f: Callable[[np.ndarray], np.ndarray], a: np.ndarray, b: np.ndarray, ya: np.ndarray, yb: np.ndarray
+) -> Tuple[np.ndarray, ...]:
+    """
+    Bisects intervals towards the half with the larger jump. Returns the final intervals
+    and their values, with the largest |y| at each end before and after.
+    """
+    start = np.fmax(np.abs(ya), np.abs(yb))
+    for _ in range(_BREAK_BISECTION_STEPS):
+        m = (a + b) / 2
+        ym = f(m)
+        left = _break_scores(ya, ym) >= _break_scores(ym, yb)
+        a, ya = np.where(left, a, m), np.where(left, ya, ym)
+        b, yb = np.where(left, m, b), np.where(left, ym, yb)
+    return a, b, ya, yb, start, np.fmax(np.abs(ya), np.abs(yb))
+
+def _locate_peaks(
+    f: Callable[[np.ndarray], np.ndarray], a: np.ndarray, m: np.ndarray, b: np.ndarray, ym: np.ndarray
+) -> Tuple[np.ndarray, ...]:
+    """
+    Narrows brackets a < m < b, with |f(m)| the largest of the three, onto the highest
+    point of |f| by probing the middle of the wider side. Returns the final brackets, the
+    value at m, and |f(m)| halfway through and at the end: near a pole it keeps growing,
+    at a finite peak it settles.
+    """
+    magnitude = np.abs(ym)
+    midway = magnitude
+    for step in range(_BREAK_BISECTION_STEPS):
+        right = b - m > m - a
+        p = np.where(right, (m + b) / 2, (a + m) / 2)
+        yp = f(p)
+        higher = np.abs(yp) > magnitude
+        # A higher probe becomes the middle, bounded by m on its other side; a lower one bounds the bracket
+        a = np.where(higher, np.where(right, m, a), np.where(right, a, p))
+        b = np.where(higher, np.where(right, b, m), np.where(right, p, b))
+        m, ym = np.where(higher, p, m), np.where(higher, yp, ym)
+        magnitude = np.abs(ym)
+        if step == _BREAK_BISECTION_STEPS // 2:
+            midway = magnitude
+    return a, m, b, ym, midway, magnitude
+
+def _snap(position: float, resolution: float) -> float:
+    """Rounds a located position to the decimal places its resolution supports, so a pole at 0 is 0.0 rather than 1e-19."""
+    return round(position, int(np.floor(-np.log10(resolution)))) + 0.0
+
+def _simplify_polyline(x: np.ndarray, y: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Marks the points to keep so that every dropped point lies within `tolerance` of the
+    polyline through the kept ones (Ramer-Douglas-Peucker on each defined run). One
+    undefined point is kept per undefined run, to break the curve there.
+    """
+    missing = np.isnan(y)
+    keep = missing & ~np.concatenate(([False], missing[:-1]))
+    # Start and end indices of the runs of defined points
+    edges = np.flatnonzero(np.diff(np.concatenate(([1], missing.view(np.int8), [1]))))
+    stack = [(start, end - 1) for start, end in zip(edges[::2], edges[1::2])]
+    for start, end in stack:
+        keep[start] = keep[end] = True
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        dx, dy = x[end] - x[start], y[end] - y[start]
+        inner = slice(start + 1, end)
+        distance = np.abs(dx * (y[inner] - y[start]) - dy * (x[inner] - x[start])) / np.hypot(dx, dy)
+        k = int(np.argmax(distance))
+        if distance[k] > tolerance:
+            split = start + 1 + k
+            keep[split] = True
+            stack.extend([(start, split), (split, end)])
+    return keep
+
+def sample_plot(
+    expression_str: str,
+    x_range: Tuple[float, float],
+    derivative_order: int = 0,
+    initial_points: int = 65,
+    max_points: int = 2000,
+    tolerance: float = 1e-3
+) -> Tuple[np.ndarray, np.ndarray, List[float], List[float], str, int]:
+    """
+    Samples a function for plotting with as few points as the curve needs.
+
+    The compiled expression is evaluated on a uniform grid, then intervals are bisected
+    where the polyline bends away from the curve by more than `tolerance` (as a fraction
+    of the plot's width and height) or crosses the edge of the domain, down to intervals
+    of `tolerance` times the plot's width. Steep jumps, peaks of |f| and domain edges are
+    then narrowed down by bisection and classified as vertical asymptotes, finite jumps
+    or domain edges; breaks found from both sides of a point are reported once, rounded
+    to the precision they were located to. Finally, points that the polyline does not
+    need are dropped.
+
+    Args:
+        expression_str: The expression in 'x'.
+        x_range: The interval of x to plot.
+        derivative_order: Plot this derivative of the expression instead.
+        initial_points: The size of the initial uniform grid.
+        max_points: The budget of function evaluations; a quarter is kept for locating breaks.
+        tolerance: The allowed deviation from the curve, as a fraction of the plot.
+
+    Returns:
+        A tuple containing the x values, the y values (NaN where undefined), the asymptote
+        positions, the jump positions, the plotted expression and the number of evaluations.
+
+    Raises:
+        ValueError: For invalid expressions or budgets above `max_plot_points`.
+    """
+    if max_points > settings.max_plot_points:
+        raise ValueError(f"At most {settings.max_plot_points} plot points are allowed.")
+    try:
+        expr = parse_expression(expression_str)
+    except ValueError as e:
+        raise ValueError(f"Invalid expression: '{expression_str}'. Error: {e}")
+    x = Symbol('x')
+    if derivative_order:
+        expr = derivatives_up_to(expr, x, derivative_order)[-1]
+
+    evaluations = 0
+
+    def f(points: np.ndarray) -> np.ndarray:
+        nonlocal evaluations
+        evaluations += points.size
+        values = evaluate_expression(expr, points, x)
+        # Infinities cannot be drawn either; treat them as undefined
+        return np.where(np.isfinite(values), values, np.nan)
+
+    lower, upper = x_range
+    width = upper - lower
+    xs = np.linspace(lower, upper, initial_points)
+    ys = f(xs)
+    height = _plot_height(ys)
+
+    # Refine where the curve bends, one level at a time, up to three quarters of the budget
+    refinement_budget = max_points - max_points // 4
+    min_width = tolerance * width
+    while True:
+        scores = _refinement_scores((xs - lower) / width, ys / height, tolerance)
+        scores[np.diff(xs) <= min_width] = 0.0
+        intervals = np.flatnonzero(scores)
+        budget = refinement_budget - evaluations
+        if intervals.size == 0 or budget <= 0:
+            break
+        if intervals.size > budget:
+            intervals = np.sort(intervals[np.argsort(scores[intervals], kind='stable')[-budget:]])
+        midpoints = (xs[intervals] + xs[intervals + 1]) / 2
+        xs = np.insert(xs, intervals + 1, midpoints)
+        ys = np.insert(ys, intervals + 1, f(midpoints))
+
+    # Candidate breaks: domain edges, and jumps at least as large as those of both neighbouring
+    # intervals and well above the smaller one; a steep but straight stretch has even jumps
+    jumps = _break_scores(ys[:-1], ys[1:]) / height
+    padded = np.concatenate(([np.nan], jumps, [np.nan]))
+    peaks = (
+        ~(jumps < padded[:-2]) & ~(jumps < padded[2:])
+        & (jumps > 2 * np.fmin(padded[:-2], padded[2:]))
+    )
+    jump_scores = np.where(np.isinf(jumps) | (peaks & (jumps > 10 * tolerance)), jumps, 0.0)
+    # Poles that keep their sign, such as 1/x**2, need not jump between samples but show up
+    # as peaks of |y|. Peaks next to a sign change or a domain edge are left to the jumps.
+    magnitude = np.where(np.isnan(ys), -np.inf, np.abs(ys)) / height
+    with np.errstate(invalid='ignore'):
+        rise = magnitude[1:-1] - np.fmin(magnitude[:-2], magnitude[2:])
+    highest = (magnitude[1:-1] > magnitude[:-2]) & (magnitude[1:-1] >= magnitude[2:])
+    crossing = np.isinf(jumps) | (np.sign(ys[:-1]) * np.sign(ys[1:]) < 0)
+    peak_scores = np.where(highest & ~crossing[:-1] & ~crossing[1:] & (rise > 10 * tolerance), rise, 0.0)
+
+    scores = np.concatenate((jump_scores, peak_scores))
+    candidates = np.flatnonzero(scores)
+    affordable = max(max_points - evaluations, 0) // _BREAK_BISECTION_STEPS
+    if candidates.size > affordable:
+        candidates = np.sort(candidates[np.argsort(scores[candidates], kind='stable')[candidates.size - affordable:]])
+    jump_candidates = candidates[candidates < jumps.size]
+    # Peaks are numbered from the second point
+    peak_candidates = candidates[candidates >= jumps.size] - jumps.size + 1
+
+    # Located breaks as (position, resolution, kind, extra points); kind None only adds the points
+    breaks: List[Tuple[float, float, Optional[str], List[Tuple[float, float]]]] = []
+    if jump_candidates.size:
+        i = jump_candidates
+        a, b, ya, yb, start, end = _locate_jumps(f, xs[i], xs[i + 1], ys[i], ys[i + 1])
+        edge = np.isnan(ya) != np.isnan(yb)
+        for k in range(i.size):
+            if end[k] > _ASYMPTOTE_GROWTH * start[k] and end[k] > height:
+                breaks.append(((a[k] + b[k]) / 2, b[k] - a[k], "asymptote", []))
+            elif edge[k]:
+                # Include the last defined point before the domain ends
+                point = (b[k], yb[k]) if np.isnan(ya[k]) else (a[k], ya[k])
+                breaks.append((point[0], b[k] - a[k], None, [point]))
+            elif abs(yb[k] - ya[k]) > tolerance * height:
+                breaks.append(((a[k] + b[k]) / 2, b[k] - a[k], "jump", [(a[k], ya[k]), (b[k], yb[k])]))
+    if peak_candidates.size:
+        i = peak_candidates
+        a, m, b, ym, midway, end = _locate_peaks(f, xs[i - 1], xs[i], xs[i + 1], ys[i])
+        for k in range(i.size):
+            if end[k] > _ASYMPTOTE_GROWTH * midway[k] and end[k] > height:
+                breaks.append((m[k], b[k] - a[k], "asymptote", []))
+            else:
+                # A finite peak: keep its top
+                breaks.append((m[k], b[k] - a[k], None, [(m[k], ym[k])]))
+
+    asymptotes: List[float] = []
+    discontinuities: List[float] = []
+    extra_x: List[float] = []
+    extra_y: List[float] = []
+    for position, resolution, kind, points in sorted(breaks, key=lambda found: found[0]):
+        for point_x, point_y in points:
+            extra_x.append(float(point_x))
+            extra_y.append(float(point_y))
+        if kind is None:
+            continue
+        # Values computed near a break carry rounding errors of their own, so the position
+        # is not taken to be more precise than about 1e-10 of the plot or of itself
+        position = _snap(float(position), max(float(resolution), 1e-10 * max(width, abs(float(position)))))
+        # Breaks found from both sides of one point, as for sign(x), are reported once
+        located = asymptotes if kind == "asymptote" else discontinuities
+        if located and position - located[-1] <= min_width:
+            continue
+        located.append(position)
+        if kind == "asymptote":
+            extra_x.append(position)
+            extra_y.append(np.nan)
+
+    if extra_x:
+        xs = np.concatenate((xs, extra_x))
+        ys = np.concatenate((ys, extra_y))
+        xs, unique = np.unique(xs, return_index=True)
+        ys = ys[unique]
+
+    keep = _simplify_polyline((xs - lower) / width, ys / height, tolerance)
+    return xs[keep], ys[keep], asymptotes, discontinuities, str(expr), evaluations
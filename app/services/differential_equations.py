@@ -0,0 +1,199 @@
+import time
+import numpy as np
+from functools import lru_cache
+from scipy.integrate import BDF, DOP853, LSODA, RK23, RK45, Radau
+from sympy import Matrix, Symbol, lambdify
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from app.core.config import settings
+from app.core.evaluation import real_entries
+from app.core.expressions import parse_expression
+from app.core.responses import dump_json
+from app.models.differential_equations import ODEMethod
+
+_SOLVERS = {
+    ODEMethod.RK45: RK45,
+    ODEMethod.RK23: RK23,
+    ODEMethod.DOP853: DOP853,
+    ODEMethod.Radau: Radau,
+    ODEMethod.BDF: BDF,
+    ODEMethod.LSODA: LSODA,
+}
+# Implicit methods solve a nonlinear system per step and benefit from an exact Jacobian
+_USES_JACOBIAN = (ODEMethod.Radau, ODEMethod.BDF, ODEMethod.LSODA)
+
+@lru_cache(maxsize=settings.derivative_cache_size)
+def _compiled_system(
+    equations: Tuple[str, ...],
+    variables: Tuple[str, ...],
+    time_variable: str
+) -> Tuple[Callable, Callable]:
+    """
+    Compiles the right-hand side f(t, y) and its Jacobian df/dy into NumPy functions
+    with the signatures SciPy's solvers expect. f is vectorised: it also accepts states
+    of shape (n, k) and returns one column per state. Cached per system.
+    """
+    allowed = (*variables, time_variable)
+    try:
+        exprs = [parse_expression(e, symbols=allowed) for e in equations]
+    except ValueError as e:
+        raise ValueError(f"Invalid equation: {e}")
+    t = Symbol(time_variable)
+    states = [Symbol(v) for v in variables]
+    jacobian = Matrix(exprs).jacobian(states)
+    rhs_entries = lambdify([t, *states], exprs, modules="numpy", cse=True)
+    jacobian_entries = lambdify([t, *states], list(jacobian), modules="numpy", cse=True)
+    n = len(states)
+
+    def rhs(t_value: float, y: np.ndarray) -> np.ndarray:
+        with np.errstate(all='ignore'):
+            return real_entries(rhs_entries(t_value, *y), y.shape[1:])
+
+    def jac(t_value: float, y: np.ndarray) -> np.ndarray:
+        with np.errstate(all='ignore'):
+            return real_entries(jacobian_entries(t_value, *y), ()).reshape(n, n)
+
+    return rhs, jac
+
+def _output_times(
+    t_span: Tuple[float, float],
+    t_eval: Optional[List[float]],
+    num_points: Optional[int]
+) -> Optional[np.ndarray]:
+    if t_eval is not None:
+        return np.asarray(t_eval, dtype=np.float64)
+    if num_points is not None:
+        return np.linspace(t_span[0], t_span[1], num_points)
+    return None
+
+def integrate_ode(
+    equations: List[str],
+    variables: List[str],
+    initial_values: List[float],
+    t_span: Tuple[float, float],
+    method: ODEMethod = ODEMethod.RK45,
+    time_variable: str = 't',
+    t_eval: Optional[List[float]] = None,
+    num_points: Optional[int] = None,
+    rtol: float = 1e-6,
+    atol: float = 1e-9,
+    max_step: Optional[float] = None,
+    max_steps: int = 100000,
+    time_limit: float = 10.0
+) -> Iterator[Tuple[np.ndarray, np.ndarray, Optional[Dict[str, Any]]]]:
+    """
+    Integrates an initial-value problem step by step with an adaptive step method.
+
+    The system is compiled before the first item is produced, so invalid equations
+    raise as soon as iteration starts. Each accepted step yields the times reported
+    in it and the states at those times, with shape (k, n). Reported times come from
+    the step's dense output when `t_eval` or `num_points` is given, and are the step
+    end points otherwise. The last item carries the summary: success, message, steps,
+    nfev and njev.
+
+    Raises:
+        ValueError: For invalid equations.
+    """
+    rhs, jac = _compiled_system(tuple(equations), tuple(variables), time_variable)
+    deadline = time.monotonic() + time_limit
+    options: Dict[str, Any] = {"rtol": rtol, "atol": atol}
+    if max_step is not None:
+        options["max_step"] = max_step
+    if method in _USES_JACOBIAN:
+        options["jac"] = jac
+    start, end = t_span
+    solver = _SOLVERS[method](rhs, start, np.asarray(initial_values, dtype=np.float64), end, vectorized=True, **options)
+    direction = 1.0 if end > start else -1.0
+    times = _output_times(t_span, t_eval, num_points)
+    next_output = 0
+    empty = (np.empty(0), np.empty((0, len(variables))))
+
+    if times is None:
+        yield np.array([start]), solver.y[None, :].copy(), None
+    elif times[0] == start:
+        yield times[:1], solver.y[None, :].copy(), None
+        next_output = 1
+
+    steps = 0
+    message = "The solver successfully reached the end of the integration interval."
+    while solver.status == "running":
+        if steps >= max_steps:
+            message = f"Stopped after the step limit of {max_steps} steps."
+            break
+        if time.monotonic() > deadline:
+            message = f"Stopped at t={solver.t} after the time limit of {time_limit} seconds."
+            break
+        failure = solver.step()
+        if solver.status == "failed":
+            message = failure or "The solver failed."
+            break
+        steps += 1
+        if times is None:
+            yield np.array([solver.t]), solver.y[None, :].copy(), None
+            continue
+        # Report every requested time passed in this step from the step's interpolant
+        stop = next_output
+        while stop < len(times) and direction * (times[stop] - solver.t) <= 0:
+            stop += 1
+        if stop > next_output:
+            reported = times[next_output:stop]
+            yield reported, solver.dense_output()(reported).T, None
+            next_output = stop
+
+    summary = {
+        "success": solver.status == "finished",
+        "message": message,
+        "steps": steps,
+        "nfev": int(solver.nfev),
+        "njev": int(solver.njev),
+    }
+    yield empty[0], empty[1], summary
+
+def solve_ode(**kwargs: Any) -> Tuple[np.ndarray, np.ndarray, Dict[str, Any]]:
+    """
+    Integrates an initial-value problem and collects the whole trajectory.
+    Takes the arguments of `integrate_ode`.
+
+    Returns:
+        A tuple of the reported times (k,), the states (k, n) and the summary.
+
+    Raises:
+        ValueError: For invalid equations, or trajectories longer than
+                    `max_evaluation_points`; stream those instead.
+    """
+    requested = kwargs.get("num_points") or len(kwargs.get("t_eval") or [])
+    if requested > settings.max_evaluation_points:
+        raise ValueError(
+            f"At most {settings.max_evaluation_points} output times are allowed. "
+            "Request fewer, or use the streaming endpoint."
+        )
+    times: List[np.ndarray] = []
+    states: List[np.ndarray] = []
+    reported = 0
+    summary: Dict[str, Any] = {}
+    for t, y, final in integrate_ode(**kwargs):
+        reported += len(t)
+        if reported > settings.max_evaluation_points:
+            raise ValueError(
+                f"The trajectory has more than {settings.max_evaluation_points} points. "
+                "Use `num_points` or `t_eval`, or the streaming endpoint."
+            )
+        times.append(t)
+        states.append(y)
+        if final is not None:
+            summary = final
+    return np.concatenate(times), np.concatenate(states), summary
+
+def trajectory_to_ndjson(trajectory: Iterator[Tuple[np.ndarray, np.ndarray, Optional[Dict[str, Any]]]]) -> Iterator[bytes]:
+    """
+    Formats the items of `integrate_ode` as NDJSON: one `{"t": ..., "y": [...]}` line
+    per reported time, then one summary line with `"done": true`. Errors raised during
+    the integration end the stream with an unsuccessful summary line.
+    """
+    try:
+        for t, y, final in trajectory:
+            if len(t):
+                yield b"".join(dump_json({"t": t_value, "y": y_row}) + b"\n" for t_value, y_row in zip(t, y))
+            if final is not None:
+                yield dump_json({"done": True, **final}) + b"\n"
+    except Exception as e:
+        yield dump_json({"done": True, "success": False, "message": f"An unexpected error occurred: {str(e)}"}) + b"\n"
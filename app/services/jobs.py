@@ -0,0 +1,324 @@
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+import orjson
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.core.responses import dump_json
+from app.models.jobs import JobStatus
+from app.models.operations import Operation
+from app.services.operations import run_operation, validate_operation
+
+logger = logging.getLogger(__name__)
+
+# Identifies this process in job owners alongside its pid, which a restarted container may reuse
+_BOOT_ID = uuid.uuid4().hex
+
+# SQLite errors that clear once other connections release the database
+_BUSY_ERRORS = ("database is locked", "database is busy")
+# Further attempts at recording a finished job, `job_poll_interval` apart and doubling
+_FINISH_RETRIES = 5
+
+class JobConflictError(ValueError):
+    """An idempotency key was reused for a different operation or payload."""
+
+class JobQueueFullError(RuntimeError):
+    """The queue has reached `job_max_queued` jobs."""
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    operation TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    idempotency_key TEXT UNIQUE,
+    owner TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    expires_at REAL,
+    result BLOB,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (status, priority DESC, created_at);
+CREATE INDEX IF NOT EXISTS jobs_expiry ON jobs (expires_at);
+"""
+
+_FINISHED = (JobStatus.succeeded.value, JobStatus.failed.value, JobStatus.cancelled.value)
+
+class JobStore:
+    """
+    Persistent job queue backed by a local SQLite database.
+
+    Every thread uses its own connection. Claims and state changes run in immediate
+    transactions, so several worker threads and processes can share one database file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _transaction(self, func, *args):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = func(conn, *args)
+            conn.execute("COMMIT")
+            return result
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def initialise(self) -> None:
+        self._conn().executescript(_SCHEMA)
+
+    def submit(self, operation: str, payload: str, priority: int, idempotency_key: Optional[str]) -> Tuple[sqlite3.Row, bool]:
+        """Queues a job, or returns the live job with the same idempotency key. The flag is True if queued."""
+        def submit_job(conn: sqlite3.Connection) -> Tuple[sqlite3.Row, bool]:
+            now = time.time()
+            if idempotency_key is not None:
+                existing = conn.execute("SELECT * FROM jobs WHERE idempotency_key = ?", (idempotency_key,)).fetchone()
+                if existing is not None and (existing["expires_at"] is None or existing["expires_at"] > now):
+                    if existing["operation"] != operation or existing["payload"] != payload:
+                        raise JobConflictError(f"Idempotency key '{idempotency_key}' was already used for a different request.")
+                    return existing, False
+                if existing is not None:
+                    conn.execute("DELETE FROM jobs WHERE id = ?", (existing["id"],))
+
+            (queued,) = conn.execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (JobStatus.queued.value,)).fetchone()
+            if queued >= settings.job_max_queued:
+                raise JobQueueFullError("The job queue is full. Retry later.")
+
+            job_id = uuid.uuid4().hex
+            conn.execute(
+                "INSERT INTO jobs (id, operation, payload, priority, status, idempotency_key, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, operation, payload, priority, JobStatus.queued.value, idempotency_key, now)
+            )
+            return conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone(), True
+        return self._transaction(submit_job)
+
+    def get(self, job_id: str) -> Optional[sqlite3.Row]:
+        row = self._conn().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is not None and row["expires_at"] is not None and row["expires_at"] <= time.time():
+            return None
+        return row
+
+    def claim(self, owner: str) -> Optional[sqlite3.Row]:
+        """Marks the highest-priority, oldest queued job as running and returns it."""
+        def claim_job(conn: sqlite3.Connection) -> Optional[sqlite3.Row]:
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE status = ? ORDER BY priority DESC, created_at LIMIT 1",
+                (JobStatus.queued.value,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, owner = ?, started_at = ? WHERE id = ?",
+                (JobStatus.running.value, owner, time.time(), row["id"])
+            )
+            return conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+        return self._transaction(claim_job)
+
+    def finish(self, job_id: str, status: JobStatus, result: Optional[bytes] = None, error: Optional[str] = None) -> None:
+        """Records the outcome of a running job. Jobs cancelled while running keep their cancelled status."""
+        now = time.time()
+        self._conn().execute(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, expires_at = ? WHERE id = ? AND status = ?",
+            (status.value, result, error, now, now + settings.job_result_ttl, job_id, JobStatus.running.value)
+        )
+
+    def cancel(self, job_id: str) -> Optional[sqlite3.Row]:
+        def cancel_job(conn: sqlite3.Connection) -> Optional[sqlite3.Row]:
+            now = time.time()
+            conn.execute(
+                f"UPDATE jobs SET status = ?, finished_at = ?, expires_at = ? WHERE id = ? AND status NOT IN ({','.join('?' * len(_FINISHED))})",
+                (JobStatus.cancelled.value, now, now + settings.job_result_ttl, job_id, *_FINISHED)
+            )
+            return conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._transaction(cancel_job)
+
+    def purge_expired(self) -> None:
+        self._conn().execute("DELETE FROM jobs WHERE expires_at <= ?", (time.time(),))
+
+    def requeue_orphans(self, owner: str) -> None:
+        """
+        Puts back jobs left running by processes on this host that no longer exist. Owners
+        are `host:pid:boot_id`; a job whose pid is now this process's but whose boot id is
+        not was left by an earlier process with the same pid. Every process runs this when
+        it starts, so jobs of a pid reused by another job worker are recovered too.
+        """
+        host, pid, boot_id = owner.split(":")
+        rows = self._conn().execute("SELECT id, owner FROM jobs WHERE status = ?", (JobStatus.running.value,)).fetchall()
+        for row in rows:
+            owner_host, owner_pid, owner_boot_id = ((row["owner"] or "").split(":") + ["", ""])[:3]
+            if owner_host != host or not owner_pid.isdigit():
+                continue
+            if owner_pid == pid:
+                orphaned = owner_boot_id != boot_id
+            else:
+                orphaned = not _process_alive(int(owner_pid))
+            if not orphaned:
+                continue
+            self._conn().execute(
+                "UPDATE jobs SET status = ?, owner = NULL, started_at = NULL WHERE id = ? AND status = ?",
+                (JobStatus.queued.value, row["id"], JobStatus.running.value)
+            )
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def _job_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+    return {
+        "id": row["id"],
+        "operation": row["operation"],
+        "status": row["status"],
+        "priority": row["priority"],
+        "created_at": row["created_at"],
+        "started_at": row["started_at"],
+        "finished_at": row["finished_at"],
+        "expires_at": row["expires_at"],
+        # The result is stored as serialised JSON and embedded without re-parsing
+        "result": orjson.Fragment(row["result"]) if row["result"] is not None else None,
+        "error": row["error"],
+    }
+
+class JobManager:
+    """
+    Runs queued jobs on a pool of worker threads.
+
+    Workers are woken when a job is submitted in this process and otherwise poll the
+    store every `job_poll_interval` seconds, which picks up jobs submitted by other
+    processes sharing the database. A running computation cannot be interrupted:
+    cancelling a running job marks it cancelled and its result is discarded.
+    """
+
+    def __init__(self):
+        self.store: Optional[JobStore] = None
+        self._threads: List[threading.Thread] = []
+        self._stopping = threading.Event()
+        self._wakeup = threading.Condition()
+        self._last_purge = 0.0
+
+    def start(self) -> None:
+        # Called after any fork, so every process gets its own connections and threads
+        self.store = JobStore(settings.job_store_path)
+        self.store.initialise()
+        self._owner = f"{socket.gethostname()}:{os.getpid()}:{_BOOT_ID}"
+        self.store.requeue_orphans(self._owner)
+        self._stopping.clear()
+        self._threads = [
+            threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+            for i in range(settings.job_workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._threads = []
+
+    def _require_store(self) -> JobStore:
+        if self.store is None:
+            raise RuntimeError("The job manager has not been started.")
+        return self.store
+
+    def submit(self, operation: Operation, request: BaseModel, priority: int, idempotency_key: Optional[str]) -> Tuple[Dict[str, Any], bool]:
+        """
+        Queues a validated request, or returns the existing job for its idempotency key.
+
+        Raises:
+            JobConflictError: If the key was used for a different request.
+            JobQueueFullError: If too many jobs are queued.
+        """
+        row, created = self._require_store().submit(operation.value, request.model_dump_json(), priority, idempotency_key)
+        if created:
+            with self._wakeup:
+                self._wakeup.notify()
+        return _job_to_dict(row), created
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._require_store().get(job_id)
+        return _job_to_dict(row) if row is not None else None
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._require_store().cancel(job_id)
+        return _job_to_dict(row) if row is not None else None
+
+    def _work(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                row = self.store.claim(self._owner)
+            except sqlite3.OperationalError:
+                # The database is busy; try again on the next poll
+                row = None
+            if row is None:
+                self._purge_if_due()
+                with self._wakeup:
+                    self._wakeup.wait(settings.job_poll_interval)
+                continue
+            self._execute(row)
+
+    def _execute(self, row: sqlite3.Row) -> None:
+        try:
+            operation = Operation(row["operation"])
+            request = validate_operation(operation, orjson.loads(row["payload"]))
+            result = dump_json(run_operation(operation, request))
+        except ValueError as e:
+            self._finish(row["id"], JobStatus.failed, error=str(e))
+        except Exception as e:
+            self._finish(row["id"], JobStatus.failed, error=f"An unexpected error occurred: {str(e)}")
+        else:
+            self._finish(row["id"], JobStatus.succeeded, result=result)
+
+    def _finish(self, job_id: str, status: JobStatus, result: Optional[bytes] = None, error: Optional[str] = None) -> None:
+        """
+        Records the outcome, retrying with backoff while the database stays locked. If it
+        cannot be recorded, the job is left running and is requeued by `requeue_orphans`
+        once this process has exited.
+        """
+        for attempt in range(_FINISH_RETRIES + 1):
+            try:
+                self.store.finish(job_id, status, result=result, error=error)
+                return
+            except sqlite3.OperationalError as e:
+                if str(e) not in _BUSY_ERRORS or attempt == _FINISH_RETRIES:
+                    logger.error("Could not record the outcome of job %s: %s", job_id, e)
+                    return
+                if self._stopping.wait(settings.job_poll_interval * 2 ** attempt):
+                    return
+
+    def _purge_if_due(self) -> None:
+        now = time.monotonic()
+        if now - self._last_purge >= 60:
+            self._last_purge = now
+            try:
+                self.store.purge_expired()
+            except sqlite3.OperationalError:
+                pass
+
+job_manager = JobManager()
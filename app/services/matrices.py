@@ -6,7 +6,7 @@ def perform_matrix_operation(
     operation: MatrixOperation,
     matrix1: List[List[float]],
     matrix2: Optional[List[List[float]]] = None
-) -> Tuple[Union[List[List[float]], float], str, Optional[str]]:
+) -> Tuple[Union[np.ndarray, float], str, Optional[str]]:
     """
     Performs a specified matrix operation using numpy.
 
@@ -17,7 +17,8 @@ def perform_matrix_operation(
 
     Returns:
         A tuple containing:
-        - The result (a matrix or a scalar).
+        - The result (a NumPy matrix or a scalar). Matrices are returned as arrays
+          so the router can serialise them directly without a `tolist()` copy.
         - The shape of matrix1.
         - The shape of matrix2 (if it exists).
 
@@ -25,7 +26,7 @@ def perform_matrix_operation(
         ValueError: For shape mismatches, non-invertible matrices, or other errors.
     """
     try:
-        m1 = np.array(matrix1)
+        m1 = np.asarray(matrix1, dtype=np.float64)
         shape1_str = f"{m1.shape[0]}x{m1.shape[1]}"
         shape2_str = None
     except Exception:
@@ -42,7 +43,7 @@ def perform_matrix_operation(
             raise ValueError("Matrix must be square to be inverted.")
         try:
             inverted_matrix = np.linalg.inv(m1)
-            return inverted_matrix.tolist(), shape1_str, None
+            return inverted_matrix, shape1_str, None
         except np.linalg.LinAlgError:
             # This error is raised for singular matrices
             raise ValueError("Matrix is singular and cannot be inverted.")
@@ -52,7 +53,7 @@ def perform_matrix_operation(
             # This should be caught by the Pydantic model, but serves as a safeguard.
             raise ValueError("Matrix multiplication requires a second matrix (`matrix2`).")
         try:
-            m2 = np.array(matrix2)
+            m2 = np.asarray(matrix2, dtype=np.float64)
             shape2_str = f"{m2.shape[0]}x{m2.shape[1]}"
         except Exception:
             raise ValueError("Invalid format for `matrix2`.")
@@ -65,7 +66,7 @@ def perform_matrix_operation(
             )
         
         result_matrix = np.matmul(m1, m2)
-        return result_matrix.tolist(), shape1_str, shape2_str
+        return result_matrix, shape1_str, shape2_str
         
     else:
         # Should not be reachable with Enum validation
@@ -1,5 +1,13 @@
+import numpy as np
+from typing import List, Optional
+from app.core.config import settings
 from app.models.number_systems import NumberSystem
 
+# Digit characters indexed by digit value, so whole arrays of digits encode in one lookup
+_DIGIT_TABLE = np.frombuffer(b"0123456789ABCDEF", dtype=np.uint8)
+_UINT64_LIMIT = 2 ** 64
+_FORMAT_SPECS = {NumberSystem.BINARY: "b", NumberSystem.OCTAL: "o", NumberSystem.DECIMAL: "d", NumberSystem.HEXADECIMAL: "X"}
+
 def convert_number_system(value: str, from_base: NumberSystem, to_base: NumberSystem) -> str:
     """
     Converts a number string from a source base to a target base.
@@ -39,3 +47,99 @@ def convert_number_system(value: str, from_base: NumberSystem, to_base: NumberSy
     else:
         # This case should be unreachable with the NumberSystem Enum.
         raise ValueError(f"Unsupported target base: {to_base}")
+
+def _encode_uint64(values: np.ndarray, to_base: NumberSystem, width: Optional[int]) -> List[str]:
+    """
+    Encodes an array of unsigned 64-bit integers digit column by digit column.
+
+    Each pass extracts one digit of every value (by shift and mask for power-of-two
+    bases), and the digit matrix is mapped to characters through `_DIGIT_TABLE`.
+    Leading zeros are dropped, or kept up to `width` digits.
+    """
+    base = int(to_base)
+    # Only as many digit columns as the largest value needs
+    columns = len(format(int(values.max()), _FORMAT_SPECS[to_base]))
+    digits = np.zeros((len(values), columns), dtype=np.uint8)
+    remaining = values.copy()
+    if base & (base - 1) == 0:
+        shift, mask = np.uint64(base.bit_length() - 1), np.uint64(base - 1)
+        for column in range(columns - 1, -1, -1):
+            digits[:, column] = remaining & mask
+            remaining >>= shift
+    else:
+        for column in range(columns - 1, -1, -1):
+            digits[:, column] = remaining % base
+            remaining //= base
+
+    nonzero = digits != 0
+    # Zero still needs one digit
+    significant = np.where(nonzero.any(axis=1), columns - nonzero.argmax(axis=1), 1)
+    kept = np.maximum(significant, min(width or 0, columns))
+    padding = "0" * max((width or 0) - columns, 0)
+
+    encoded = _DIGIT_TABLE[digits].tobytes()
+    return [
+        padding + encoded[end - length:end].decode("ascii")
+        for end, length in zip(range(columns, columns * (len(values) + 1), columns), kept.tolist())
+    ]
+
+def _format_integer(value: int, to_base: NumberSystem, width: Optional[int]) -> str:
+    """Formats an arbitrary-precision integer, zero-padding its magnitude to `width` digits."""
+    magnitude = format(abs(value), _FORMAT_SPECS[to_base])
+    if width is not None:
+        magnitude = magnitude.zfill(width)
+    return "-" + magnitude if value < 0 else magnitude
+
+def convert_number_batch(
+    values: List[str],
+    from_base: NumberSystem,
+    to_base: NumberSystem,
+    width: Optional[int] = None
+) -> List[str]:
+    """
+    Converts many number strings from a source base to a target base.
+
+    Each value is parsed once. Values in the unsigned 64-bit range are encoded together
+    as a NumPy array; negative or larger values fall back to Python's big integers.
+
+    Args:
+        values: The number strings to convert.
+        from_base: The base of the input numbers.
+        to_base: The target base for the conversion.
+        width: If given, the number of digits every result is zero-padded to.
+
+    Returns:
+        The converted numbers as strings, in input order.
+
+    Raises:
+        ValueError: If the batch is too large, a value is not valid for the source base,
+                    or a value has more digits than `width` in the target base.
+    """
+    if len(values) > settings.max_conversion_batch:
+        raise ValueError(f"A batch may contain at most {settings.max_conversion_batch} values.")
+
+    parsed = []
+    for index, value in enumerate(values):
+        try:
+            parsed.append(int(value, from_base))
+        except ValueError:
+            raise ValueError(f"Value '{value}' at index {index} is not a valid number in base {int(from_base)}.")
+
+    results: List[Optional[str]] = [None] * len(parsed)
+    fast_indices = []
+    for index, number in enumerate(parsed):
+        if 0 <= number < _UINT64_LIMIT:
+            fast_indices.append(index)
+        else:
+            results[index] = _format_integer(number, to_base, width)
+
+    if fast_indices:
+        array = np.fromiter((parsed[i] for i in fast_indices), dtype=np.uint64, count=len(fast_indices))
+        for index, encoded in zip(fast_indices, _encode_uint64(array, to_base, width)):
+            results[index] = encoded
+
+    if width is not None:
+        for index, result in enumerate(results):
+            if len(result.lstrip("-")) > width:
+                raise ValueError(f"Value '{values[index]}' at index {index} needs more than {width} digits in base {int(to_base)}.")
+    return results
@@ -0,0 +1,218 @@
+from pydantic import BaseModel
+from typing import Any, Callable, Dict, Tuple, Type
+from app.models.algebra import NonlinearSolverRequest, PolynomialRequest, PolynomialSolverRequest
+from app.models.arithmetic import ArithmeticRequest
+from app.models.calculus import CalculusRequest, MultivariableCalculusRequest, PlotRequest
+from app.models.complex_numbers import ComplexArithmeticRequest
+from app.models.differential_equations import ODERequest
+from app.models.logarithms import LogarithmRequest
+from app.models.matrices import MatrixRequest
+from app.models.number_systems import BatchConversionRequest, ConversionRequest
+from app.models.operations import Operation
+from app.models.pipelines import PipelineRequest
+from app.models.statistics import StatisticsRequest
+from app.models.trigonometry import TrigonometryRequest
+from app.services.algebra import perform_polynomial_operation, solve_nonlinear_system, solve_polynomial_roots
+from app.services.arithmetic import evaluate_arithmetic_expression
+from app.services.calculus import perform_calculus_operation, perform_multivariable_operation, sample_plot
+from app.services.complex_numbers import evaluate_complex_arithmetic
+from app.services.differential_equations import solve_ode
+from app.services.logarithms import evaluate_logarithmic_function
+from app.services.matrices import perform_matrix_operation
+from app.services.number_systems import convert_number_batch, convert_number_system
+from app.services.pipelines import run_pipeline
+from app.services.statistics import perform_statistics_operation
+from app.services.trigonometry import evaluate_trigonometric_function
+
+# Each handler takes a validated request and returns the response body. The endpoints, jobs and
+# sessions all serve these bodies as they are, so each one is defined only here.
+
+def _arithmetic(request: ArithmeticRequest) -> Dict[str, Any]:
+    return {"result": evaluate_arithmetic_expression(request.expression), "expression": request.expression}
+
+def _trigonometry(request: TrigonometryRequest) -> Dict[str, Any]:
+    result = evaluate_trigonometric_function(function=request.function, value=request.value, unit=request.unit)
+    return {"result": result, "function": request.function.value, "input_value": request.value, "unit": request.unit.value}
+
+def _logarithms(request: LogarithmRequest) -> Dict[str, Any]:
+    result = evaluate_logarithmic_function(function=request.function, value=request.value, base=request.base)
+    return {"result": result, "function": request.function.value, "input_value": request.value, "base": request.base}
+
+def _algebra(request: PolynomialSolverRequest) -> Dict[str, Any]:
+    roots, polynomial_str = solve_polynomial_roots(request.coefficients)
+    return {"roots": roots, "polynomial": polynomial_str}
+
+def _algebra_solve(request: NonlinearSolverRequest) -> Dict[str, Any]:
+    roots, unconverged, timed_out, equations = solve_nonlinear_system(
+        equations=request.equations,
+        variables=request.variables,
+        method=request.method,
+        starts=request.starts,
+        search_bounds=request.search_bounds,
+        num_starts=request.num_starts,
+        tolerance=request.tolerance,
+        max_iterations=request.max_iterations,
+        time_limit=request.time_limit
+    )
+    return {"roots": roots, "unconverged": unconverged, "timed_out": timed_out, "equations": equations, "method": request.method.value}
+
+def _algebra_polynomial(request: PolynomialRequest) -> Dict[str, Any]:
+    result, remainder, values, degree, polynomial_str = perform_polynomial_operation(
+        operation=request.operation,
+        coefficients=request.coefficients,
+        coefficients2=request.coefficients2,
+        order=request.order,
+        points=request.points
+    )
+    return {
+        "operation": request.operation.value,
+        "result": result,
+        "remainder": remainder,
+        "values": values,
+        "degree": degree,
+        "polynomial": polynomial_str,
+    }
+
+def _complex(request: ComplexArithmeticRequest) -> Dict[str, Any]:
+    result, calc_str = evaluate_complex_arithmetic(num1_str=request.num1, num2_str=request.num2, operation=request.operation)
+    return {"result": result, "calculation": calc_str}
+
+def _calculus(request: CalculusRequest) -> Dict[str, Any]:
+    result_str, is_definite = perform_calculus_operation(
+        expression_str=request.expression,
+        operation=request.operation,
+        bounds=request.integration_bounds,
+        order=request.order,
+        point=request.expansion_point
+    )
+    return {
+        "result": result_str,
+        "input_expression": request.expression,
+        "operation": request.operation.value,
+        "is_definite_integral": is_definite,
+    }
+
+def _calculus_multivariable(request: MultivariableCalculusRequest) -> Dict[str, Any]:
+    result, reduced, values, source = perform_multivariable_operation(
+        expressions=request.expressions,
+        variables=request.variables,
+        operation=request.operation,
+        eliminate_common_subexpressions=request.eliminate_common_subexpressions,
+        points=request.evaluate_at,
+        include_source=request.include_evaluator_source
+    )
+    return {
+        "result": result,
+        "operation": request.operation.value,
+        "variables": request.variables,
+        "subexpressions": reduced[0] if reduced else None,
+        "reduced_result": reduced[1] if reduced else None,
+        "values": values,
+        "evaluator_source": source,
+    }
+
+def _calculus_plot(request: PlotRequest) -> Dict[str, Any]:
+    x, y, asymptotes, discontinuities, plotted, evaluations = sample_plot(
+        expression_str=request.expression,
+        x_range=request.x_range,
+        derivative_order=request.derivative_order,
+        initial_points=request.initial_points,
+        max_points=request.max_points,
+        tolerance=request.tolerance
+    )
+    return {
+        "x": x,
+        "y": y,
+        "asymptotes": asymptotes,
+        "discontinuities": discontinuities,
+        "plotted_expression": plotted,
+        "evaluations": evaluations,
+    }
+
+def _differential_equations(request: ODERequest) -> Dict[str, Any]:
+    t, y, summary = solve_ode(
+        equations=request.equations,
+        variables=request.variables,
+        initial_values=request.initial_values,
+        t_span=request.t_span,
+        method=request.method,
+        time_variable=request.time_variable,
+        t_eval=request.t_eval,
+        num_points=request.num_points,
+        rtol=request.rtol,
+        atol=request.atol,
+        max_step=request.max_step,
+        max_steps=request.max_steps,
+        time_limit=request.time_limit
+    )
+    return {"t": t, "y": y, "variables": request.variables, "method": request.method.value, **summary}
+
+def _matrices(request: MatrixRequest) -> Dict[str, Any]:
+    result, shape1, shape2 = perform_matrix_operation(
+        operation=request.operation,
+        matrix1=request.matrix1,
+        matrix2=request.matrix2
+    )
+    return {"result": result, "operation": request.operation.value, "input_shape1": shape1, "input_shape2": shape2}
+
+def _statistics(request: StatisticsRequest) -> Dict[str, Any]:
+    result, extras = perform_statistics_operation(
+        operation=request.operation,
+        data=request.data,
+        data2=request.data2,
+        degree=request.degree,
+        bins=request.bins
+    )
+    return {"result": result, "operation": request.operation.value, "dataset_size": len(request.data), **extras}
+
+def _number_systems(request: ConversionRequest) -> Dict[str, Any]:
+    result = convert_number_system(value=request.value, from_base=request.from_base, to_base=request.to_base)
+    return {"result": result, "from_base": int(request.from_base), "to_base": int(request.to_base), "original_value": request.value}
+
+def _number_systems_batch(request: BatchConversionRequest) -> Dict[str, Any]:
+    results = convert_number_batch(values=request.values, from_base=request.from_base, to_base=request.to_base, width=request.width)
+    return {"results": results, "from_base": int(request.from_base), "to_base": int(request.to_base), "count": len(results)}
+
+def _pipeline(request: PipelineRequest) -> Dict[str, Any]:
+    outputs, steps_executed = run_pipeline(request.steps, request.outputs)
+    return {"outputs": outputs, "steps_executed": steps_executed}
+
+OPERATIONS: Dict[Operation, Tuple[Type[BaseModel], Callable[[Any], Dict[str, Any]]]] = {
+    Operation.arithmetic: (ArithmeticRequest, _arithmetic),
+    Operation.trigonometry: (TrigonometryRequest, _trigonometry),
+    Operation.logarithms: (LogarithmRequest, _logarithms),
+    Operation.algebra: (PolynomialSolverRequest, _algebra),
+    Operation.algebra_solve: (NonlinearSolverRequest, _algebra_solve),
+    Operation.algebra_polynomial: (PolynomialRequest, _algebra_polynomial),
+    Operation.complex: (ComplexArithmeticRequest, _complex),
+    Operation.calculus: (CalculusRequest, _calculus),
+    Operation.calculus_multivariable: (MultivariableCalculusRequest, _calculus_multivariable),
+    Operation.calculus_plot: (PlotRequest, _calculus_plot),
+    Operation.differential_equations: (ODERequest, _differential_equations),
+    Operation.matrices: (MatrixRequest, _matrices),
+    Operation.statistics: (StatisticsRequest, _statistics),
+    Operation.number_systems: (ConversionRequest, _number_systems),
+    Operation.number_systems_batch: (BatchConversionRequest, _number_systems_batch),
+    Operation.pipeline: (PipelineRequest, _pipeline),
+}
+
+def validate_operation(operation: Operation, payload: Dict[str, Any]) -> BaseModel:
+    """
+    Validates a payload against the request model of the operation.
+
+    Raises:
+        pydantic.ValidationError: If the payload is not a valid request body.
+    """
+    model, _ = OPERATIONS[operation]
+    return model.model_validate(payload)
+
+def run_operation(operation: Operation, request: BaseModel) -> Dict[str, Any]:
+    """
+    Runs an operation on a validated request and returns the endpoint's response body.
+    Blocking; call it from a worker thread.
+
+    Raises:
+        ValueError: For errors raised by the service layer.
+    """
+    _, handler = OPERATIONS[operation]
+    return handler(request)
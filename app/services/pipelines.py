@@ -0,0 +1,207 @@
+import numpy as np
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from functools import lru_cache
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from sympy import Basic, Symbol
+from typing import Annotated, Any, Callable, Dict, List, Tuple, Type
+from app.core.config import settings
+from app.core.expressions import parse_expression
+from app.models.calculus import CalculusRequest
+from app.models.matrices import MatrixRequest
+from app.models.pipelines import PipelineStep, PipelineStepKind
+from app.models.statistics import StatisticsRequest
+from app.services.arithmetic import evaluate_arithmetic_expression
+from app.services.calculus import apply_calculus_operation, evaluate_expression
+from app.services.matrices import perform_matrix_operation
+from app.services.statistics import perform_statistics_operation
+
+def _take(params: Dict[str, Any], allowed: List[str], required: List[str]) -> Dict[str, Any]:
+    """Checks a step's parameters against the names its handler accepts."""
+    unknown = set(params) - set(allowed)
+    if unknown:
+        raise ValueError(f"Unknown parameters: {sorted(unknown)}.")
+    missing = [name for name in required if params.get(name) is None]
+    if missing:
+        raise ValueError(f"Missing required parameters: {missing}.")
+    return params
+
+@lru_cache(maxsize=None)
+def _field_adapter(model: Type[BaseModel], name: str) -> TypeAdapter:
+    field = model.model_fields[name]
+    return TypeAdapter(Annotated[field.annotation, field])
+
+def _request(model: Type[BaseModel], params: Dict[str, Any], inputs: Dict[str, Any]) -> BaseModel:
+    """
+    Builds the matching endpoint's request model from a step's arguments. Literal
+    parameters are validated like the endpoint's request body; results of earlier steps
+    are in-memory NumPy or SymPy objects and are taken as they are. The model's
+    cross-field checks then run on both.
+    """
+    values = {}
+    for name, value in params.items():
+        try:
+            values[name] = _field_adapter(model, name).validate_python(value)
+        except ValidationError as e:
+            raise ValueError(f"Invalid parameter `{name}`: {e.errors()[0]['msg']}.")
+    request = model.model_construct(**values, **inputs)
+    request.validate_request()
+    return request
+
+def _as_expression(value: Any) -> Basic:
+    """Accepts either an expression string or a SymPy result from an earlier step."""
+    if isinstance(value, Basic):
+        return value
+    if isinstance(value, str):
+        return parse_expression(value)
+    raise ValueError(f"Expected an expression, got {type(value).__name__}.")
+
+def _run_arithmetic(params: Dict[str, Any], inputs: Dict[str, Any]) -> float:
+    params = _take({**params, **inputs}, ["expression"], ["expression"])
+    return evaluate_arithmetic_expression(params["expression"])
+
+def _run_calculus(params: Dict[str, Any], inputs: Dict[str, Any]) -> Basic:
+    _take({**params, **inputs}, ["expression", "operation", "integration_bounds", "order", "expansion_point"], ["expression", "operation"])
+    request = _request(CalculusRequest, params, inputs)
+    return apply_calculus_operation(
+        _as_expression(request.expression),
+        request.operation,
+        bounds=request.integration_bounds,
+        order=request.order,
+        point=request.expansion_point
+    )
+
+def _run_evaluate(params: Dict[str, Any], inputs: Dict[str, Any]) -> np.ndarray:
+    params = _take({**params, **inputs}, ["expression", "variable", "points", "start", "stop", "num"], ["expression"])
+    x = Symbol(params.get("variable", "x"))
+    if params.get("points") is not None:
+        size = len(params["points"])
+    elif all(params.get(name) is not None for name in ("start", "stop", "num")):
+        size = int(params["num"])
+    else:
+        raise ValueError("Provide either `points` or a grid given by `start`, `stop` and `num`.")
+    # Check the size before anything is allocated for it
+    if size > settings.max_evaluation_points:
+        raise ValueError(f"At most {settings.max_evaluation_points} evaluation points are allowed.")
+    if params.get("points") is not None:
+        values = np.asarray(params["points"], dtype=np.float64)
+    else:
+        values = np.linspace(float(params["start"]), float(params["stop"]), size)
+    return evaluate_expression(_as_expression(params["expression"]), values, x)
+
+def _run_statistics(params: Dict[str, Any], inputs: Dict[str, Any]) -> Any:
+    _take({**params, **inputs}, ["operation", "data", "data2", "degree", "bins"], ["operation", "data"])
+    # Arrays from earlier steps may have any shape; the operations take flat series
+    inputs = {name: np.ravel(value) if name in ("data", "data2") else value for name, value in inputs.items()}
+    request = _request(StatisticsRequest, params, inputs)
+    data = np.asarray(request.data, dtype=np.float64)
+    data2 = np.asarray(request.data2, dtype=np.float64) if request.data2 is not None else None
+    # Regression coefficients and histogram counts flow on as arrays; r_squared and bin edges are dropped
+    result, _ = perform_statistics_operation(request.operation, data, data2, request.degree, request.bins)
+    return result
+
+def _run_matrices(params: Dict[str, Any], inputs: Dict[str, Any]) -> Any:
+    _take({**params, **inputs}, ["operation", "matrix1", "matrix2"], ["operation", "matrix1"])
+    request = _request(MatrixRequest, params, inputs)
+    result, _, _ = perform_matrix_operation(
+        operation=request.operation,
+        matrix1=request.matrix1,
+        matrix2=request.matrix2
+    )
+    return result
+
+_STEP_HANDLERS: Dict[PipelineStepKind, Callable[[Dict[str, Any], Dict[str, Any]], Any]] = {
+    PipelineStepKind.arithmetic: _run_arithmetic,
+    PipelineStepKind.calculus: _run_calculus,
+    PipelineStepKind.evaluate: _run_evaluate,
+    PipelineStepKind.statistics: _run_statistics,
+    PipelineStepKind.matrices: _run_matrices,
+}
+
+def _required_steps(steps: List[PipelineStep], outputs: List[str]) -> List[PipelineStep]:
+    """
+    Returns the steps needed to produce the outputs, ordered so that every step comes
+    after the steps it depends on. Steps that feed no output are skipped.
+
+    Raises:
+        ValueError: If the dependencies form a cycle.
+    """
+    by_id = {step.id: step for step in steps}
+    ordered: List[PipelineStep] = []
+    state: Dict[str, str] = {}
+
+    def visit(step_id: str) -> None:
+        if state.get(step_id) == "done":
+            return
+        if state.get(step_id) == "visiting":
+            raise ValueError(f"The pipeline contains a dependency cycle through step '{step_id}'.")
+        state[step_id] = "visiting"
+        for source in by_id[step_id].inputs.values():
+            visit(source)
+        state[step_id] = "done"
+        ordered.append(by_id[step_id])
+
+    for output in outputs:
+        visit(output)
+    return ordered
+
+def _to_output(value: Any) -> Any:
+    """Converts an in-memory step result into a JSON-serialisable value."""
+    if isinstance(value, Basic):
+        if value.is_Number and value.is_real:
+            return float(value)
+        return str(value)
+    if isinstance(value, np.ndarray) and np.iscomplexobj(value):
+        return [str(v) for v in value.ravel()]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+def _run_step(step: PipelineStep, inputs: Dict[str, Any]) -> Any:
+    try:
+        return _STEP_HANDLERS[step.kind](step.params, inputs)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Step '{step.id}' ({step.kind.value}) failed: {e}")
+
+def run_pipeline(steps: List[PipelineStep], outputs: List[str]) -> Tuple[Dict[str, Any], int]:
+    """
+    Runs a DAG of service calls, keeping intermediate results in memory.
+
+    Each step is submitted to a thread pool as soon as the steps it depends on have
+    finished, so independent branches execute concurrently. Only steps that contribute
+    to the requested outputs are run.
+
+    Args:
+        steps: The pipeline steps.
+        outputs: The ids of the steps whose results are returned.
+
+    Returns:
+        A tuple containing:
+        - A dict mapping each output id to its JSON-serialisable result.
+        - The number of steps that were executed.
+
+    Raises:
+        ValueError: For cycles, oversized pipelines or failing steps.
+    """
+    if len(steps) > settings.max_pipeline_steps:
+        raise ValueError(f"A pipeline may have at most {settings.max_pipeline_steps} steps.")
+
+    required = _required_steps(steps, outputs)
+    waiting = list(required)
+    running: Dict[Future, PipelineStep] = {}
+    results: Dict[str, Any] = {}
+    pool = ThreadPoolExecutor(max_workers=min(settings.max_pipeline_workers, len(required)))
+    try:
+        while waiting or running:
+            ready = [step for step in waiting if all(source in results for source in step.inputs.values())]
+            for step in ready:
+                waiting.remove(step)
+                inputs = {name: results[source] for name, source in step.inputs.items()}
+                running[pool.submit(_run_step, step, inputs)] = step
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[running.pop(future).id] = future.result()
+    finally:
+        # After a failure, queued steps are dropped and running ones finish unobserved
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    return {output: _to_output(results[output]) for output in outputs}, len(required)
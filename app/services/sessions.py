@@ -0,0 +1,89 @@
+import numpy as np
+from collections import OrderedDict
+from typing import Callable, Dict, FrozenSet, Tuple
+from sympy import lambdify, nan, zoo
+from app.core.config import settings
+from app.core.expressions import parse_expression, validate_symbol_names
+from app.models.operations import Operation
+
+# Operations cheap enough that their endpoints run them on the event loop; sessions do the same
+# instead of paying for a worker thread hand-off on every keystroke
+INLINE_OPERATIONS = frozenset({
+    Operation.arithmetic,
+    Operation.trigonometry,
+    Operation.logarithms,
+    Operation.complex,
+    Operation.number_systems,
+})
+
+class CalculatorSession:
+    """
+    Server-side state of one interactive session: named variables and the expressions
+    evaluated with them, compiled once.
+
+    Compiled expressions are keyed by their source and the set of defined variable
+    names, so changing a variable's value reuses the compiled function and only
+    redefining the set of names compiles again.
+    """
+
+    def __init__(self):
+        self.variables: Dict[str, float] = {}
+        self._compiled: "OrderedDict[Tuple[str, FrozenSet[str]], Tuple[Callable, Tuple[str, ...]]]" = OrderedDict()
+
+    def is_compiled(self, expression: str) -> bool:
+        """Whether the expression is compiled for the current variable names, so evaluating it needs no parsing."""
+        return (expression, frozenset(self.variables)) in self._compiled
+
+    def _compile(self, expression: str) -> Tuple[Callable, Tuple[str, ...]]:
+        key = (expression, frozenset(self.variables))
+        compiled = self._compiled.get(key)
+        if compiled is not None:
+            self._compiled.move_to_end(key)
+            return compiled
+        expr = parse_expression(expression, symbols=self.variables)
+        if expr.has(zoo, nan):
+            # Such as 1/0; the NumPy printer cannot compile them and they have no finite value anyway
+            raise ValueError(f"'{expression}' does not evaluate to a finite real number.")
+        names = tuple(sorted(str(s) for s in expr.free_symbols))
+        # SciPy provides factorial and gamma for float arguments, which NumPy lacks
+        compiled = (lambdify(names, expr, modules=["scipy", "numpy"]), names)
+        self._compiled[key] = compiled
+        if len(self._compiled) > settings.session_expression_cache_size:
+            self._compiled.popitem(last=False)
+        return compiled
+
+    def evaluate(self, expression: str) -> float:
+        """
+        Evaluates an expression using the session's variables.
+
+        Raises:
+            ValueError: For invalid expressions, undefined variables or results that are not
+                        finite real numbers.
+        """
+        func, names = self._compile(expression)
+        try:
+            with np.errstate(all='ignore'):
+                value = func(*(self.variables[name] for name in names))
+        except (ArithmeticError, TypeError, ValueError) as e:
+            raise ValueError(f"'{expression}' could not be evaluated to a real number: {e}")
+        if np.iscomplexobj(value) or not np.isfinite(value):
+            raise ValueError(f"'{expression}' does not evaluate to a finite real number.")
+        return float(value)
+
+    def define(self, name: str, expression: str) -> float:
+        """
+        Sets a variable to the value of an expression, which may use other variables.
+
+        Raises:
+            ValueError: For invalid names or expressions, or too many variables.
+        """
+        validate_symbol_names([name])
+        value = self.evaluate(expression)
+        if name not in self.variables and len(self.variables) >= settings.session_max_variables:
+            raise ValueError(f"A session may define at most {settings.session_max_variables} variables.")
+        self.variables[name] = value
+        return value
+
+    def clear(self) -> None:
+        self.variables.clear()
+        self._compiled.clear()
@@ -1,29 +1,132 @@
 import numpy as np
-from typing import List
-from app.models.statistics import StatisticsOperation
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from app.core.config import settings
+from app.models.statistics import PAIRED_OPERATIONS, StatisticsOperation
+
+def _chunks(size: int) -> Iterator[slice]:
+    """Slices covering `size` elements in blocks, so temporaries stay a fixed size."""
+    step = settings.statistics_chunk_size
+    for start in range(0, size, step):
+        yield slice(start, start + step)
+
+def _centred_sums(x: np.ndarray, y: np.ndarray) -> Tuple[float, float, float]:
+    """
+    Returns the centred sums of squares and cross products (Sxx, Syy, Sxy).
+
+    The means are computed first and subtracted before squaring, which avoids the
+    cancellation of the one-pass sum(x*y) - n*mean(x)*mean(y) formula.
+    """
+    mean_x, mean_y = x.mean(), y.mean()
+    sxx = syy = sxy = 0.0
+    for chunk in _chunks(len(x)):
+        dx = x[chunk] - mean_x
+        dy = y[chunk] - mean_y
+        sxx += float(dx @ dx)
+        syy += float(dy @ dy)
+        sxy += float(dx @ dy)
+    return sxx, syy, sxy
+
+def _linear_regression(x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, float]:
+    sxx, syy, sxy = _centred_sums(x, y)
+    if sxx == 0:
+        raise ValueError("Linear regression needs at least two distinct x values.")
+    slope = sxy / sxx
+    intercept = y.mean() - slope * x.mean()
+    r_squared = sxy * sxy / (sxx * syy) if syy > 0 else 1.0
+    return np.array([slope, intercept]), r_squared
+
+def _polynomial_regression(x: np.ndarray, y: np.ndarray, degree: int) -> Tuple[np.ndarray, float]:
+    """
+    Least-squares polynomial fit by normal equations accumulated chunk by chunk.
+
+    x is mapped onto [-1, 1] and the fit uses a Legendre basis there, which keeps
+    the Gram matrix well conditioned for high degrees. The result is converted back
+    to ordinary power-basis coefficients in x.
+    """
+    low, high = float(x.min()), float(x.max())
+    if low == high:
+        raise ValueError("Polynomial regression needs at least two distinct x values.")
+    offset, scale = np.polynomial.polyutils.mapparms([low, high], [-1, 1])
+
+    gram = np.zeros((degree + 1, degree + 1))
+    moments = np.zeros(degree + 1)
+    for chunk in _chunks(len(x)):
+        vander = np.polynomial.legendre.legvander(offset + scale * x[chunk], degree)
+        gram += vander.T @ vander
+        moments += vander.T @ y[chunk]
+
+    coefficients, _, rank, _ = np.linalg.lstsq(gram, moments, rcond=None)
+    if rank < degree + 1:
+        raise ValueError(f"A degree {degree} fit needs at least {degree + 1} distinct x values.")
+    fit = np.polynomial.Legendre(coefficients, domain=[low, high])
+
+    _, syy, _ = _centred_sums(x, y)
+    residual = 0.0
+    for chunk in _chunks(len(x)):
+        errors = y[chunk] - fit(x[chunk])
+        residual += float(errors @ errors)
+    r_squared = 1.0 - residual / syy if syy > 0 else 1.0
+
+    power = fit.convert(kind=np.polynomial.Polynomial).coef
+    # Highest power first, matching the algebra endpoints; convert() may trim zero leading terms
+    return np.pad(power, (0, degree + 1 - len(power)))[::-1], r_squared
+
+def _histogram(dataset: np.ndarray, bins: Union[int, str]) -> Tuple[np.ndarray, np.ndarray]:
+    if not np.isfinite(dataset).all():
+        raise ValueError("Histograms need finite data.")
+    if isinstance(bins, str):
+        # numpy's 'auto' takes the larger of the Sturges count (log2(n) + 1, always small) and the
+        # Freedman-Diaconis count, which outliers can make huge; check it before numpy allocates the edges
+        span = float(dataset.max() - dataset.min()) if dataset.size else 0.0
+        q75, q25 = np.percentile(dataset, [75, 25]) if dataset.size else (0.0, 0.0)
+        fd_width = 2.0 * (q75 - q25) * dataset.size ** (-1.0 / 3.0) if dataset.size else 0.0
+        count = int(np.ceil(span / fd_width)) if fd_width > 0 else 0
+    else:
+        count = bins
+    if count > settings.max_histogram_bins:
+        raise ValueError(f"The histogram would have {count} bins; the limit is {settings.max_histogram_bins}.")
+    edges = np.histogram_bin_edges(dataset, bins=bins)
+    counts, _ = np.histogram(dataset, bins=edges)
+    return counts, edges
 
 def perform_statistics_operation(
     operation: StatisticsOperation,
-    data: List[float]
-) -> float:
+    data: List[float],
+    data2: Optional[List[float]] = None,
+    degree: Optional[int] = None,
+    bins: Optional[Union[int, str]] = None
+) -> Tuple[Union[float, np.ndarray], Dict[str, Any]]:
     """
     Performs a statistical calculation on a list of numbers.
 
     Args:
         operation: The statistical operation to perform.
-        data: A list of numbers (dataset).
+        data: A list of numbers (dataset); the x values for two-series operations.
+        data2: The paired y values for correlation, covariance and regressions.
+        degree: The degree of the fitted polynomial for polynomial regression.
+        bins: The number of histogram bins, or 'auto'.
 
     Returns:
-        The result of the calculation as a float.
-        
+        A tuple containing:
+        - The result: a float, regression coefficients (highest power first) or histogram counts.
+        - Extra response fields: `r_squared` for regressions, `bin_edges` for histograms.
+
     Raises:
-        ValueError: If an unsupported operation is provided.
+        ValueError: If the inputs are invalid for the operation or an unsupported operation is provided.
     """
     # The Pydantic model ensures data is not empty, but we can double-check.
-    if not data:
+    if len(data) == 0:
         raise ValueError("Dataset cannot be empty.")
 
-    dataset = np.array(data)
+    # asarray avoids a copy when the data is already a float64 array (e.g. from a pipeline step)
+    dataset = np.asarray(data, dtype=np.float64)
+
+    if operation in PAIRED_OPERATIONS:
+        if data2 is None:
+            raise ValueError(f"A second series is required for {operation.value}.")
+        paired = np.asarray(data2, dtype=np.float64)
+        if paired.shape != dataset.shape:
+            raise ValueError("Both series must have the same length.")
 
     if operation == StatisticsOperation.mean:
         result = np.mean(dataset)
@@ -35,8 +138,29 @@ def perform_statistics_operation(
         result = np.std(dataset)
     elif operation == StatisticsOperation.variance:
         result = np.var(dataset)
+    elif operation == StatisticsOperation.covariance:
+        # Population covariance (ddof=0), consistent with variance above
+        _, _, sxy = _centred_sums(dataset, paired)
+        result = sxy / len(dataset)
+    elif operation == StatisticsOperation.correlation:
+        sxx, syy, sxy = _centred_sums(dataset, paired)
+        if sxx == 0 or syy == 0:
+            raise ValueError("Correlation is undefined when either series is constant.")
+        # Rounding can push a perfect correlation just past +/-1
+        result = np.clip(sxy / np.sqrt(sxx * syy), -1.0, 1.0)
+    elif operation == StatisticsOperation.linear_regression:
+        coefficients, r_squared = _linear_regression(dataset, paired)
+        return coefficients, {"r_squared": r_squared}
+    elif operation == StatisticsOperation.polynomial_regression:
+        if degree is None:
+            raise ValueError("A degree is required for polynomial_regression.")
+        coefficients, r_squared = _polynomial_regression(dataset, paired, degree)
+        return coefficients, {"r_squared": r_squared}
+    elif operation == StatisticsOperation.histogram:
+        counts, edges = _histogram(dataset, bins if bins is not None else "auto")
+        return counts, {"bin_edges": edges}
     else:
         # Should not be reachable with Enum validation
         raise ValueError(f"Invalid or unsupported statistics operation: {operation}")
 
-    return float(result)
+    return float(result), {}